@@ -0,0 +1,93 @@
+"""
+Query time budgets for expensive report views.
+
+`query_budget(seconds)` installs an `execute_wrapper` on every database alias
+for the duration of a block. Each statement gets whatever is left of the
+block's budget:
+
+* PostgreSQL: `SET statement_timeout` to the remaining milliseconds before
+  the statement, and `RESET statement_timeout` on the way out,
+* SQLite: a progress handler, kept until the block ends, that interrupts
+  whatever statement is running once the deadline passes,
+* anything else: the deadline is only checked between statements.
+
+A database error raised after the deadline, or a statement about to start
+after it, becomes QueryBudgetExceeded. That is not an OperationalError, so
+the replica middleware doesn't mistake it for a replica outage and re-run
+the view.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+# SQLite VM instructions between deadline checks; small enough to stop within milliseconds
+SQLITE_PROGRESS_STEPS = 10000
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    """`execute_wrapper` hook that enforces a shared deadline on each statement."""
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.postgres = set()
+        self.sqlite = set()
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def exceeded(self):
+        return QueryBudgetExceeded(f"Query budget of {self.seconds * 1000:.0f} ms spent")
+
+    def __call__(self, execute, sql, params, many, context):
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded()
+        connection = context['connection']
+        if connection.vendor == 'postgresql':
+            # The raw cursor skips the wrappers, so this SET isn't timed or counted itself
+            context['cursor'].cursor.execute(f"SET statement_timeout = {max(1, int(remaining * 1000))}")
+            self.postgres.add(connection.alias)
+        elif connection.vendor == 'sqlite' and connection.alias not in self.sqlite:
+            # Left on until the block ends: SQLite also does work while rows are fetched
+            connection.connection.set_progress_handler(lambda: time.monotonic() >= self.deadline, SQLITE_PROGRESS_STEPS)
+            self.sqlite.add(connection.alias)
+        return execute(sql, params, many, context)
+
+    def reset(self):
+        for alias in self.sqlite:
+            if connections[alias].connection is not None:
+                connections[alias].connection.set_progress_handler(None, 0)
+        for alias in self.postgres:
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("RESET statement_timeout")
+            except DatabaseError:
+                # A broken connection is discarded at the end of the request anyway
+                pass
+
+
+@contextmanager
+def query_budget(seconds):
+    """Run the block's queries within `seconds` in total; a falsy budget disables the limit."""
+    if not seconds:
+        yield None
+        return
+    budget = QueryBudget(seconds)
+    try:
+        with ExitStack() as stack:
+            for alias in settings.DATABASES:
+                stack.enter_context(connections[alias].execute_wrapper(budget))
+            yield budget
+    except DatabaseError as exc:
+        # Interrupted or cancelled statements surface as database errors, during execute or fetch
+        if budget.remaining() <= 0:
+            raise budget.exceeded() from exc
+        raise
+    finally:
+        budget.reset()
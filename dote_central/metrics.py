@@ -0,0 +1,221 @@
+"""
+Per-request performance instrumentation.
+
+With METRICS_ENABLED, MetricsMiddleware times every request, counts the
+queries it issues (through `connection.execute_wrapper`) and records:
+
+* a latency histogram per view and method,
+* query count and time per view, and a histogram of queries per request,
+* response sizes per view,
+* webhook outcomes by status code,
+* report views that ran past their query budget (see dote_central/budgets.py),
+* webhook requests refused by the rate limiter (see dote_central/ratelimit.py).
+
+Each response carries a `Server-Timing` header, and `/metrics` serves the
+counters in the Prometheus text format. Requests slower than
+SLOW_REQUEST_MS and queries slower than SLOW_QUERY_MS are logged to stdout
+for Cloud Run logging. Counters live in process memory, so each instance
+reports its own numbers.
+
+When METRICS_ENABLED is off the middleware removes itself from the stack at
+startup and `/metrics` returns 404.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger('dote.performance')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+WEBHOOK_VIEWS = {'webhook_report'}
+
+
+def metrics_enabled():
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.latency = {}
+        self.sizes = {}
+        self.requests = {}
+        self.queries = {}
+        self.query_counts = {}
+        self.query_seconds = {}
+        self.webhooks = {}
+        self.budgets = {}
+        self.rate_limited = {}
+
+    def record(self, view, method, status, seconds, query_count, query_seconds, size):
+        with self.lock:
+            self.latency.setdefault((view, method), Histogram(LATENCY_BUCKETS)).observe(seconds)
+            key = (view, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.queries[view] = self.queries.get(view, 0) + query_count
+            self.query_counts.setdefault(view, Histogram(QUERY_COUNT_BUCKETS)).observe(query_count)
+            self.query_seconds[view] = self.query_seconds.get(view, 0.0) + query_seconds
+            if size is not None:
+                self.sizes.setdefault(view, Histogram(SIZE_BUCKETS)).observe(size)
+            if view in WEBHOOK_VIEWS:
+                self.webhooks[str(status)] = self.webhooks.get(str(status), 0) + 1
+
+    def record_budget_exceeded(self, view, outcome):
+        with self.lock:
+            key = (view, outcome)
+            self.budgets[key] = self.budgets.get(key, 0) + 1
+
+    def record_rate_limited(self, scope):
+        with self.lock:
+            self.rate_limited[scope] = self.rate_limited.get(scope, 0) + 1
+
+    def render(self):
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, labels, hist):
+            for bound, count in zip(hist.buckets, hist.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.total}')
+            lines.append(f'{name}_sum{{{labels}}} {hist.sum:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {hist.total}')
+
+        with self.lock:
+            header('dote_request_duration_seconds', 'histogram', 'Request latency by view.')
+            for (view, method), hist in sorted(self.latency.items()):
+                histogram('dote_request_duration_seconds', f'view="{view}",method="{method}"', hist)
+
+            header('dote_requests_total', 'counter', 'Requests by view and status code.')
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(f'dote_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}')
+
+            header('dote_db_queries_total', 'counter', 'Database queries issued by view.')
+            for view, count in sorted(self.queries.items()):
+                lines.append(f'dote_db_queries_total{{view="{view}"}} {count}')
+
+            header('dote_db_queries_per_request', 'histogram', 'Database queries per request by view.')
+            for view, hist in sorted(self.query_counts.items()):
+                histogram('dote_db_queries_per_request', f'view="{view}"', hist)
+
+            header('dote_db_query_seconds_total', 'counter', 'Database time spent by view.')
+            for view, seconds in sorted(self.query_seconds.items()):
+                lines.append(f'dote_db_query_seconds_total{{view="{view}"}} {seconds:.6f}')
+
+            header('dote_response_size_bytes', 'histogram', 'Response body size by view.')
+            for view, hist in sorted(self.sizes.items()):
+                histogram('dote_response_size_bytes', f'view="{view}"', hist)
+
+            header('dote_webhook_requests_total', 'counter', 'Webhook outcomes by status code.')
+            for status, count in sorted(self.webhooks.items()):
+                lines.append(f'dote_webhook_requests_total{{status="{status}"}} {count}')
+
+            header('dote_query_budget_exceeded_total', 'counter', 'Report views over their query budget, by what was served.')
+            for (view, outcome), count in sorted(self.budgets.items()):
+                lines.append(f'dote_query_budget_exceeded_total{{view="{view}",outcome="{outcome}"}} {count}')
+
+            header('dote_webhook_rate_limited_total', 'counter', 'Webhook requests refused with 429, by bucket scope.')
+            for scope, count in sorted(self.rate_limited.items()):
+                lines.append(f'dote_webhook_rate_limited_total{{scope="{scope}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class QueryTimer:
+    """`execute_wrapper` hook that counts queries and logs slow ones."""
+    def __init__(self, alias):
+        self.alias = alias
+        self.count = 0
+        self.seconds = 0.0
+        self.slow_ms = getattr(settings, 'SLOW_QUERY_MS', 200)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if elapsed * 1000 >= self.slow_ms:
+                log_slow('slow_query', alias=self.alias, ms=round(elapsed * 1000, 1), sql=sql[:2000])
+
+
+def log_slow(kind, **fields):
+    logger.warning(json.dumps({'severity': 'WARNING', 'event': kind, **fields}, default=str))
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.slow_request_ms = getattr(settings, 'SLOW_REQUEST_MS', 1000)
+
+    def __call__(self, request):
+        timers = [QueryTimer(alias) for alias in settings.DATABASES]
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for timer in timers:
+                stack.enter_context(connections[timer.alias].execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        query_count = sum(t.count for t in timers)
+        query_seconds = sum(t.seconds for t in timers)
+        size = None if response.streaming else len(response.content)
+        registry.record(view, request.method, response.status_code, elapsed, query_count, query_seconds, size)
+
+        response['Server-Timing'] = (
+            f'db;dur={query_seconds * 1000:.1f};desc="{query_count} queries", '
+            f'app;dur={(elapsed - query_seconds) * 1000:.1f}, '
+            f'total;dur={elapsed * 1000:.1f}'
+        )
+        if elapsed * 1000 >= self.slow_request_ms:
+            log_slow('slow_request', view=view, method=request.method, path=request.path,
+                     status=response.status_code, ms=round(elapsed * 1000, 1),
+                     queries=query_count, db_ms=round(query_seconds * 1000, 1))
+        return response
+
+
+def metrics_view(request):
+    if not metrics_enabled():
+        raise Http404()
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,61 @@
+"""
+In-process token buckets for webhook traffic.
+
+Each bucket holds up to `burst` tokens and refills at `per_minute` tokens a
+minute; a request takes one token or is refused with the seconds until the
+next one. Buckets live in process memory, so each gunicorn process (and
+Cloud Run instance) limits on its own: the effective ceiling is the
+configured rate times the number of processes. At most MAX_BUCKETS are kept,
+least recently used first out; an evicted bucket just starts full again.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+MAX_BUCKETS = 10000
+
+
+class TokenBuckets:
+    def __init__(self, max_buckets=MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # key -> [tokens, last refill (monotonic), per_minute, burst]
+        self.buckets = OrderedDict()
+
+    def _refilled(self, bucket, now):
+        tokens, updated, per_minute, burst = bucket
+        return min(burst, tokens + (now - updated) * per_minute / 60)
+
+    def take(self, key, per_minute, burst):
+        """Take a token from `key`'s bucket: 0 if allowed, else the seconds until one is available."""
+        if not per_minute:
+            return 0
+        burst = max(1, burst)
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            tokens = burst if bucket is None else min(burst, self._refilled(bucket, now))
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = [tokens, now, per_minute, burst]
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) * 60 / per_minute
+
+    def wait(self, key):
+        """Seconds until `key`'s bucket has a token at its last known rate, without taking one; 0 if it has one or is unknown."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                return 0
+            tokens = self._refilled(bucket, now)
+        return 0 if tokens >= 1 else (1 - tokens) * 60 / bucket[2]
+
+
+webhook_limits = TokenBuckets()
@@ -0,0 +1,90 @@
+"""
+Read-replica routing for reporting traffic.
+
+Views opt in with `read_from_replica = True`. Their reads go to the `replica`
+alias (configured through REPLICA_DATABASE_URL) unless:
+
+* the client wrote something in the last REPLICA_STICKY_SECONDS, so it reads
+  its own writes from the primary, or
+* the replica failed recently, in which case it is skipped for
+  REPLICA_RETRY_SECONDS and the failing request is re-run on the primary.
+
+Writes always go to `default`.
+"""
+import contextvars
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, connections
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'dote_primary_until'
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+_replica_down_until = 0.0
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+def replica_available():
+    return replica_configured() and time.monotonic() >= _replica_down_until
+
+def mark_replica_down():
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+    try:
+        connections[REPLICA_ALIAS].close()
+    except DatabaseError:
+        pass
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_available():
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes from the primary
+        return db != REPLICA_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned_until = request.COOKIES.get(PIN_COOKIE, '')
+        request.primary_pinned = pinned_until.isdigit() and int(pinned_until) > time.time()
+        token = _use_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and replica_configured():
+            sticky = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+            response.set_cookie(PIN_COOKIE, str(int(time.time()) + sticky), max_age=sticky, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if getattr(view_class, 'read_from_replica', False) and not request.primary_pinned and request.method in ('GET', 'HEAD'):
+            _use_replica.set(replica_available())
+        return None
+
+    def process_exception(self, request, exception):
+        if not _use_replica.get() or not isinstance(exception, (OperationalError, InterfaceError)):
+            return None
+        # Assume the replica is at fault and answer this request from the primary
+        mark_replica_down()
+        _use_replica.set(False)
+        match = request.resolver_match
+        return match.func(request, *match.args, **match.kwargs)
@@ -51,8 +51,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'dote_central.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'dote_central.snapshots.SnapshotWhiteNoiseMiddleware',
+    'dote_central.replica.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -89,6 +91,28 @@ DATABASES = {
     'default': env.db('DATABASE_URL', default=f'sqlite:////{BASE_DIR}/db.sqlite3')
 }
 
+# Optional read replica for reporting views and exports (see dote_central/replica.py).
+# Locally, point it at a copy of the SQLite file: sqlite:////path/to/replica.sqlite3
+if env('REPLICA_DATABASE_URL', default=''):
+    DATABASES['replica'] = env.db('REPLICA_DATABASE_URL')
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['dote_central.replica.ReplicaRouter']
+
+# Seconds a client reads from the primary after it writes (read-your-writes)
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=15)
+# Seconds an unreachable replica is skipped before being tried again
+REPLICA_RETRY_SECONDS = env.int('REPLICA_RETRY_SECONDS', default=30)
+
+# Opt-in SQLite profile for concurrent writers: WAL, busy_timeout, BEGIN IMMEDIATE
+# and an in-process write lane (see dote_central/sqlite_backend). Individual
+# pragmas can be overridden through SQLITE_PRAGMAS.
+SQLITE_HIGH_CONCURRENCY = env.bool('SQLITE_HIGH_CONCURRENCY', default=False)
+if SQLITE_HIGH_CONCURRENCY:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            database['ENGINE'] = 'dote_central.sqlite_backend'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -120,6 +144,91 @@ USE_I18N = True
 
 USE_TZ = True
 
+# First month (1-12) of the fiscal year; drives quarter/year reporting buckets.
+# Run `manage.py rebuild_rollups` after changing it.
+FISCAL_YEAR_START_MONTH = env.int('FISCAL_YEAR_START_MONTH', default=1)
+
+# Dashboard live updates (Server-Sent Events). Each open stream holds one of the
+# gunicorn threads, so keep the cap well below --threads.
+LIVE_UPDATES_MAX_CONNECTIONS = env.int('LIVE_UPDATES_MAX_CONNECTIONS', default=3)
+LIVE_UPDATES_MAX_AGE = env.int('LIVE_UPDATES_MAX_AGE', default=300)
+LIVE_UPDATES_HEARTBEAT = env.int('LIVE_UPDATES_HEARTBEAT', default=15)
+
+# Bulk technology usage ingestion (POST /usage/ingest/). The endpoint is disabled
+# until USAGE_INGEST_KEY is set; callers send it as `ingest_key`.
+USAGE_INGEST_KEY = env('USAGE_INGEST_KEY', default='')
+USAGE_INGEST_MAX_ROWS = env.int('USAGE_INGEST_MAX_ROWS', default=5000)
+
+# Benefit entries queued offline by the service worker are replayed to /benefits/batch/
+OFFLINE_BENEFIT_BATCH_MAX = env.int('OFFLINE_BENEFIT_BATCH_MAX', default=500)
+
+# Shared cache for computed reports such as /api/pivot/. Set CACHE_URL (e.g.
+# redis://host:6379/0) to share entries across instances; the default is per process.
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+# Pivot results are keyed by a data-version stamp, so this only bounds staleness
+# from changes the stamp doesn't see (technology renames).
+PIVOT_CACHE_SECONDS = env.int('PIVOT_CACHE_SECONDS', default=600)
+
+# Read-only sync API (/api/<resource>/): default and maximum rows per page
+API_PAGE_SIZE = env.int('API_PAGE_SIZE', default=500)
+API_MAX_PAGE_SIZE = env.int('API_MAX_PAGE_SIZE', default=5000)
+
+# KPI event ledger (POST /webhook/events/). `compact_kpi_events` rolls events into
+# monthly benefits once they are KPI_EVENT_SETTLE_SECONDS old, and folds raw events
+# older than KPI_EVENT_RETENTION_DAYS into daily rows.
+KPI_EVENT_RETENTION_DAYS = env.int('KPI_EVENT_RETENTION_DAYS', default=90)
+KPI_EVENT_SETTLE_SECONDS = env.int('KPI_EVENT_SETTLE_SECONDS', default=60)
+KPI_EVENTS_MAX_BATCH = env.int('KPI_EVENTS_MAX_BATCH', default=1000)
+
+# How long POST /webhook/report/ remembers an Idempotency-Key's response (in the cache above)
+WEBHOOK_IDEMPOTENCY_SECONDS = env.int('WEBHOOK_IDEMPOTENCY_SECONDS', default=86400)
+
+# Proxies in front of the app that append to X-Forwarded-For (1 on Cloud Run). Client IPs for
+# the audit log and webhook rate limits come from that hop; 0 uses REMOTE_ADDR and ignores the header.
+TRUSTED_PROXY_COUNT = env.int('TRUSTED_PROXY_COUNT', default=0)
+
+# Per-process token buckets for POST /webhook/report/ (see dote_central/ratelimit.py):
+# requests per minute and burst per webhook key and per client IP, 0 disables.
+# An initiative's own webhook_rate_limit replaces WEBHOOK_RATE_PER_MINUTE for its key.
+WEBHOOK_RATE_PER_MINUTE = env.int('WEBHOOK_RATE_PER_MINUTE', default=120)
+WEBHOOK_RATE_BURST = env.int('WEBHOOK_RATE_BURST', default=30)
+WEBHOOK_IP_RATE_PER_MINUTE = env.int('WEBHOOK_IP_RATE_PER_MINUTE', default=600)
+WEBHOOK_IP_RATE_BURST = env.int('WEBHOOK_IP_RATE_BURST', default=100)
+
+# Static snapshots of the dashboard and analysis pages, published by `publish_snapshots`
+# or a scheduler POSTing SNAPSHOT_PUBLISH_KEY to /snapshots/publish/ (disabled while unset).
+# They are served under SNAPSHOT_URL without database queries. Each instance serves its
+# own SNAPSHOT_ROOT, so point it at a shared volume when running more than one.
+SNAPSHOT_ROOT = env('SNAPSHOT_ROOT', default=str(BASE_DIR / 'snapshots'))
+SNAPSHOT_URL = '/snapshots/'
+SNAPSHOT_PUBLISH_KEY = env('SNAPSHOT_PUBLISH_KEY', default='')
+SNAPSHOT_MAX_AGE = env.int('SNAPSHOT_MAX_AGE', default=3600)
+SNAPSHOT_STALE_SECONDS = env.int('SNAPSHOT_STALE_SECONDS', default=86400)
+
+# Per-request metrics, Server-Timing headers and /metrics (see dote_central/metrics.py).
+# Requests and queries slower than the thresholds (milliseconds) are logged to stdout.
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=False)
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+SLOW_REQUEST_MS = env.int('SLOW_REQUEST_MS', default=1000)
+SLOW_QUERY_MS = env.int('SLOW_QUERY_MS', default=200)
+
+# Query time budget (milliseconds, 0 disables) for the dashboard and analysis page
+# (see dote_central/budgets.py). Past it, the view serves the last result it computed
+# for the same filters, kept for REPORT_LAST_GOOD_SECONDS, under a "stale" banner.
+REPORT_QUERY_BUDGET_MS = env.int('REPORT_QUERY_BUDGET_MS', default=5000)
+REPORT_LAST_GOOD_SECONDS = env.int('REPORT_LAST_GOOD_SECONDS', default=86400)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'stdout': {'class': 'logging.StreamHandler', 'stream': 'ext://sys.stdout'},
+    },
+    'loggers': {
+        'dote.performance': {'handlers': ['stdout'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
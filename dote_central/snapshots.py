@@ -0,0 +1,51 @@
+"""
+WhiteNoise serving for published dashboard snapshots.
+
+Snapshots (initiatives/snapshots.py) are rewritten while the app runs, so
+unlike collected static files they can't be indexed once at startup.
+SnapshotWhiteNoiseMiddleware looks up paths under SNAPSHOT_URL on disk per
+request (a stat, no database) and serves them with a SNAPSHOT_MAX_AGE cache
+lifetime plus stale-while-revalidate; WhiteNoise's ETag and Last-Modified
+headers turn revalidation into a 304. A directory URL serves its
+index.html. Everything else is handled exactly as by WhiteNoiseMiddleware.
+"""
+import os
+from wsgiref.headers import Headers
+
+from django.conf import settings as django_settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import StaticFile
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    def __init__(self, get_response=None, settings=django_settings):
+        super().__init__(get_response, settings=settings)
+        self.snapshot_root = os.path.abspath(str(settings.SNAPSHOT_ROOT))
+        self.snapshot_prefix = ensure_leading_trailing_slash(settings.SNAPSHOT_URL)
+        self.snapshot_cache_control = (
+            f"max-age={settings.SNAPSHOT_MAX_AGE}, public, stale-while-revalidate={settings.SNAPSHOT_STALE_SECONDS}"
+        )
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.snapshot_prefix):
+            snapshot = self.find_snapshot(request.path_info)
+            if snapshot is not None:
+                return self.serve(snapshot, request)
+        return super().__call__(request)
+
+    def find_snapshot(self, url):
+        if not self.url_is_canonical(url):
+            return None
+        relative = url[len(self.snapshot_prefix):]
+        if not relative or relative.endswith('/'):
+            relative += 'index.html'
+        if relative.endswith('.gz') or '/.' in '/' + relative:
+            return None
+        path = os.path.join(self.snapshot_root, relative)
+        if not os.path.isfile(path):
+            return None
+        headers = Headers([])
+        self.add_mime_headers(headers, path, url)
+        headers['Cache-Control'] = self.snapshot_cache_control
+        return StaticFile(path, headers.items(), encodings={'gzip': path + '.gz'})
@@ -19,9 +19,13 @@ from django.urls import path, include
 
 from django.views.generic import TemplateView
 
+from dote_central.metrics import metrics_view
+from initiatives.views import ServiceWorkerView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('initiatives.urls')),
     path('manifest.json', TemplateView.as_view(template_name='manifest.json', content_type='application/json'), name='manifest'),
-    path('sw.js', TemplateView.as_view(template_name='sw.js', content_type='application/javascript'), name='sw'),
+    path('sw.js', ServiceWorkerView.as_view(), name='sw'),
 ]
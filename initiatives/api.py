@@ -0,0 +1,109 @@
+"""
+Read-only list API for BI syncs: /api/<resource>/?fields=...&updated_since=...&cursor=...
+
+Rows come back in (updated_at, id) order, read through the matching index.
+`next_cursor` resumes after the last row returned, even on the final page
+(`has_more` false), so a job can keep it and later fetch only rows changed
+since. `fields` becomes
+a `.values()` projection, so unrequested columns are never read. Deleted rows
+are listed by /api/deletions/ in `deleted_at` order, paged the same way; an
+entry without an `object_id` means the whole resource was replaced and should
+be re-pulled in full.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import DeletedRecord, Initiative, RealizedBenefit, Technology, TechnologyUsage
+
+# resource -> (model, exposed fields); foreign keys are returned as ids
+RESOURCES = {
+    'initiatives': (Initiative, [
+        'id', 'name', 'requester_name', 'lob_owner', 'description', 'it_owner', 'it_owner_email', 'department',
+        'status', 'technology', 'value', 'benefit_name', 'kpi_name', 'multiplier_minutes', 'multiplier_dollars',
+        'created_at', 'updated_at',
+    ]),
+    'benefits': (RealizedBenefit, [
+        'id', 'initiative', 'month', 'yyyymm', 'kpi_value', 'revenue_impact', 'calculated_minutes',
+        'calculated_dollars', 'created_at', 'updated_at',
+    ]),
+    'technologies': (Technology, ['id', 'name', 'icon', 'max_consumption', 'updated_at']),
+    'usage': (TechnologyUsage, ['id', 'technology', 'month', 'yyyymm', 'consumption', 'updated_at']),
+    'deletions': (DeletedRecord, ['id', 'resource', 'object_id', 'deleted_at']),
+}
+# Column the cursor pages by, where it isn't updated_at
+CURSOR_FIELDS = {'deletions': 'deleted_at'}
+
+
+class APIError(ValueError):
+    pass
+
+
+def parse_timestamp(value):
+    """ISO datetime or date; naive values are taken as UTC."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def encode_cursor(updated_at, pk):
+    return base64.urlsafe_b64encode(json.dumps([updated_at.isoformat(), pk]).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        updated_at, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return parse_timestamp(updated_at), int(pk)
+    except (binascii.Error, TypeError, ValueError):
+        raise APIError("Invalid cursor")
+
+
+def list_page(resource, params):
+    """{'results': [...], 'next_cursor': str|None, 'has_more': bool} for one page of `resource`."""
+    if resource not in RESOURCES:
+        raise LookupError(resource)
+    model, exposed = RESOURCES[resource]
+    stamp = CURSOR_FIELDS.get(resource, 'updated_at')
+
+    fields = [name.strip() for value in params.getlist('fields') for name in value.split(',') if name.strip()] or exposed
+    unknown = [name for name in fields if name not in exposed]
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(exposed)}")
+
+    try:
+        limit = int(params.get('limit', settings.API_PAGE_SIZE))
+    except ValueError:
+        raise APIError("limit must be an integer")
+    limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+    rows = model.objects.order_by(stamp, 'id')
+    if params.get('updated_since'):
+        try:
+            rows = rows.filter(**{f'{stamp}__gte': parse_timestamp(params['updated_since'])})
+        except ValueError:
+            raise APIError("updated_since must be an ISO date or datetime")
+    if params.get('cursor'):
+        updated_at, pk = decode_cursor(params['cursor'])
+        rows = rows.filter(Q(**{f'{stamp}__gt': updated_at}) | Q(**{stamp: updated_at, 'id__gt': pk}))
+
+    # The cursor columns are always read, but only returned when asked for
+    page = list(rows.values(*dict.fromkeys(fields + [stamp, 'id']))[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    return {
+        'results': [{name: row[name] for name in fields} for row in page],
+        'next_cursor': encode_cursor(page[-1][stamp], page[-1]['id']) if page else params.get('cursor') or None,
+        'has_more': has_more,
+    }
@@ -0,0 +1,95 @@
+"""
+Batched run-rate forecasting for technology capacity.
+
+One pass loads the recent monthly usage for every technology in a single
+query, fits a least-squares trend per technology with numpy (all rows at
+once), projects it forward and records the first month each technology is
+expected to exceed its monthly `max_consumption`. Results are cached on
+TechnologyCapacity so the technology list renders them without computing
+anything per request.
+"""
+from datetime import date
+
+from django.utils import timezone
+
+from .models import Technology, TechnologyUsage, TechnologyCapacity
+from .periods import to_period, add_months
+
+HISTORY_MONTHS = 12
+HORIZON_MONTHS = 12
+
+FORECAST_FIELDS = ['run_rate', 'trend', 'breach_yyyymm', 'forecast_at']
+
+
+def fit_trends(usage, np):
+    """
+    Least-squares line through each row of `usage` (technologies x months,
+    NaN where no usage was reported). Returns (intercept, slope, counts);
+    rows with a single point get a flat line, rows with none get NaN.
+    """
+    months = np.arange(usage.shape[1], dtype=float)
+    mask = ~np.isnan(usage)
+    values = np.where(mask, usage, 0.0)
+    x = np.where(mask, months, 0.0)
+
+    n = mask.sum(axis=1).astype(float)
+    sx, sy = x.sum(axis=1), values.sum(axis=1)
+    sxx, sxy = (x * x).sum(axis=1), (x * values).sum(axis=1)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0)
+        intercept = (sy - slope * sx) / n
+    return intercept, slope, n
+
+
+def run_forecast(today=None, history=HISTORY_MONTHS, horizon=HORIZON_MONTHS):
+    """Refresh YTD figures and write the run-rate forecast for every technology. Returns the count."""
+    import numpy as np  # Only the batch pass needs numpy; keep it off the request path
+
+    today = today or date.today()
+    TechnologyCapacity.rebuild(today)
+    technologies = list(Technology.objects.order_by('pk').values_list('pk', 'max_consumption'))
+    if not technologies:
+        return 0
+
+    current = today.replace(day=1)
+    first = add_months(current, -(history - 1))
+    column = {to_period(add_months(first, i)): i for i in range(history)}
+    row = {pk: i for i, (pk, _) in enumerate(technologies)}
+
+    usage = np.full((len(technologies), history), np.nan)
+    for technology_id, yyyymm, consumption in TechnologyUsage.objects.filter(
+        yyyymm__gte=to_period(first), yyyymm__lte=to_period(current),
+    ).values_list('technology_id', 'yyyymm', 'consumption'):
+        usage[row[technology_id], column[yyyymm]] = consumption
+
+    intercept, slope, counts = fit_trends(usage, np)
+    steps = np.arange(history, history + horizon, dtype=float)
+    projected = np.clip(intercept[:, None] + slope[:, None] * steps[None, :], 0, None)
+
+    caps = np.array([cap or 0 for _, cap in technologies], dtype=float)
+    latest = np.array([
+        usage[i][~np.isnan(usage[i])][-1] if counts[i] else np.nan for i in range(len(technologies))
+    ])
+    over = (projected > caps[:, None]) & (caps[:, None] > 0)
+    already_over = (caps > 0) & (latest > caps)
+    first_breach = np.where(over.any(axis=1), over.argmax(axis=1), -1)
+
+    forecast_at = timezone.now()
+    capacities = {c.technology_id: c for c in TechnologyCapacity.objects.all()}
+    for i, (pk, _) in enumerate(technologies):
+        capacity = capacities[pk]
+        if not counts[i]:
+            capacity.run_rate = capacity.trend = capacity.breach_yyyymm = None
+        else:
+            capacity.run_rate = float(projected[i, 0])
+            capacity.trend = float(slope[i])
+            if already_over[i]:
+                capacity.breach_yyyymm = capacity.latest_yyyymm
+            elif first_breach[i] >= 0:
+                capacity.breach_yyyymm = to_period(add_months(current, int(first_breach[i]) + 1))
+            else:
+                capacity.breach_yyyymm = None
+        capacity.forecast_at = forecast_at
+    TechnologyCapacity.objects.bulk_update(capacities.values(), FORECAST_FIELDS, batch_size=500)
+    return len(capacities)
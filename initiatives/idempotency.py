@@ -0,0 +1,58 @@
+"""
+Idempotency keys for webhook reports.
+
+A reporter that retries sends the same `Idempotency-Key` header (or
+`idempotency_key` field). The first successful response is remembered in the
+cache for WEBHOOK_IDEMPOTENCY_SECONDS under the webhook key plus the
+idempotency key, and a retry gets it back without touching the database.
+The cache bounds the store: locmem evicts past MAX_ENTRIES, and shared
+backends by memory. An evicted key only costs a normal request, which the
+no-op check then answers as `unchanged`. Reusing a key with a different
+payload is refused instead of replayed.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    pass
+
+
+def request_key(request, payload):
+    """The key from the Idempotency-Key header or the payload, or None. Raises ValueError if it is too long."""
+    key = request.headers.get('Idempotency-Key') or payload.get('idempotency_key')
+    if key is None or key == '':
+        return None
+    key = str(key)
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f"Idempotency key must be at most {MAX_KEY_LENGTH} characters")
+    return key
+
+
+def _cache_key(webhook_key, key):
+    return 'webhook-idem:' + hashlib.sha256(f"{webhook_key}\0{key}".encode()).hexdigest()
+
+
+def _fingerprint(payload):
+    body = {name: value for name, value in payload.items() if name != 'idempotency_key'}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def lookup(webhook_key, key, payload):
+    """The remembered response body for this key, or None. Raises IdempotencyConflict on a different payload."""
+    entry = cache.get(_cache_key(webhook_key, key))
+    if entry is None:
+        return None
+    fingerprint, body = entry
+    if fingerprint != _fingerprint(payload):
+        raise IdempotencyConflict("Idempotency key was already used with a different payload")
+    return body
+
+
+def remember(webhook_key, key, payload, body):
+    cache.set(_cache_key(webhook_key, key), (_fingerprint(payload), body), settings.WEBHOOK_IDEMPOTENCY_SECONDS)
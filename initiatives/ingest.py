@@ -0,0 +1,194 @@
+"""
+Bulk ingestion: TechnologyUsage from the keyed JSON endpoint and the CSV
+upload, and RealizedBenefit entries replayed by the offline service worker.
+
+Rows are `(technology, month, consumption)`. Technology names are resolved
+in one query, the existing months in one more, and everything that changed
+is upserted on the (technology, month) unique constraint in a single
+transaction. Each input row gets a result: created, updated, unchanged,
+duplicate (a later row in the same batch wins) or error.
+
+Benefit entries are absolute values for an (initiative, month), so
+replaying a batch that was already applied leaves the data as it is
+(`unchanged`). An entry queued before the month was last edited online is
+`stale` and skipped, so a late replay can't overwrite newer figures.
+"""
+import csv
+import io
+import math
+from datetime import datetime
+
+from django.db import transaction
+
+from .api import parse_timestamp
+from .models import Initiative, RealizedBenefit, Technology, TechnologyUsage, TechnologyCapacity, TechnologyEconomics
+from .periods import to_period
+
+COLUMNS = ['technology', 'month', 'consumption']
+
+
+def parse_month(value):
+    value = str(value or '').strip()
+    for fmt in ('%Y-%m', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt).date().replace(day=1)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid month '{value}'. Use YYYY-MM")
+
+
+def rows_from_csv(text):
+    """Dict rows from CSV text with `technology`, `month` and `consumption` columns (any case/order)."""
+    reader = csv.DictReader(io.StringIO(text))
+    if reader.fieldnames is None:
+        raise ValueError("The file is empty.")
+    headers = {(name or '').strip().lower(): name for name in reader.fieldnames}
+    missing = [column for column in COLUMNS if column not in headers]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return [{column: row.get(headers[column]) for column in COLUMNS} for row in reader]
+
+
+def ingest_usage(rows):
+    """Validate and upsert `rows`. Returns {'summary': {...}, 'results': [...]} in input order."""
+    results = []
+    valid = []
+    for index, row in enumerate(rows, start=1):
+        result = {'row': index, 'technology': None, 'month': None}
+        results.append(result)
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("Row must be an object")
+            name = str(row.get('technology') or '').strip()
+            if not name:
+                raise ValueError("Missing technology")
+            result['technology'] = name
+            month = parse_month(row.get('month'))
+            result['month'] = month.strftime('%Y-%m')
+            consumption = float(row.get('consumption'))
+            if not math.isfinite(consumption):
+                raise ValueError("Consumption must be a finite number")
+        except (TypeError, ValueError) as e:
+            result.update(status='error', error=str(e) if str(e) else "Invalid row")
+            continue
+        valid.append((result, name, month, consumption))
+
+    technologies = dict(Technology.objects.filter(name__in={name for _, name, _, _ in valid}).values_list('name', 'pk'))
+
+    latest = {}
+    for result, name, month, consumption in valid:
+        if name not in technologies:
+            result.update(status='error', error=f"Unknown technology '{name}'")
+            continue
+        key = (technologies[name], to_period(month))
+        if key in latest:
+            latest[key][0].update(status='duplicate', error="Superseded by a later row for the same month")
+        latest[key] = (result, month, consumption)
+
+    with transaction.atomic():
+        if latest:
+            periods = [yyyymm for _, yyyymm in latest]
+            existing = {
+                (technology_id, yyyymm): consumption
+                for technology_id, yyyymm, consumption in TechnologyUsage.objects.filter(
+                    technology_id__in={technology_id for technology_id, _ in latest},
+                    yyyymm__gte=min(periods), yyyymm__lte=max(periods),
+                ).values_list('technology_id', 'yyyymm', 'consumption')
+            }
+        else:
+            existing = {}
+
+        upserts = []
+        for (technology_id, yyyymm), (result, month, consumption) in latest.items():
+            previous = existing.get((technology_id, yyyymm))
+            if previous == consumption:
+                result['status'] = 'unchanged'
+                continue
+            result['status'] = 'created' if previous is None else 'updated'
+            upserts.append(TechnologyUsage(technology_id=technology_id, month=month, yyyymm=yyyymm, consumption=consumption))
+
+        if upserts:
+            TechnologyUsage.objects.bulk_create(
+                upserts, batch_size=500, update_conflicts=True,
+                unique_fields=['technology', 'month'], update_fields=['yyyymm', 'consumption', 'updated_at'],
+            )
+            # bulk_create skips TechnologyUsage.save(), so refresh the touched technologies in one pass
+            technology_ids = {usage.technology_id for usage in upserts}
+            TechnologyCapacity.rebuild(technology_ids=technology_ids)
+            TechnologyEconomics.rebuild(technology_ids=technology_ids, periods={usage.yyyymm for usage in upserts})
+
+    summary = {'rows': len(results)}
+    for status in ('created', 'updated', 'unchanged', 'duplicate', 'error'):
+        summary[status] = sum(1 for result in results if result.get('status') == status)
+    return {'summary': summary, 'results': results}
+
+
+def ingest_benefits(entries):
+    """
+    Apply offline benefit entries ({id, initiative, month, kpi_value, revenue_impact?, queued_at?}).
+    Returns {'summary': {...}, 'results': [...]} in input order, each result echoing the entry id.
+    """
+    results = []
+    valid = []
+    for index, entry in enumerate(entries, start=1):
+        result = {'row': index, 'id': None, 'initiative': None, 'month': None}
+        results.append(result)
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("Entry must be an object")
+            result['id'] = entry.get('id')
+            initiative_id = int(entry.get('initiative'))
+            result['initiative'] = initiative_id
+            month = parse_month(entry.get('month'))
+            result['month'] = month.strftime('%Y-%m')
+            kpi_value = float(entry.get('kpi_value') or 0)
+            revenue_impact = float(entry.get('revenue_impact') or 0)
+            if not (math.isfinite(kpi_value) and math.isfinite(revenue_impact)):
+                raise ValueError("Values must be finite numbers")
+            queued_at = parse_timestamp(str(entry['queued_at'])) if entry.get('queued_at') else None
+        except (TypeError, ValueError) as e:
+            result.update(status='error', error=str(e) if str(e) else "Invalid entry")
+            continue
+        valid.append((result, initiative_id, month, kpi_value, revenue_impact, queued_at))
+
+    initiatives = Initiative.objects.in_bulk({initiative_id for _, initiative_id, _, _, _, _ in valid})
+
+    latest = {}
+    for result, initiative_id, month, kpi_value, revenue_impact, queued_at in valid:
+        if initiative_id not in initiatives:
+            result.update(status='error', error=f"Unknown initiative {initiative_id}")
+            continue
+        key = (initiative_id, month)
+        if key in latest:
+            latest[key][0].update(status='duplicate', error="Superseded by a later entry for the same month")
+        latest[key] = (result, kpi_value, revenue_impact, queued_at)
+
+    with transaction.atomic():
+        existing = {}
+        if latest:
+            existing = {
+                (benefit.initiative_id, benefit.month): benefit for benefit in RealizedBenefit.objects.filter(
+                    initiative_id__in={initiative_id for initiative_id, _ in latest},
+                    month__in={month for _, month in latest},
+                )
+            }
+        # save() recomputes dollars and refreshes rollups, unit economics and live dashboards
+        for (initiative_id, month), (result, kpi_value, revenue_impact, queued_at) in latest.items():
+            benefit = existing.get((initiative_id, month))
+            if benefit is not None and (benefit.kpi_value, benefit.revenue_impact) == (kpi_value, revenue_impact):
+                result['status'] = 'unchanged'
+                continue
+            if benefit is not None and queued_at and benefit.updated_at > queued_at:
+                result.update(status='stale', error="The month was edited after this entry was queued")
+                continue
+            result['status'] = 'created' if benefit is None else 'updated'
+            if benefit is None:
+                benefit = RealizedBenefit(initiative_id=initiative_id, month=month)
+            benefit.initiative = initiatives[initiative_id]
+            benefit.kpi_value, benefit.revenue_impact = kpi_value, revenue_impact
+            benefit.save()
+
+    summary = {'rows': len(results)}
+    for status in ('created', 'updated', 'unchanged', 'stale', 'duplicate', 'error'):
+        summary[status] = sum(1 for result in results if result.get('status') == status)
+    return {'summary': summary, 'results': results}
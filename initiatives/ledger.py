@@ -0,0 +1,131 @@
+"""
+KPI event ledger: append-only events rolled into monthly RealizedBenefit rows.
+
+`compact()` reads events past the ledger watermark in id order, adds their
+totals to the matching monthly benefits and advances the watermark in the
+same transaction, so every event is counted exactly once and a run only
+touches what arrived since the last one. A batch stops at the first event
+younger than KPI_EVENT_SETTLE_SECONDS, so neither it nor anything after it
+moves the watermark until it has settled, and a slow transaction that
+commits a lower id late is not skipped.
+
+`downsample()` folds compacted events older than the retention window into
+one daily row per initiative, day and source (keeping the lowest id, which
+is already behind the watermark), so the table stays bounded while still
+answering per-day questions.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .api import parse_timestamp
+from .models import Initiative, KPIEvent, LedgerWatermark, RealizedBenefit
+
+LEDGER = 'kpi_events'
+
+
+def record_events(initiative, events, source='API'):
+    """
+    Validate and append events ({'kpi_value', 'revenue_impact'?, 'timestamp'?}).
+    Raises ValueError naming the first bad event; nothing is written then.
+    """
+    now = timezone.now()
+    rows = []
+    for index, event in enumerate(events, start=1):
+        if not isinstance(event, dict):
+            raise ValueError(f"Event {index} must be an object")
+        try:
+            kpi_value = float(event.get('kpi_value') or 0)
+            revenue_impact = float(event.get('revenue_impact') or 0)
+        except (TypeError, ValueError):
+            raise ValueError(f"Event {index}: kpi_value and revenue_impact must be numbers")
+        occurred_at = now
+        if event.get('timestamp'):
+            try:
+                occurred_at = parse_timestamp(str(event['timestamp']))
+            except ValueError:
+                raise ValueError(f"Event {index}: invalid timestamp '{event['timestamp']}'. Use ISO 8601")
+        rows.append(KPIEvent(initiative=initiative, occurred_at=occurred_at, kpi_value=kpi_value,
+                             revenue_impact=revenue_impact, source=source))
+    return KPIEvent.objects.bulk_create(rows, batch_size=500)
+
+
+def compact(batch_size=5000, now=None):
+    """Roll new events into RealizedBenefit, one batch per transaction. Returns the number of events."""
+    settle = (now or timezone.now()) - timedelta(seconds=settings.KPI_EVENT_SETTLE_SECONDS)
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark, _ = LedgerWatermark.objects.select_for_update().get_or_create(name=LEDGER)
+            rows = list(KPIEvent.objects.filter(id__gt=watermark.position).order_by('id').values_list(
+                'id', 'initiative_id', 'occurred_at', 'kpi_value', 'revenue_impact', 'recorded_at',
+            )[:batch_size])
+            # Skipping an unsettled event would pass the watermark over it for good
+            settled = next((i for i, row in enumerate(rows) if row[5] > settle), len(rows))
+            events = rows[:settled]
+            if not events:
+                return processed
+
+            totals = {}
+            for _, initiative_id, occurred_at, kpi_value, revenue_impact, _ in events:
+                month = timezone.localtime(occurred_at).date().replace(day=1)
+                entry = totals.setdefault((initiative_id, month), [0.0, 0.0])
+                entry[0] += kpi_value
+                entry[1] += revenue_impact
+
+            initiatives = Initiative.objects.in_bulk({initiative_id for initiative_id, _ in totals})
+            existing = {
+                (b.initiative_id, b.month): b for b in RealizedBenefit.objects.filter(
+                    initiative_id__in=initiatives, month__in={month for _, month in totals},
+                )
+            }
+            # save() recomputes dollars and refreshes rollups, unit economics and live dashboards
+            for (initiative_id, month), (kpi_value, revenue_impact) in totals.items():
+                benefit = existing.get((initiative_id, month)) or RealizedBenefit(initiative_id=initiative_id, month=month)
+                benefit.initiative = initiatives[initiative_id]
+                benefit.kpi_value += kpi_value
+                benefit.revenue_impact += revenue_impact
+                benefit.save()
+
+            watermark.position = events[-1][0]
+            watermark.save(update_fields=['position', 'updated_at'])
+            processed += len(events)
+        if len(events) < batch_size:
+            return processed
+
+
+def downsample(retention_days=None, now=None):
+    """Fold compacted raw events older than the retention window into daily rows. Returns rows removed."""
+    retention_days = settings.KPI_EVENT_RETENTION_DAYS if retention_days is None else retention_days
+    today = timezone.localtime(now or timezone.now()).date()
+    cutoff = timezone.make_aware(datetime.combine(today - timedelta(days=retention_days), time.min))
+
+    with transaction.atomic():
+        position = LedgerWatermark.objects.filter(name=LEDGER).values_list('position', flat=True).first() or 0
+        raw = KPIEvent.objects.filter(daily=False, occurred_at__lt=cutoff, id__lte=position)
+        groups = list(raw.annotate(day=TruncDate('occurred_at')).order_by().values('initiative_id', 'day', 'source').annotate(
+            keep=Min('id'), rows=Count('id'), events=Sum('events'), kpi_value=Sum('kpi_value'), revenue_impact=Sum('revenue_impact'),
+        ))
+        if not groups:
+            return 0
+        KPIEvent.objects.bulk_update([
+            KPIEvent(id=group['keep'], occurred_at=timezone.make_aware(datetime.combine(group['day'], time.min)),
+                     events=group['events'], kpi_value=group['kpi_value'], revenue_impact=group['revenue_impact'], daily=True)
+            for group in groups
+        ], ['occurred_at', 'events', 'kpi_value', 'revenue_impact', 'daily'], batch_size=500)
+        # Every kept row is now daily, so what's left raw in the window was folded into them
+        removed, _ = raw.delete()
+    return removed
+
+
+def daily_totals(initiative_id, start, end):
+    """[{'date', 'kpi_value', 'revenue_impact', 'events'}] per day with events in [start, end)."""
+    return list(
+        KPIEvent.objects.filter(initiative_id=initiative_id, occurred_at__gte=start, occurred_at__lt=end)
+        .annotate(date=TruncDate('occurred_at')).order_by('date').values('date')
+        .annotate(kpi_value=Sum('kpi_value'), revenue_impact=Sum('revenue_impact'), events=Sum('events'))
+    )
@@ -0,0 +1,117 @@
+"""
+In-process fan-out of benefit write deltas to Server-Sent Events streams.
+
+Writers call `publish()` after commit; every open dashboard stream in this
+process receives the event. Streams hold a server thread (WSGI) or a task
+(ASGI) for their lifetime, so the number of concurrent streams is capped by
+LIVE_UPDATES_MAX_CONNECTIONS and each one is recycled after
+LIVE_UPDATES_MAX_AGE seconds; EventSource reconnects on its own. Writes
+handled by another instance are not seen until that display reloads.
+"""
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+QUEUE_SIZE = 100
+ASYNC_POLL_INTERVAL = 0.5
+
+_lock = threading.Lock()
+_subscribers = set()
+_event_ids = itertools.count(1)
+
+
+def max_connections():
+    return getattr(settings, 'LIVE_UPDATES_MAX_CONNECTIONS', 3)
+
+def max_age():
+    return getattr(settings, 'LIVE_UPDATES_MAX_AGE', 300)
+
+def heartbeat_interval():
+    return getattr(settings, 'LIVE_UPDATES_HEARTBEAT', 15)
+
+
+class Subscriber:
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # A stalled client is told to reload rather than ever blocking a writer
+            self.overflowed = True
+
+
+def subscribe():
+    """Registers a new stream, or returns None when the connection budget is spent."""
+    with _lock:
+        if len(_subscribers) >= max_connections():
+            return None
+        subscriber = Subscriber()
+        _subscribers.add(subscriber)
+        return subscriber
+
+def unsubscribe(subscriber):
+    with _lock:
+        _subscribers.discard(subscriber)
+
+def has_subscribers():
+    return bool(_subscribers)
+
+def format_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+def publish(event, data):
+    message = format_event(event, data, next(_event_ids))
+    with _lock:
+        subscribers = list(_subscribers)
+    for subscriber in subscribers:
+        subscriber.put(message)
+
+def stream(subscriber):
+    try:
+        yield f"retry: {heartbeat_interval() * 1000}\n\n"
+        deadline = time.monotonic() + max_age()
+        while time.monotonic() < deadline and not subscriber.overflowed:
+            try:
+                yield subscriber.queue.get(timeout=heartbeat_interval())
+            except queue.Empty:
+                yield ": keepalive\n\n"
+        if subscriber.overflowed:
+            yield format_event('reload', {})
+    finally:
+        unsubscribe(subscriber)
+
+async def astream(subscriber):
+    """ASGI variant: polls the queue from the event loop instead of parking a thread."""
+    try:
+        yield f"retry: {heartbeat_interval() * 1000}\n\n"
+        deadline = time.monotonic() + max_age()
+        idle = 0.0
+        while time.monotonic() < deadline and not subscriber.overflowed:
+            try:
+                yield subscriber.queue.get_nowait()
+                idle = 0.0
+                continue
+            except queue.Empty:
+                pass
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+            idle += ASYNC_POLL_INTERVAL
+            if idle >= heartbeat_interval():
+                idle = 0.0
+                yield ": keepalive\n\n"
+        if subscriber.overflowed:
+            yield format_event('reload', {})
+    finally:
+        unsubscribe(subscriber)
@@ -0,0 +1,147 @@
+import json
+import random
+import subprocess
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from initiatives.models import Initiative, RealizedBenefit, Technology, TechnologyUsage, AuditLog
+from .generate_synthetic_data import NAME_PREFIX
+
+# name -> (method, url name, params); exports read every row so they get fewer iterations
+ENDPOINTS = {
+    'dashboard': ('get', 'dashboard', {}),
+    'dashboard_quarter': ('get', 'dashboard', {'range': 'last12', 'granularity': 'quarter'}),
+    'benefit_analysis': ('get', 'benefit_analysis', {}),
+    'initiative_list': ('get', 'initiative_list', {}),
+    'initiative_search': ('get', 'initiative_list', {'q': 'Claims', 'sort': 'name'}),
+    'technology_list': ('get', 'technology_list', {}),
+    'unit_economics': ('get', 'unit_economics', {'range': 'last12'}),
+    'export_json': ('get', 'csv_download', {}),
+    'export_benefits': ('get', 'benefit_csv_download', {}),
+    'webhook': ('post', 'webhook_report', None),
+}
+EXPORTS = {'export_json', 'export_benefits'}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main endpoints through the test client against the configured "
+        "database and print p50/p95/p99 latency, queries and peak memory as JSON. "
+        "The webhook benchmark writes benefits for generated initiatives only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--export-iterations', type=int, default=3, dest='export_iterations')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', choices=sorted(ENDPOINTS),
+                            help="Endpoint to run (repeatable). Defaults to all.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        if not Initiative.objects.exists():
+            raise CommandError("No initiatives found. Run generate_synthetic_data first.")
+        endpoints = options['endpoints'] or list(ENDPOINTS)
+        rng = random.Random(options['seed'])
+        # The webhook benchmark overwrites benefits, so it only reports for generated initiatives
+        webhook_keys = list(
+            Initiative.objects.filter(name__startswith=NAME_PREFIX).exclude(webhook_key=None)
+            .values_list('webhook_key', flat=True)[:1000]
+        )
+        if 'webhook' in endpoints and not webhook_keys:
+            raise CommandError("No generated initiatives to report for. Run generate_synthetic_data or skip --endpoint webhook.")
+        months = list(RealizedBenefit.objects.order_by().values_list('month', flat=True).distinct()[:24])
+
+        results = {}
+        # Time against plain static storage so the run doesn't depend on collectstatic, and
+        # without the webhook rate limits, which would refuse most of the repeated posts
+        with override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+                               WEBHOOK_RATE_PER_MINUTE=0, WEBHOOK_IP_RATE_PER_MINUTE=0):
+            client = Client(raise_request_exception=True)
+            for name in endpoints:
+                method, url_name, params = ENDPOINTS[name]
+                iterations = options['export_iterations'] if name in EXPORTS else options['iterations']
+
+                def request():
+                    if params is not None:
+                        return getattr(client, method)(reverse(url_name), params)
+                    payload = {
+                        'webhook_key': rng.choice(webhook_keys),
+                        'kpi_value': round(rng.uniform(0, 1000), 2),
+                        'month': rng.choice(months).strftime('%Y-%m'),
+                    }
+                    return client.post(reverse(url_name), json.dumps(payload), content_type='application/json')
+
+                results[name] = self.measure(request, iterations)
+                self.stderr.write(f"{name:>18}: p50 {results[name]['p50_ms']:8.1f} ms, "
+                                  f"p95 {results[name]['p95_ms']:8.1f} ms, {results[name]['queries']} queries")
+
+        report = {
+            'commit': self.git_commit(),
+            'database': connection.vendor,
+            'dataset': {
+                'initiatives': Initiative.objects.count(),
+                'benefits': RealizedBenefit.objects.count(),
+                'technologies': Technology.objects.count(),
+                'technology_usages': TechnologyUsage.objects.count(),
+                'audit_logs': AuditLog.objects.count(),
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+        self.stdout.write(output)
+
+    def measure(self, request, iterations):
+        # One untimed request warms template and query caches
+        status = request().status_code
+        timings = []
+        queries = []
+        for _ in range(max(1, iterations)):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx))
+            status = response.status_code
+
+        # Peak memory is traced in a separate pass; tracemalloc slows the timed runs down
+        tracemalloc.start()
+        try:
+            request()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': status,
+            'iterations': len(timings),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
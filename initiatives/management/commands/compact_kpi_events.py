@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from initiatives.ledger import compact, downsample
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll KPI events recorded since the last run into monthly benefits, then fold "
+        "raw events older than the retention window into daily rows. Run it on a schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, dest='batch_size')
+        parser.add_argument('--retention-days', type=int, dest='retention_days',
+                            help="Override KPI_EVENT_RETENTION_DAYS.")
+        parser.add_argument('--skip-downsample', action='store_true', dest='skip_downsample')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        compacted = compact(batch_size=options['batch_size'])
+        removed = 0 if options['skip_downsample'] else downsample(options['retention_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{compacted} event(s) compacted, {removed} raw event(s) folded into daily rows "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from initiatives.capacity import HISTORY_MONTHS, HORIZON_MONTHS, run_forecast
+from initiatives.models import TechnologyCapacity
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh technology YTD consumption and forecast, for every technology in one "
+        "batch, the month each is projected to exceed max_consumption. Schedule it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', type=int, default=HISTORY_MONTHS, help="Months of usage to fit.")
+        parser.add_argument('--horizon', type=int, default=HORIZON_MONTHS, help="Months to project ahead.")
+        parser.add_argument('--as-of', dest='as_of', help="Forecast as of YYYY-MM instead of the current month.")
+
+    def handle(self, *args, **options):
+        today = None
+        if options['as_of']:
+            try:
+                today = datetime.strptime(options['as_of'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError(f"Invalid --as-of '{options['as_of']}'. Use YYYY-MM")
+        if options['history'] < 2 or options['horizon'] < 1:
+            raise CommandError("--history must be at least 2 and --horizon at least 1")
+
+        count = run_forecast(today=today, history=options['history'], horizon=options['horizon'])
+        for capacity in TechnologyCapacity.objects.select_related('technology').exclude(breach_yyyymm=None).order_by('breach_yyyymm'):
+            self.stdout.write(f"{capacity.technology.name}: projected over capacity from {capacity.breach_month.strftime('%b %Y')}")
+        self.stdout.write(self.style.SUCCESS(f"{count} technology forecast(s) updated."))
@@ -0,0 +1,174 @@
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from initiatives.models import (
+    Initiative, MultiplierVersion, RealizedBenefit, BenefitRollup, Technology, TechnologyUsage, TechnologyCapacity,
+    TechnologyEconomics, AuditLog, WebhookAuditLog, DeletedRecord,
+)
+from initiatives.periods import to_period, add_months
+
+TECHNOLOGIES = [
+    'Copilot', 'Gemini', 'Azure OpenAI', 'Vertex AI', 'UiPath', 'Power Automate',
+    'Blue Prism', 'ServiceNow', 'Salesforce Einstein', 'Document AI', 'Dialogflow', 'Tableau',
+]
+KPI_NAMES = ['Tasks automated', 'Claims triaged', 'Emails drafted', 'Calls deflected', 'Documents processed', 'Quotes issued']
+NAME_PREFIX = 'Synthetic'
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic dataset (initiatives, benefits, technologies, "
+        "usage and audit logs) with bulk inserts, for sizing and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--initiatives', type=int, default=1000)
+        parser.add_argument('--benefits', type=int, default=100000,
+                            help="Total RealizedBenefit rows, spread as consecutive months per initiative.")
+        parser.add_argument('--technologies', type=int, default=len(TECHNOLOGIES))
+        parser.add_argument('--audit-logs', type=int, default=10000, dest='audit_logs')
+        parser.add_argument('--webhook-logs', type=int, default=10000, dest='webhook_logs')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000, dest='batch_size')
+        parser.add_argument('--flush', action='store_true',
+                            help="Delete previously generated synthetic initiatives and their rows first.")
+
+    def handle(self, *args, **options):
+        if options['initiatives'] < 1:
+            raise CommandError("--initiatives must be at least 1")
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        months_each = max(1, -(-options['benefits'] // options['initiatives']))
+        last_month = date.today().replace(day=1)
+        first_month = add_months(last_month, -(months_each - 1))
+        started = time.perf_counter()
+
+        if options['flush']:
+            deleted, _ = Initiative.objects.filter(name__startswith=f"{NAME_PREFIX} ").delete()
+            if deleted:
+                DeletedRecord.record_resync('initiatives', 'benefits')
+            self.stdout.write(f"Flushed {deleted} synthetic row(s)")
+
+        technologies = self.create_technologies(rng, max(1, options['technologies']), first_month, months_each, batch_size)
+
+        remaining = options['benefits']
+        created_initiatives = 0
+        created_benefits = 0
+        offset = Initiative.objects.filter(name__startswith=f"{NAME_PREFIX} ").count()
+        for chunk_start in range(0, options['initiatives'], batch_size):
+            chunk = range(chunk_start, min(chunk_start + batch_size, options['initiatives']))
+            with transaction.atomic():
+                initiatives = Initiative.objects.bulk_create(
+                    [self.build_initiative(rng, offset + i, technologies) for i in chunk], batch_size=batch_size,
+                )
+                MultiplierVersion.objects.bulk_create([
+                    MultiplierVersion(initiative=initiative, effective_from=first_month,
+                                      multiplier_minutes=initiative.multiplier_minutes,
+                                      multiplier_dollars=initiative.multiplier_dollars)
+                    for initiative in initiatives
+                ], batch_size=batch_size)
+
+                benefits = []
+                for initiative in initiatives:
+                    count = min(months_each, remaining)
+                    remaining -= count
+                    benefits.extend(self.build_benefits(rng, initiative, add_months(last_month, -(count - 1)), count))
+                    if len(benefits) >= batch_size:
+                        RealizedBenefit.objects.bulk_create(benefits, batch_size=batch_size)
+                        created_benefits += len(benefits)
+                        benefits = []
+                RealizedBenefit.objects.bulk_create(benefits, batch_size=batch_size)
+                created_benefits += len(benefits)
+                BenefitRollup.rebuild(initiative_ids=[i.pk for i in initiatives])
+            created_initiatives += len(initiatives)
+            self.stdout.write(f"  {created_initiatives} initiatives, {created_benefits} benefits")
+
+        TechnologyEconomics.rebuild()
+        self.create_logs(rng, options['audit_logs'], options['webhook_logs'], batch_size)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {created_initiatives} initiatives, {created_benefits} benefits, "
+            f"{len(technologies)} technologies, {options['audit_logs']} audit and "
+            f"{options['webhook_logs']} webhook logs in {elapsed:.1f}s."
+        ))
+
+    def build_initiative(self, rng, index, technologies):
+        productivity = rng.random() < 0.7
+        return Initiative(
+            name=f"{NAME_PREFIX} {index:06d}",
+            requester_name=f"Requester {rng.randint(1, 500)}",
+            lob_owner=f"Owner {rng.randint(1, 200)}",
+            description="Synthetic initiative for load testing.",
+            it_owner=f"IT Owner {rng.randint(1, 100)}",
+            department=rng.choice(Initiative.DEPARTMENT_CHOICES)[0],
+            status=rng.choices([c[0] for c in Initiative.STATUS_CHOICES], weights=[5, 2, 2, 1])[0],
+            technology=rng.choice(technologies),
+            value="Synthetic business value.",
+            benefit_name='Productivity Gain' if productivity else 'New Business',
+            kpi_name=rng.choice(KPI_NAMES),
+            multiplier_minutes=round(rng.uniform(0.5, 30), 2) if productivity else 0,
+            multiplier_dollars=round(rng.uniform(0.3, 1.5), 2) if productivity else 0,
+            webhook_key=f"synthetic-{index:06d}-{rng.getrandbits(64):016x}",
+        )
+
+    def build_benefits(self, rng, initiative, first_month, count):
+        # Adoption ramps up then plateaus, with month-to-month noise
+        base = rng.uniform(50, 5000)
+        growth = rng.uniform(0.0, 0.08)
+        productivity = initiative.benefit_name == 'Productivity Gain'
+        benefits = []
+        for m in range(count):
+            month = add_months(first_month, m)
+            kpi = round(base * min(1 + growth * m, 3) * rng.uniform(0.85, 1.15), 2)
+            minutes = kpi * initiative.multiplier_minutes if productivity else 0
+            benefits.append(RealizedBenefit(
+                initiative=initiative, month=month, yyyymm=to_period(month), kpi_value=kpi,
+                revenue_impact=0 if productivity else round(kpi * rng.uniform(5, 50), 2),
+                calculated_minutes=minutes,
+                calculated_dollars=minutes * initiative.multiplier_dollars if productivity else 0,
+            ))
+        return benefits
+
+    def create_technologies(self, rng, count, first_month, months, batch_size):
+        names = [TECHNOLOGIES[i] if i < len(TECHNOLOGIES) else f"{NAME_PREFIX} Tech {i}" for i in range(count)]
+        Technology.objects.bulk_create([
+            Technology(name=name, icon='fas fa-microchip', max_consumption=rng.choice([10000, 50000, 100000]))
+            for name in names
+        ], ignore_conflicts=True)
+        technologies = list(Technology.objects.filter(name__in=names))
+        TechnologyUsage.objects.bulk_create([
+            TechnologyUsage(technology=tech, month=add_months(first_month, m), yyyymm=to_period(add_months(first_month, m)),
+                            consumption=round(tech.max_consumption * rng.uniform(0.2, 0.95), 2))
+            for tech in technologies for m in range(months)
+        ], batch_size=batch_size, ignore_conflicts=True)
+        TechnologyCapacity.rebuild()
+        return technologies
+
+    def create_logs(self, rng, audit_count, webhook_count, batch_size):
+        initiative_ids = list(Initiative.objects.filter(name__startswith=f"{NAME_PREFIX} ").values_list('id', flat=True)[:1000])
+        for start in range(0, audit_count, batch_size):
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    action=rng.choice(['Create', 'Update', 'View', 'Export']),
+                    object_type=rng.choice(['Initiative', 'Benefit']),
+                    object_name=f"{NAME_PREFIX} {rng.randint(0, 999999):06d}",
+                    user='synthetic', source=rng.choice(['Portal', 'API']),
+                    details={'synthetic': True},
+                )
+                for _ in range(min(batch_size, audit_count - start))
+            ])
+        for start in range(0, webhook_count, batch_size):
+            WebhookAuditLog.objects.bulk_create([
+                WebhookAuditLog(
+                    initiative_id=rng.choice(initiative_ids) if initiative_ids else None,
+                    status_code=rng.choices([200, 400, 401, 403], weights=[90, 5, 3, 2])[0],
+                    payload={'kpi_value': round(rng.uniform(0, 1000), 2), 'synthetic': True},
+                    ip_address='10.0.0.1',
+                )
+                for _ in range(min(batch_size, webhook_count - start))
+            ])
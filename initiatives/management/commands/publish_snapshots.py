@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from initiatives.snapshots import PAGES, publish
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the dashboard and analysis pages for each range preset into static "
+        "HTML and JSON under SNAPSHOT_ROOT, served at /snapshots/. Run it on a schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', action='append', dest='pages', choices=sorted(PAGES),
+                            help="Publish only this page (repeatable).")
+        parser.add_argument('--root', help="Write here instead of SNAPSHOT_ROOT.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        published = publish(root=options['root'], pages=options['pages'])
+        for url in published:
+            self.stdout.write(url)
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {len(published)} snapshot(s) in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from initiatives.models import Initiative, BenefitRollup, TechnologyEconomics
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the quarterly/yearly BenefitRollup buckets from RealizedBenefit rows, "
+        "and the per-technology monthly unit economics they feed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--initiative', type=int, action='append', dest='initiatives',
+                            help="Initiative pk to rebuild (repeatable). Defaults to all initiatives.")
+
+    def handle(self, *args, **options):
+        count = BenefitRollup.rebuild(initiative_ids=options['initiatives'])
+        self.stdout.write(self.style.SUCCESS(f"{count} rollup bucket(s) rebuilt."))
+
+        technology_ids = None
+        if options['initiatives']:
+            technology_ids = set(Initiative.objects.filter(pk__in=options['initiatives']).values_list('technology_id', flat=True))
+        count = TechnologyEconomics.rebuild(technology_ids=technology_ids)
+        self.stdout.write(self.style.SUCCESS(f"{count} technology month(s) of unit economics rebuilt."))
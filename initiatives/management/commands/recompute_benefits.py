@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from initiatives.models import Initiative, RealizedBenefit, BenefitRollup, TechnologyEconomics, AuditLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Restate the frozen minutes/dollars on RealizedBenefit rows from the "
+        "multiplier versions in effect for each month."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--initiative', type=int, action='append', dest='initiatives',
+                            help="Initiative pk to restate (repeatable). Defaults to all initiatives.")
+        parser.add_argument('--since', help="Only restate months from YYYY-MM onwards.")
+        parser.add_argument('--effective-from', dest='effective_from',
+                            help="Record the initiative's current multipliers as a version effective from YYYY-MM before restating.")
+        parser.add_argument('--dry-run', action='store_true', help="Report changes without writing them.")
+
+    def parse_month(self, value, option):
+        try:
+            return datetime.strptime(value, '%Y-%m').date()
+        except ValueError:
+            raise CommandError(f"Invalid {option} '{value}'. Use YYYY-MM")
+
+    def handle(self, *args, **options):
+        since = self.parse_month(options['since'], '--since') if options['since'] else None
+        effective_from = None
+        if options['effective_from']:
+            if not options['initiatives']:
+                raise CommandError("--effective-from requires --initiative")
+            effective_from = self.parse_month(options['effective_from'], '--effective-from')
+
+        initiatives = Initiative.objects.prefetch_related('multiplier_versions')
+        if options['initiatives']:
+            initiatives = initiatives.filter(pk__in=options['initiatives'])
+
+        changed_total = 0
+        with transaction.atomic():
+            for initiative in initiatives:
+                if effective_from and not options['dry_run']:
+                    initiative.record_multiplier_version(effective_from=effective_from)
+                    initiative = Initiative.objects.prefetch_related('multiplier_versions').get(pk=initiative.pk)
+
+                versions = list(initiative.multiplier_versions.all())
+                benefits = initiative.realized_benefits.all()
+                if since:
+                    benefits = benefits.filter(month__gte=since)
+
+                changed = []
+                for benefit in benefits:
+                    benefit.initiative = initiative
+                    version = next((v for v in versions if v.effective_from <= benefit.month), versions[-1] if versions else None)
+                    multipliers = (version.multiplier_minutes, version.multiplier_dollars) if version else None
+                    before = (benefit.calculated_minutes, benefit.calculated_dollars)
+                    benefit.compute_values(multipliers)
+                    if (benefit.calculated_minutes, benefit.calculated_dollars) != before:
+                        # bulk_update skips auto_now; bump it so incremental API syncs pick the change up
+                        benefit.updated_at = timezone.now()
+                        changed.append(benefit)
+
+                if changed and not options['dry_run']:
+                    RealizedBenefit.objects.bulk_update(changed, ['calculated_minutes', 'calculated_dollars', 'updated_at'], batch_size=500)
+                    BenefitRollup.rebuild(initiative_ids=[initiative.pk])
+                    TechnologyEconomics.rebuild(technology_ids=[initiative.technology_id])
+                changed_total += len(changed)
+                if changed:
+                    self.stdout.write(f"{initiative.name}: {len(changed)} benefit(s) restated")
+
+            if changed_total and not options['dry_run']:
+                AuditLog.objects.create(
+                    action='Update',
+                    object_type='Benefit',
+                    object_name='Benefit restatement',
+                    user='System',
+                    details={'restated': changed_total, 'since': options['since'], 'initiatives': options['initiatives']},
+                )
+
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(f"{prefix}{changed_total} benefit(s) restated."))
@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+
+from initiatives.models import Initiative, RealizedBenefit, Technology, WebhookAuditLog, AuditLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent webhook-style writes per second on a scratch SQLite "
+        "database, with the stock backend and with SQLITE_HIGH_CONCURRENCY."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--writes', type=int, default=100, help="Writes per thread.")
+        parser.add_argument('--initiatives', type=int, default=20)
+        parser.add_argument('--worker', action='store_true', help="Internal: run one profile against the configured database.")
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            self.stdout.write(json.dumps(self.run_worker(options)))
+            return
+
+        results = {}
+        for profile, enabled in (('stock', 'False'), ('high_concurrency', 'True')):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.sqlite3", SQLITE_HIGH_CONCURRENCY=enabled)
+                manage = [sys.executable, str(settings.BASE_DIR / 'manage.py')]
+                subprocess.run(manage + ['migrate', '-v0'], env=env, check=True)
+                output = subprocess.run(
+                    manage + ['sqlite_write_benchmark', '--worker',
+                              '--threads', str(options['threads']),
+                              '--writes', str(options['writes']),
+                              '--initiatives', str(options['initiatives'])],
+                    env=env, check=True, capture_output=True, text=True,
+                ).stdout
+                results[profile] = json.loads(output.strip().splitlines()[-1])
+
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:>17}: {result['writes_per_second']:8.1f} writes/s, "
+                f"{result['locked_errors']} locked errors, {result['elapsed']:.2f}s"
+            )
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_worker(self, options):
+        technology, _ = Technology.objects.get_or_create(name='Bench', defaults={'icon': 'fas fa-server'})
+        initiatives = [
+            Initiative.objects.create(
+                name=f"Benchmark {i}", requester_name='bench', lob_owner='bench', description='bench',
+                it_owner='bench', department='IT', status='Live', technology=technology, value='bench',
+                benefit_name='Productivity Gain', multiplier_minutes=1.5, multiplier_dollars=0.75,
+            )
+            for i in range(options['initiatives'])
+        ]
+        stats = {'writes': 0, 'locked_errors': 0}
+        stats_lock = threading.Lock()
+
+        def writer(seed):
+            rng = random.Random(seed)
+            for _ in range(options['writes']):
+                initiative = rng.choice(initiatives)
+                month = date(2024, rng.randint(1, 12), 1)
+                try:
+                    # Same shape as one RealtimeReportingWebhookView success
+                    with transaction.atomic():
+                        RealizedBenefit.objects.update_or_create(
+                            initiative=initiative, month=month,
+                            defaults={'kpi_value': rng.random() * 100, 'revenue_impact': 0},
+                        )
+                        WebhookAuditLog.objects.create(initiative=initiative, status_code=200, payload={'bench': True})
+                        AuditLog.objects.create(action='Update', object_type='Benefit', object_name='bench', source='API')
+                    outcome = 'writes'
+                except OperationalError:
+                    outcome = 'locked_errors'
+                with stats_lock:
+                    stats[outcome] += 1
+            connection.close()
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'engine': connection.settings_dict['ENGINE'],
+            'threads': options['threads'],
+            'elapsed': elapsed,
+            'writes': stats['writes'],
+            'locked_errors': stats['locked_errors'],
+            'writes_per_second': stats['writes'] / elapsed if elapsed else 0,
+        }
@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+\d+\s+\|\s*(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a cold start in a fresh interpreter: import time per top-level "
+        "package (python -X importtime) and latency of the first requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="Request path to time (repeatable). Defaults to /healthz/, /warmup/ and /.")
+        parser.add_argument('--top', type=int, default=15, help="Number of packages to list.")
+        parser.add_argument('--depth', type=int, default=1,
+                            help="Dotted-name depth to group imports by, e.g. 2 splits django.db from django.template.")
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON.")
+        parser.add_argument('--child', action='store_true', help="Internal: run inside the profiled interpreter.")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/healthz/', '/warmup/', '/']
+        if options['child']:
+            self.stdout.write(json.dumps(self.run_child(paths)))
+            return
+
+        command = [sys.executable, '-X', 'importtime', str(settings.BASE_DIR / 'manage.py'), 'startup_profile', '--child']
+        for path in paths:
+            command += ['--path', path]
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ), check=True)
+        wall = time.perf_counter() - started
+
+        packages = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            # Self time sums without double counting nested imports
+            package = '.'.join(match.group(2).split('.')[:options['depth']])
+            packages[package] = packages.get(package, 0) + int(match.group(1))
+
+        requests = json.loads(result.stdout.strip().splitlines()[-1])
+        report = {
+            'process_wall_ms': round(wall * 1000, 1),
+            'import_total_ms': round(sum(packages.values()) / 1000, 1),
+            'imports_ms': {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda x: -x[1])},
+            'requests': requests,
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"Process wall time: {report['process_wall_ms']} ms, imports: {report['import_total_ms']} ms")
+        self.stdout.write("Slowest imports (self time per package):")
+        for name, ms in list(report['imports_ms'].items())[:options['top']]:
+            self.stdout.write(f"  {name:<30} {ms:>8.1f} ms")
+        self.stdout.write(f"App setup: {requests['setup_ms']} ms")
+        for item in requests['requests']:
+            self.stdout.write(f"  {item['path']:<30} {item['status']}  {item['ms']:>8.1f} ms")
+
+    def run_child(self, paths):
+        from wsgiref.util import setup_testing_defaults
+
+        started = time.perf_counter()
+        from dote_central.wsgi import application
+        setup_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        timings = []
+        for path in paths:
+            environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'wsgi.input': BytesIO()}
+            setup_testing_defaults(environ)
+            status = []
+            started = time.perf_counter()
+            body = application(environ, lambda s, h, exc_info=None: status.append(s))
+            b''.join(body)
+            if hasattr(body, 'close'):
+                body.close()
+            timings.append({
+                'path': path,
+                'status': status[0].split()[0] if status else None,
+                'ms': round((time.perf_counter() - started) * 1000, 2),
+            })
+        return {'setup_ms': setup_ms, 'requests': timings}
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# static path -> pinned source; bump the version here and re-run with --update-lock to upgrade
+VENDOR_ASSETS = {
+    'vendor/chart.umd.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+    'vendor/htmx.min.js': 'https://unpkg.com/htmx.org@1.9.10/dist/htmx.min.js',
+}
+
+# sha256 of each asset, in `sha256sum` format so `cd static && sha256sum -c ../vendor.sha256` works too
+LOCK_FILE = os.path.join(settings.BASE_DIR, 'vendor.sha256')
+
+
+def read_lock():
+    if not os.path.exists(LOCK_FILE):
+        return {}
+    with open(LOCK_FILE) as f:
+        return {name: digest for digest, name in (line.split() for line in f if line.strip())}
+
+
+def write_lock(digests):
+    temp_path = LOCK_FILE + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.writelines(f"{digests[name]}  {name}\n" for name in sorted(digests))
+    os.replace(temp_path, LOCK_FILE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Download the pinned front-end libraries into static/vendor/ so they are served, "
+        "hashed and cached like our own static files. Run before collectstatic. Every file "
+        "must match its sha256 in vendor.sha256 before it is installed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Download even if the file exists.")
+        parser.add_argument(
+            '--update-lock', action='store_true',
+            help="Download every asset and record its sha256 in vendor.sha256 (after bumping a version). Review and commit the result.",
+        )
+
+    def handle(self, *args, **options):
+        root = settings.STATICFILES_DIRS[0]
+        digests = {} if options['update_lock'] else read_lock()
+        for name, url in VENDOR_ASSETS.items():
+            path = os.path.join(root, name)
+            expected = digests.get(name)
+            if not options['update_lock'] and expected is None:
+                raise CommandError(f"{name} has no sha256 in {LOCK_FILE}; run with --update-lock and commit the file")
+            if os.path.exists(path) and not options['force'] and not options['update_lock']:
+                with open(path, 'rb') as f:
+                    actual = hashlib.sha256(f.read()).hexdigest()
+                if actual != expected:
+                    raise CommandError(f"{path} does not match its pinned sha256 {expected} (got {actual}); re-run with --force")
+                self.stdout.write(f"{name}: present")
+                continue
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    body = response.read()
+            except OSError as e:
+                raise CommandError(f"Could not download {url}: {e}")
+            actual = hashlib.sha256(body).hexdigest()
+            if options['update_lock']:
+                digests[name] = actual
+            elif actual != expected:
+                raise CommandError(f"{url} does not match its pinned sha256 {expected} (got {actual}); nothing was written")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+            self.stdout.write(f"{name}: {len(body):,} bytes from {url} (sha256 {actual})")
+        if options['update_lock']:
+            write_lock(digests)
+            self.stdout.write(f"Recorded {len(digests)} digests in {LOCK_FILE}")
+        self.stdout.write(self.style.SUCCESS("Vendored assets are in place."))
@@ -0,0 +1,195 @@
+import ipaddress
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from initiatives.models import Initiative, WebhookAuditLog
+from initiatives.periods import add_months
+from .benchmark_endpoints import percentile
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay recorded webhook payloads from WebhookAuditLog, or synthesize similar "
+        "traffic, against the webhook at a target rate and concurrency on a local "
+        "server. Reports throughput, latency percentiles, errors and lock contention. "
+        "Replayed requests really write benefits: run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['replay', 'synthetic'], default='replay')
+        parser.add_argument('--rate', type=float, default=50, help="Target requests per second.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Client threads sending requests.")
+        parser.add_argument('--requests', type=int, default=500, help="Total requests to send.")
+        parser.add_argument('--since', help="Replay only payloads logged on or after YYYY-MM-DD.")
+        parser.add_argument('--only-success', action='store_true', dest='only_success',
+                            help="Replay only payloads that originally returned 200.")
+        parser.add_argument('--burst-month', dest='burst_month',
+                            help="Rewrite every payload to this YYYY-MM, e.g. to mimic a month-end close.")
+        parser.add_argument('--url', help="Target an already running local server (loopback only) instead of starting one.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        payloads = self.load_payloads(options)
+        if not payloads:
+            raise CommandError("No payloads to send. Record webhook traffic or use --mode synthetic.")
+        total = options['requests']
+        bodies = [payloads[i % len(payloads)] for i in range(total)]
+
+        server = None
+        limits_off = None
+        if options['url']:
+            target = urlsplit(options['url'])
+            if not self.is_loopback(target.hostname):
+                raise CommandError("--url must point at a local server (localhost or a loopback address)")
+            host, port = target.hostname, target.port or 80
+        path = reverse('webhook_report')
+
+        local = threading.local()
+        results = []
+        results_lock = threading.Lock()
+
+        def send(body, scheduled):
+            if not hasattr(local, 'conn'):
+                local.conn = HTTPConnection(host, port, timeout=options['timeout'])
+            try:
+                local.conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+                response = local.conn.getresponse()
+                response.read()
+                status = response.status
+            except OSError:
+                local.conn.close()
+                del local.conn
+                status = None
+            # Measured from the scheduled send time so a saturated server shows up as latency
+            with results_lock:
+                results.append((status, time.perf_counter() - scheduled))
+
+        request_logger = logging.getLogger('django.request')
+        previous_level = request_logger.level
+        try:
+            if not options['url']:
+                # Every request comes from one address, so the per-IP limit would cap the run; a server
+                # started with --url keeps whatever limits it was given
+                limits_off = override_settings(WEBHOOK_RATE_PER_MINUTE=0, WEBHOOK_IP_RATE_PER_MINUTE=0)
+                limits_off.enable()
+                server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=True)
+                server.set_app(get_wsgi_application())
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                host, port = server.server_address[:2]
+
+            # Failures are tallied in the report; don't print a traceback line per request. Set after
+            # get_wsgi_application(), which reapplies the LOGGING config
+            request_logger.setLevel(logging.CRITICAL)
+            run_started = timezone.now()
+            started = time.perf_counter()
+            interval = 1 / options['rate'] if options['rate'] > 0 else 0
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                for i, body in enumerate(bodies):
+                    scheduled = started + i * interval
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    executor.submit(send, body, scheduled)
+            elapsed = time.perf_counter() - started
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+            if limits_off:
+                limits_off.disable()
+            request_logger.setLevel(previous_level)
+
+        self.report(results, elapsed, run_started, options)
+
+    def load_payloads(self, options):
+        rng = random.Random(options['seed'])
+        if options['mode'] == 'synthetic':
+            keys = list(Initiative.objects.exclude(webhook_key=None).values_list('webhook_key', flat=True)[:5000])
+            current = date.today().replace(day=1)
+            payloads = [
+                {
+                    'webhook_key': rng.choice(keys),
+                    'kpi_value': round(rng.uniform(0, 5000), 2),
+                    'revenue_impact': round(rng.uniform(0, 10000), 2) if rng.random() < 0.3 else 0,
+                    'month': add_months(current, -rng.randint(0, 2)).strftime('%Y-%m'),
+                }
+                for _ in range(min(options['requests'], 5000))
+            ] if keys else []
+        else:
+            # KPI event batches share the audit log but not the endpoint under test
+            logs = WebhookAuditLog.objects.filter(endpoint='report').order_by('created_at')
+            if options['since']:
+                logs = logs.filter(created_at__date__gte=options['since'])
+            if options['only_success']:
+                logs = logs.filter(status_code=200)
+            payloads = list(logs.values_list('payload', flat=True)[:options['requests']])
+
+        bodies = []
+        for payload in payloads:
+            if 'raw_body' in payload:
+                # Logged as an invalid JSON body; replay the original bytes
+                bodies.append(payload['raw_body'])
+                continue
+            if options['burst_month']:
+                payload = dict(payload, month=options['burst_month'])
+            bodies.append(json.dumps(payload))
+        return bodies
+
+    def is_loopback(self, hostname):
+        if hostname == 'localhost':
+            return True
+        try:
+            return ipaddress.ip_address(hostname).is_loopback
+        except (TypeError, ValueError):
+            return False
+
+    def report(self, results, elapsed, run_started, options):
+        latencies = [seconds * 1000 for _, seconds in results]
+        statuses = {}
+        for status, _ in results:
+            statuses[str(status or 'connection_error')] = statuses.get(str(status or 'connection_error'), 0) + 1
+        ok = statuses.get('200', 0)
+        # The view answers 500 for any write failure; the audit log keeps the real error
+        locked = WebhookAuditLog.objects.filter(
+            endpoint='report', created_at__gte=run_started, status_code=500, error_message__icontains='locked',
+        ).count()
+
+        report = {
+            'mode': options['mode'],
+            'requests': len(results),
+            'target_rate': options['rate'],
+            'concurrency': options['concurrency'],
+            'elapsed_s': round(elapsed, 2),
+            'achieved_rate': round(len(results) / elapsed, 1) if elapsed else 0,
+            'success_rate': round(ok / len(results), 4) if results else 0,
+            'statuses': statuses,
+            'lock_errors': locked,
+            'lock_error_rate': round(locked / len(results), 4) if results else 0,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 1),
+                'p95': round(percentile(latencies, 95), 1),
+                'p99': round(percentile(latencies, 99), 1),
+                'max': round(max(latencies), 1),
+            } if latencies else {},
+        }
+        self.stdout.write(json.dumps(report, indent=2))
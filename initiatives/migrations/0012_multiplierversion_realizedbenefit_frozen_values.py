@@ -0,0 +1,39 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0011_technology_alter_initiative_benefit_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='realizedbenefit',
+            name='calculated_dollars',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='realizedbenefit',
+            name='calculated_minutes',
+            field=models.FloatField(default=0),
+        ),
+        migrations.CreateModel(
+            name='MultiplierVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('effective_from', models.DateField(help_text='Format: YYYY-MM-01')),
+                ('multiplier_minutes', models.FloatField(default=0)),
+                ('multiplier_dollars', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('initiative', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='multiplier_versions', to='initiatives.initiative')),
+            ],
+            options={
+                'ordering': ['-effective_from'],
+                'unique_together': {('initiative', 'effective_from')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import F, Min
+
+
+def backfill(apps, schema_editor):
+    Initiative = apps.get_model('initiatives', 'Initiative')
+    MultiplierVersion = apps.get_model('initiatives', 'MultiplierVersion')
+    RealizedBenefit = apps.get_model('initiatives', 'RealizedBenefit')
+
+    for initiative in Initiative.objects.annotate(first_month=Min('realized_benefits__month')):
+        effective_from = initiative.first_month or initiative.created_at.date()
+        MultiplierVersion.objects.get_or_create(
+            initiative=initiative,
+            effective_from=effective_from.replace(day=1),
+            defaults={
+                'multiplier_minutes': initiative.multiplier_minutes,
+                'multiplier_dollars': initiative.multiplier_dollars,
+            }
+        )
+        if initiative.benefit_name == 'Productivity Gain':
+            RealizedBenefit.objects.filter(initiative=initiative).update(
+                calculated_minutes=F('kpi_value') * initiative.multiplier_minutes,
+                calculated_dollars=F('kpi_value') * initiative.multiplier_minutes * initiative.multiplier_dollars,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0012_multiplierversion_realizedbenefit_frozen_values'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0013_backfill_multiplier_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='realizedbenefit',
+            name='yyyymm',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Normalized month key, e.g. 202403'),
+        ),
+        migrations.AddField(
+            model_name='technologyusage',
+            name='yyyymm',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Normalized month key, e.g. 202403'),
+        ),
+        migrations.AddIndex(
+            model_name='realizedbenefit',
+            index=models.Index(fields=['yyyymm', 'calculated_dollars', 'revenue_impact'], name='benefit_period_cover'),
+        ),
+        migrations.AddIndex(
+            model_name='realizedbenefit',
+            index=models.Index(fields=['initiative', 'yyyymm', 'kpi_value', 'calculated_dollars', 'revenue_impact'], name='benefit_init_period_cover'),
+        ),
+        migrations.AddIndex(
+            model_name='technologyusage',
+            index=models.Index(fields=['technology', 'yyyymm', 'consumption'], name='usage_tech_period_cover'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+from django.db.models.functions import ExtractMonth, ExtractYear, TruncMonth
+
+
+def backfill(apps, schema_editor):
+    for model_name in ('RealizedBenefit', 'TechnologyUsage'):
+        model = apps.get_model('initiatives', model_name)
+        model.objects.update(month=TruncMonth('month'))
+        model.objects.update(yyyymm=ExtractYear('month') * 100 + ExtractMonth('month'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0014_realizedbenefit_yyyymm_technologyusage_yyyymm'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0015_backfill_yyyymm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BenefitRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('quarter', 'Quarter'), ('year', 'Year')], max_length=8)),
+                ('yyyymm', models.PositiveIntegerField(help_text='First month of the bucket, e.g. 202401')),
+                ('months', models.PositiveSmallIntegerField(default=0)),
+                ('kpi_value', models.FloatField(default=0)),
+                ('calculated_minutes', models.FloatField(default=0)),
+                ('calculated_dollars', models.FloatField(default=0)),
+                ('revenue_impact', models.FloatField(default=0)),
+                ('initiative', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='benefit_rollups', to='initiatives.initiative')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['granularity', 'yyyymm', 'initiative', 'kpi_value', 'calculated_dollars', 'revenue_impact'], name='rollup_period_cover')],
+                'unique_together': {('granularity', 'initiative', 'yyyymm')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from initiatives.periods import to_period, bucket_start
+
+SUM_FIELDS = ['kpi_value', 'calculated_minutes', 'calculated_dollars', 'revenue_impact']
+
+
+def backfill(apps, schema_editor):
+    RealizedBenefit = apps.get_model('initiatives', 'RealizedBenefit')
+    BenefitRollup = apps.get_model('initiatives', 'BenefitRollup')
+
+    buckets = {}
+    for row in RealizedBenefit.objects.values('initiative_id', 'month', *SUM_FIELDS).iterator():
+        for granularity in ('quarter', 'year'):
+            key = (granularity, row['initiative_id'], to_period(bucket_start(row['month'], granularity)))
+            bucket = buckets.setdefault(key, dict.fromkeys(['months'] + SUM_FIELDS, 0))
+            bucket['months'] += 1
+            for field in SUM_FIELDS:
+                bucket[field] += row[field]
+
+    BenefitRollup.objects.bulk_create([
+        BenefitRollup(granularity=granularity, initiative_id=initiative_id, yyyymm=yyyymm, **values)
+        for (granularity, initiative_id, yyyymm), values in buckets.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0016_benefitrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
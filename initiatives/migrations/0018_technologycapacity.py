@@ -0,0 +1,30 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0017_backfill_benefitrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechnologyCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ytd_start', models.PositiveIntegerField(help_text='YYYYMM of the fiscal year the YTD figure covers')),
+                ('ytd_consumption', models.FloatField(default=0)),
+                ('latest_yyyymm', models.PositiveIntegerField(blank=True, null=True)),
+                ('latest_consumption', models.FloatField(default=0)),
+                ('run_rate', models.FloatField(blank=True, help_text='Projected consumption for next month', null=True)),
+                ('trend', models.FloatField(blank=True, help_text='Fitted change in consumption per month', null=True)),
+                ('breach_yyyymm', models.PositiveIntegerField(blank=True, help_text='First month projected over max_consumption', null=True)),
+                ('forecast_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('technology', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='capacity', to='initiatives.technology')),
+            ],
+        ),
+    ]
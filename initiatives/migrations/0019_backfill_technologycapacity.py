@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.db import migrations
+
+from initiatives.periods import to_period, bucket_start, bucket_end, period_to_month
+
+
+def backfill(apps, schema_editor):
+    Technology = apps.get_model('initiatives', 'Technology')
+    TechnologyUsage = apps.get_model('initiatives', 'TechnologyUsage')
+    TechnologyCapacity = apps.get_model('initiatives', 'TechnologyCapacity')
+
+    ytd_start = to_period(bucket_start(date.today(), 'year'))
+    ytd_end = to_period(bucket_end(period_to_month(ytd_start), 'year'))
+    values = {
+        pk: {'ytd_start': ytd_start, 'ytd_consumption': 0.0, 'latest_yyyymm': None, 'latest_consumption': 0.0}
+        for pk in Technology.objects.values_list('pk', flat=True)
+    }
+    for technology_id, yyyymm, consumption in TechnologyUsage.objects.values_list('technology_id', 'yyyymm', 'consumption').iterator():
+        entry = values[technology_id]
+        if ytd_start <= yyyymm <= ytd_end:
+            entry['ytd_consumption'] += consumption
+        if entry['latest_yyyymm'] is None or yyyymm > entry['latest_yyyymm']:
+            entry['latest_yyyymm'], entry['latest_consumption'] = yyyymm, consumption
+
+    TechnologyCapacity.objects.bulk_create([
+        TechnologyCapacity(technology_id=pk, **entry) for pk, entry in values.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0018_technologycapacity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
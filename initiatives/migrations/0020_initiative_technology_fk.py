@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0019_backfill_technologycapacity'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='initiative',
+            old_name='technology',
+            new_name='technology_name',
+        ),
+        # A default lets 0022 be reversed; 0021 then copies the names back
+        migrations.AlterField(
+            model_name='initiative',
+            name='technology_name',
+            field=models.CharField(default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='initiative',
+            name='technology',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='initiatives', to='initiatives.technology'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    Initiative = apps.get_model('initiatives', 'Initiative')
+    Technology = apps.get_model('initiatives', 'Technology')
+    AuditLog = apps.get_model('initiatives', 'AuditLog')
+
+    by_name = {name.strip().lower(): pk for pk, name in Technology.objects.values_list('pk', 'name')}
+    unspecified = None
+    unmatched = {}
+    groups = {}
+    for pk, name in Initiative.objects.values_list('pk', 'technology_name'):
+        key = (name or '').strip().lower()
+        technology_id = by_name.get(key)
+        if technology_id is None:
+            if unspecified is None:
+                unspecified, _ = Technology.objects.get_or_create(name='Unspecified', defaults={'icon': 'fas fa-question-circle'})
+            technology_id = unspecified.pk
+            if key:
+                unmatched[name.strip()] = unmatched.get(name.strip(), 0) + 1
+        groups.setdefault(technology_id, []).append(pk)
+
+    for technology_id, ids in groups.items():
+        Initiative.objects.filter(pk__in=ids).update(technology_id=technology_id)
+
+    if unmatched:
+        # Keep a record of free-text names that had no matching Technology
+        AuditLog.objects.create(
+            action='Update',
+            object_type='Initiative',
+            object_name='Technology link backfill',
+            user='System',
+            details={'set_to_unspecified': unmatched},
+        )
+
+
+def restore_names(apps, schema_editor):
+    Initiative = apps.get_model('initiatives', 'Initiative')
+    for initiative in Initiative.objects.select_related('technology'):
+        initiative.technology_name = initiative.technology.name if initiative.technology else ''
+        initiative.save(update_fields=['technology_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0020_initiative_technology_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, restore_names),
+    ]
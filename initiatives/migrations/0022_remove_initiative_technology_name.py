@@ -0,0 +1,21 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0021_backfill_initiative_technology'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='initiative',
+            name='technology_name',
+        ),
+        migrations.AlterField(
+            model_name='initiative',
+            name='technology',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='initiatives', to='initiatives.technology'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0022_remove_initiative_technology_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechnologyEconomics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yyyymm', models.PositiveIntegerField(help_text='Month key, e.g. 202403')),
+                ('initiatives', models.PositiveIntegerField(default=0, help_text='Initiatives reporting benefits this month')),
+                ('benefit_dollars', models.FloatField(default=0)),
+                ('revenue_impact', models.FloatField(default=0)),
+                ('total_impact', models.FloatField(default=0)),
+                ('consumption', models.FloatField(default=0)),
+                ('benefit_per_unit', models.FloatField(blank=True, null=True)),
+                ('revenue_per_unit', models.FloatField(blank=True, null=True)),
+                ('impact_per_unit', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='economics', to='initiatives.technology')),
+            ],
+            options={
+                'ordering': ['-yyyymm'],
+                'indexes': [models.Index(fields=['yyyymm', 'technology'], name='economics_period')],
+                'unique_together': {('technology', 'yyyymm')},
+            },
+        ),
+    ]
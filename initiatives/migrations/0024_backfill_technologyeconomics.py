@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill(apps, schema_editor):
+    RealizedBenefit = apps.get_model('initiatives', 'RealizedBenefit')
+    TechnologyUsage = apps.get_model('initiatives', 'TechnologyUsage')
+    TechnologyEconomics = apps.get_model('initiatives', 'TechnologyEconomics')
+
+    months = {}
+    for row in RealizedBenefit.objects.order_by().values('initiative__technology_id', 'yyyymm').annotate(
+        initiatives=Count('initiative_id', distinct=True),
+        benefit_dollars=Sum('calculated_dollars'), revenue_impact=Sum('revenue_impact'),
+    ).iterator():
+        months[(row['initiative__technology_id'], row['yyyymm'])] = [
+            row['initiatives'], row['benefit_dollars'] or 0.0, row['revenue_impact'] or 0.0, 0.0,
+        ]
+    for technology_id, yyyymm, consumption in TechnologyUsage.objects.values_list('technology_id', 'yyyymm', 'consumption').iterator():
+        months.setdefault((technology_id, yyyymm), [0, 0.0, 0.0, 0.0])[3] = consumption
+
+    rows = []
+    for (technology_id, yyyymm), (initiatives, benefit_dollars, revenue_impact, consumption) in months.items():
+        total = benefit_dollars + revenue_impact
+        rows.append(TechnologyEconomics(
+            technology_id=technology_id, yyyymm=yyyymm, initiatives=initiatives,
+            benefit_dollars=benefit_dollars, revenue_impact=revenue_impact, total_impact=total, consumption=consumption,
+            benefit_per_unit=benefit_dollars / consumption if consumption else None,
+            revenue_per_unit=revenue_impact / consumption if consumption else None,
+            impact_per_unit=total / consumption if consumption else None,
+        ))
+    TechnologyEconomics.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0023_technologyeconomics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
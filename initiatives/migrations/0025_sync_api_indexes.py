@@ -0,0 +1,39 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0024_backfill_technologyeconomics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='technology',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='technologyusage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='initiative',
+            index=models.Index(fields=['updated_at', 'id'], name='initiative_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='realizedbenefit',
+            index=models.Index(fields=['updated_at', 'id'], name='benefit_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='technology',
+            index=models.Index(fields=['updated_at', 'id'], name='technology_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='technologyusage',
+            index=models.Index(fields=['updated_at', 'id'], name='usage_updated'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0025_sync_api_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KPIEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField()),
+                ('kpi_value', models.FloatField(default=0)),
+                ('revenue_impact', models.FloatField(default=0)),
+                ('source', models.CharField(default='API', max_length=32)),
+                ('events', models.PositiveIntegerField(default=1, help_text='Raw events folded into this row')),
+                ('daily', models.BooleanField(default=False, help_text='Downsampled daily bucket')),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('initiative', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='kpi_events', to='initiatives.initiative')),
+            ],
+            options={
+                'ordering': ['-occurred_at'],
+                'indexes': [models.Index(fields=['initiative', 'occurred_at'], name='kpi_event_initiative_time'), models.Index(fields=['daily', 'occurred_at'], name='kpi_event_retention')],
+            },
+        ),
+    ]
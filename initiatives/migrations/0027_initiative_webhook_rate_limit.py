@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0026_kpi_event_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='initiative',
+            name='webhook_rate_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='Webhook reports allowed per minute; blank uses the default, 0 removes the limit', null=True, verbose_name='Webhook Rate Limit'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:39
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # KPI event rows always carried an `events` key (a list, or the accepted count); a
+    # single top-level event or an oversized batch is indistinguishable and stays 'report'
+    WebhookAuditLog = apps.get_model('initiatives', 'WebhookAuditLog')
+    WebhookAuditLog.objects.filter(payload__has_key='events').update(endpoint='events')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('initiatives', '0027_initiative_webhook_rate_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookauditlog',
+            name='endpoint',
+            field=models.CharField(choices=[('report', 'Monthly report'), ('events', 'KPI events')], default='report', max_length=16),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,21 @@
-from django.db import models
+from datetime import date
+from django.db import connections, models, router, transaction
 from django.core.validators import MinLengthValidator, MaxLengthValidator
+from . import live
+from .periods import GRANULARITIES, to_period, period_to_month, bucket_start, bucket_end, bucket_label
+
+def lock_rows(model, pks=None):
+    """
+    Row-lock `model` rows (all of them when `pks` is None) until the current transaction ends.
+    Aggregate-then-write refreshes take these first. SQLite has no row locks and needs none: a
+    transaction that has written holds the database's only write lock until it ends.
+    """
+    if not connections[router.db_for_write(model)].features.has_select_for_update:
+        return
+    rows = model.objects.select_for_update().order_by('pk')
+    if pks is not None:
+        rows = rows.filter(pk__in=pks)
+    list(rows.values_list('pk', flat=True))
 
 class Initiative(models.Model):
     DEPARTMENT_CHOICES = [
@@ -38,12 +54,13 @@ class Initiative(models.Model):
     it_owner_email = models.EmailField(max_length=128, verbose_name="IT Owner Email", default="it@example.com")
     department = models.CharField(max_length=100, choices=DEPARTMENT_CHOICES)
     status = models.CharField(max_length=100, choices=STATUS_CHOICES)
-    technology = models.CharField(max_length=100)
+    technology = models.ForeignKey('Technology', on_delete=models.PROTECT, related_name='initiatives')
     value = models.TextField(max_length=1024, verbose_name="Business Value")
     benefit_name = models.CharField(max_length=100, choices=BENEFIT_NAME_CHOICES)
     
     # Webhook Integration
     webhook_key = models.CharField(max_length=64, unique=True, blank=True, null=True, help_text="Secret key for external reporting via webhook")
+    webhook_rate_limit = models.PositiveIntegerField(blank=True, null=True, verbose_name="Webhook Rate Limit", help_text="Webhook reports allowed per minute; blank uses the default, 0 removes the limit")
     
     # New Multiplier Fields
     kpi_name = models.CharField(max_length=64, blank=True, null=True, verbose_name="KPI Name", help_text="Name of the KPI to be tracked")
@@ -53,17 +70,101 @@ class Initiative(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Incremental sync reads (updated_at, id) pages; see initiatives/api.py
+            models.Index(fields=['updated_at', 'id'], name='initiative_updated'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_technology_id = instance.__dict__.get('technology_id')
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.webhook_key:
             import secrets
             self.webhook_key = secrets.token_urlsafe(32)
         super().save(*args, **kwargs)
+        self.record_multiplier_version()
+
+        # Moving an initiative moves its benefits between technologies' unit economics
+        previous = getattr(self, '_loaded_technology_id', None)
+        if previous and previous != self.technology_id:
+            periods = set(self.realized_benefits.values_list('yyyymm', flat=True))
+            if periods:
+                TechnologyEconomics.rebuild(technology_ids=[previous, self.technology_id], periods=periods)
+        self._loaded_technology_id = self.technology_id
+
+    def delete(self, *args, **kwargs):
+        benefits = dict(self.realized_benefits.values_list('id', 'yyyymm'))
+        pk = self.pk
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            DeletedRecord.record(initiatives=[pk], benefits=benefits)
+        if benefits:
+            TechnologyEconomics.rebuild(technology_ids=[self.technology_id], periods=set(benefits.values()))
+        return result
+
+    def record_multiplier_version(self, effective_from=None):
+        """
+        Snapshot the current multipliers as a version effective from the given
+        month (defaults to the current month). Existing benefits keep the values
+        frozen when they were written; use `recompute_benefits` to restate them.
+        """
+        if effective_from is None:
+            # Saves that leave the multipliers alone don't add a version; an explicit month always does
+            latest = self.multiplier_versions.first()
+            if latest and (latest.multiplier_minutes, latest.multiplier_dollars) == (self.multiplier_minutes, self.multiplier_dollars):
+                return latest
+            effective_from = date.today().replace(day=1)
+        version, _ = MultiplierVersion.objects.update_or_create(
+            initiative=self,
+            effective_from=effective_from,
+            defaults={
+                'multiplier_minutes': self.multiplier_minutes,
+                'multiplier_dollars': self.multiplier_dollars,
+            }
+        )
+        return version
+
+    def multiplier_for(self, month):
+        """
+        Returns the (minutes, dollars) multipliers in effect for `month`. Months
+        before the first recorded version fall back to the earliest version.
+        """
+        versions = self.multiplier_versions.all()
+        version = versions.filter(effective_from__lte=month).first() or versions.last()
+        if version is None:
+            return self.multiplier_minutes, self.multiplier_dollars
+        return version.multiplier_minutes, version.multiplier_dollars
 
     def __str__(self):
         return f"{self.name} ({self.department})"
 
+class MultiplierVersion(models.Model):
+    initiative = models.ForeignKey(Initiative, on_delete=models.CASCADE, related_name='multiplier_versions')
+    effective_from = models.DateField(help_text="Format: YYYY-MM-01")
+    multiplier_minutes = models.FloatField(default=0)
+    multiplier_dollars = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-effective_from']
+        unique_together = ('initiative', 'effective_from')
+
+    def __str__(self):
+        return f"{self.initiative.name} multipliers from {self.effective_from.strftime('%m/%Y')}"
+
 class WebhookAuditLog(models.Model):
+    ENDPOINT_CHOICES = [
+        ('report', 'Monthly report'),
+        ('events', 'KPI events'),
+    ]
+
     initiative = models.ForeignKey(Initiative, on_delete=models.SET_NULL, null=True, blank=True)
+    endpoint = models.CharField(max_length=16, choices=ENDPOINT_CHOICES, default='report')
     status_code = models.IntegerField()
     payload = models.JSONField()
     response_body = models.JSONField(null=True, blank=True)
@@ -80,6 +181,7 @@ class WebhookAuditLog(models.Model):
 class RealizedBenefit(models.Model):
     initiative = models.ForeignKey(Initiative, on_delete=models.CASCADE, related_name='realized_benefits')
     month = models.DateField()
+    yyyymm = models.PositiveIntegerField(default=0, editable=False, help_text="Normalized month key, e.g. 202403")
     
     # KPI Tracking Fields
     kpi_value = models.FloatField(default=0)
@@ -87,28 +189,220 @@ class RealizedBenefit(models.Model):
     # Manual Input (for New Business)
     revenue_impact = models.FloatField(default=0)
 
+    # Frozen at write time from the multiplier version effective for `month`
+    calculated_minutes = models.FloatField(default=0)
+    calculated_dollars = models.FloatField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    @property
-    def calculated_minutes(self):
-        if self.initiative.benefit_name == 'Productivity Gain':
-            return self.kpi_value * self.initiative.multiplier_minutes
-        return 0
+    def compute_values(self, multipliers=None):
+        if self.initiative.benefit_name != 'Productivity Gain':
+            self.calculated_minutes = 0
+            self.calculated_dollars = 0
+            return
+        minutes, dollars = multipliers or self.initiative.multiplier_for(self.month)
+        self.calculated_minutes = self.kpi_value * minutes
+        self.calculated_dollars = self.kpi_value * minutes * dollars
 
-    @property
-    def calculated_dollars(self):
-        if self.initiative.benefit_name == 'Productivity Gain':
-            return self.kpi_value * self.initiative.multiplier_minutes * self.initiative.multiplier_dollars
-        return 0
+    LIVE_FIELDS = ['yyyymm', 'kpi_value', 'calculated_dollars', 'revenue_impact']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {f: v for f, v in zip(field_names, values) if f in cls.LIVE_FIELDS}
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.month = self.month.replace(day=1)
+        self.yyyymm = to_period(self.month)
+        self.compute_values()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'month', 'yyyymm', 'calculated_minutes', 'calculated_dollars', 'updated_at'}
+        previous = getattr(self, '_loaded_values', {})
+        # The row and the aggregates derived from it commit together; errors propagate, so no savepoint
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            BenefitRollup.refresh_for(self.initiative_id, self.month)
+            TechnologyEconomics.refresh_for(self.initiative.technology_id, self.yyyymm)
+            if previous.get('yyyymm') and previous['yyyymm'] != self.yyyymm:
+                BenefitRollup.refresh_for(self.initiative_id, period_to_month(previous['yyyymm']))
+                TechnologyEconomics.refresh_for(self.initiative.technology_id, previous['yyyymm'])
+        current = {f: getattr(self, f) for f in self.LIVE_FIELDS}
+        self.publish_live_deltas(previous, current)
+        self._loaded_values = current
+
+    def delete(self, *args, **kwargs):
+        previous = {f: getattr(self, f) for f in self.LIVE_FIELDS}
+        pk = self.pk
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            DeletedRecord.record(benefits=[pk])
+            BenefitRollup.refresh_for(self.initiative_id, self.month)
+            TechnologyEconomics.refresh_for(self.initiative.technology_id, self.yyyymm)
+        self.publish_live_deltas(previous, {})
+        return result
+
+    def publish_live_deltas(self, before, after):
+        """Push the change between two value snapshots to open dashboards once the write commits."""
+        if not live.has_subscribers():
+            return
+        changes = {}
+        for sign, values in ((-1, before), (1, after)):
+            if not values.get('yyyymm'):
+                continue
+            delta = changes.setdefault(values['yyyymm'], dict.fromkeys(['kpi_value', 'prod_gain', 'rev_impact'], 0.0))
+            delta['kpi_value'] += sign * (values['kpi_value'] or 0)
+            delta['prod_gain'] += sign * (values['calculated_dollars'] or 0)
+            delta['rev_impact'] += sign * (values['revenue_impact'] or 0)
+
+        events = []
+        for yyyymm, delta in changes.items():
+            if not any(delta.values()):
+                continue
+            month = period_to_month(yyyymm)
+            events.append(dict(delta, **{
+                'initiative_id': self.initiative_id,
+                'initiative_name': self.initiative.name,
+                'benefit_name': self.initiative.benefit_name,
+                'yyyymm': yyyymm,
+                'buckets': {g: bucket_label(bucket_start(month, g), g) for g in GRANULARITIES},
+            }))
+        if events:
+            transaction.on_commit(lambda: [live.publish('benefit', event) for event in events])
 
     class Meta:
         ordering = ['-month']
         unique_together = ('initiative', 'month')
+        indexes = [
+            # Cover the time-bucketed and per-initiative sums so they never touch the table
+            models.Index(fields=['yyyymm', 'calculated_dollars', 'revenue_impact'], name='benefit_period_cover'),
+            models.Index(fields=['initiative', 'yyyymm', 'kpi_value', 'calculated_dollars', 'revenue_impact'], name='benefit_init_period_cover'),
+            models.Index(fields=['updated_at', 'id'], name='benefit_updated'),
+        ]
 
     def __str__(self):
         return f"{self.initiative.name} - {self.month}"
 
+class KPIEvent(models.Model):
+    """
+    Append-only KPI reports at event granularity. `compact_kpi_events` adds
+    new events (past the ledger watermark) into the monthly RealizedBenefit
+    rows, and later folds events older than KPI_EVENT_RETENTION_DAYS into one
+    `daily` row per initiative, day and source. See initiatives/ledger.py.
+    """
+    initiative = models.ForeignKey(Initiative, on_delete=models.CASCADE, related_name='kpi_events')
+    occurred_at = models.DateTimeField()
+    kpi_value = models.FloatField(default=0)
+    revenue_impact = models.FloatField(default=0)
+    source = models.CharField(max_length=32, default='API')
+    events = models.PositiveIntegerField(default=1, help_text="Raw events folded into this row")
+    daily = models.BooleanField(default=False, help_text="Downsampled daily bucket")
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-occurred_at']
+        indexes = [
+            models.Index(fields=['initiative', 'occurred_at'], name='kpi_event_initiative_time'),
+            models.Index(fields=['daily', 'occurred_at'], name='kpi_event_retention'),
+        ]
+
+    def __str__(self):
+        return f"{self.initiative.name} - {self.occurred_at:%Y-%m-%d %H:%M}"
+
+class LedgerWatermark(models.Model):
+    """Highest KPIEvent id already rolled into RealizedBenefit, per ledger."""
+    name = models.CharField(max_length=32, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+
+class BenefitRollup(models.Model):
+    """
+    Pre-aggregated quarterly and yearly sums of RealizedBenefit, keyed by the
+    first month of each fiscal-aligned bucket. Kept in step with benefit
+    writes so wide reporting ranges read a handful of rows per initiative.
+    """
+    GRANULARITY_CHOICES = [
+        ('quarter', 'Quarter'),
+        ('year', 'Year'),
+    ]
+
+    SUM_FIELDS = ['kpi_value', 'calculated_minutes', 'calculated_dollars', 'revenue_impact']
+
+    initiative = models.ForeignKey(Initiative, on_delete=models.CASCADE, related_name='benefit_rollups')
+    granularity = models.CharField(max_length=8, choices=GRANULARITY_CHOICES)
+    yyyymm = models.PositiveIntegerField(help_text="First month of the bucket, e.g. 202401")
+    months = models.PositiveSmallIntegerField(default=0)
+    kpi_value = models.FloatField(default=0)
+    calculated_minutes = models.FloatField(default=0)
+    calculated_dollars = models.FloatField(default=0)
+    revenue_impact = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ('granularity', 'initiative', 'yyyymm')
+        indexes = [
+            models.Index(fields=['granularity', 'yyyymm', 'initiative', 'kpi_value', 'calculated_dollars', 'revenue_impact'], name='rollup_period_cover'),
+        ]
+
+    @classmethod
+    def refresh_for(cls, initiative_id, month):
+        """
+        Re-aggregate the buckets holding `month`. The initiative's row lock, held until the caller's
+        transaction commits, serializes concurrent refreshes, so the last one sees every month written
+        before it instead of overwriting a newer total with an older one.
+        """
+        with transaction.atomic(savepoint=False):
+            lock_rows(Initiative, [initiative_id])
+            for granularity, _ in cls.GRANULARITY_CHOICES:
+                start = bucket_start(month, granularity)
+                totals = RealizedBenefit.objects.filter(
+                    initiative_id=initiative_id,
+                    yyyymm__gte=to_period(start),
+                    yyyymm__lte=to_period(bucket_end(start, granularity)),
+                ).aggregate(months=models.Count('id'), **{f: models.Sum(f) for f in cls.SUM_FIELDS})
+                if totals['months']:
+                    cls.objects.update_or_create(
+                        granularity=granularity, initiative_id=initiative_id, yyyymm=to_period(start),
+                        defaults=totals,
+                    )
+                else:
+                    cls.objects.filter(granularity=granularity, initiative_id=initiative_id, yyyymm=to_period(start)).delete()
+
+    @classmethod
+    def rebuild(cls, initiative_ids=None):
+        """Recompute every bucket from the monthly rows, e.g. after bulk writes or a FISCAL_YEAR_START_MONTH change."""
+        benefits = RealizedBenefit.objects.all()
+        rollups = cls.objects.all()
+        if initiative_ids is not None:
+            benefits = benefits.filter(initiative_id__in=initiative_ids)
+            rollups = rollups.filter(initiative_id__in=initiative_ids)
+
+        buckets = {}
+        # Read and replace under the same locks as refresh_for, so no benefit write lands in between
+        with transaction.atomic():
+            lock_rows(Initiative, initiative_ids)
+            for row in benefits.values('initiative_id', 'month', *cls.SUM_FIELDS).iterator():
+                for granularity, _ in cls.GRANULARITY_CHOICES:
+                    key = (granularity, row['initiative_id'], to_period(bucket_start(row['month'], granularity)))
+                    bucket = buckets.setdefault(key, dict.fromkeys(['months'] + cls.SUM_FIELDS, 0))
+                    bucket['months'] += 1
+                    for field in cls.SUM_FIELDS:
+                        bucket[field] += row[field]
+
+            rollups.delete()
+            cls.objects.bulk_create([
+                cls(granularity=granularity, initiative_id=initiative_id, yyyymm=yyyymm, **values)
+                for (granularity, initiative_id, yyyymm), values in buckets.items()
+            ], batch_size=500)
+        return len(buckets)
+
+    def __str__(self):
+        return f"{self.initiative.name} - {self.granularity} {self.yyyymm}"
+
 class AuditLog(models.Model):
     ACTION_CHOICES = [
         ('Create', 'Create'),
@@ -139,10 +433,69 @@ class AuditLog(models.Model):
     def __str__(self):
         return f"{self.action} {self.object_type}: {self.object_name} via {self.source} at {self.timestamp}"
 
+class DeletedRecord(models.Model):
+    """
+    Tombstones for the sync API (/api/deletions/): which rows of each resource were deleted,
+    and when. A null `object_id` means the whole resource was replaced, as by a backup restore,
+    so syncs should re-pull it in full.
+    """
+    resource = models.CharField(max_length=32, help_text="Sync API resource, e.g. 'benefits'")
+    object_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='deleted_record_deleted'),
+        ]
+
+    @classmethod
+    def record(cls, **ids):
+        """Tombstone rows by resource, e.g. record(benefits=[1, 2]), in one insert."""
+        cls.objects.bulk_create([cls(resource=resource, object_id=pk) for resource, pks in ids.items() for pk in pks], batch_size=500)
+
+    @classmethod
+    def record_resync(cls, *resources):
+        cls.objects.bulk_create([cls(resource=resource) for resource in resources])
+
+    def __str__(self):
+        return f"{self.resource} {self.object_id or '(all)'} deleted at {self.deleted_at}"
+
+class TechnologyManager(models.Manager):
+    def get_by_natural_key(self, name):
+        return self.get(name=name)
+
 class Technology(models.Model):
+    UNSPECIFIED = 'Unspecified'
+
     name = models.CharField(max_length=32, unique=True)
     icon = models.CharField(max_length=255, help_text="Path or class for the icon (e.g., 'fas fa-server' or '/static/img/icon.png')")
     max_consumption = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TechnologyManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='technology_updated'),
+        ]
+
+    @classmethod
+    def unspecified(cls):
+        """Fallback for initiatives whose technology is unknown."""
+        technology, _ = cls.objects.get_or_create(name=cls.UNSPECIFIED, defaults={'icon': 'fas fa-question-circle'})
+        return technology
+
+    def delete(self, *args, **kwargs):
+        usages = list(self.usages.values_list('id', flat=True))
+        pk = self.pk
+        # A savepoint, unlike the other deletes: callers catch ProtectedError and carry on
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            DeletedRecord.record(technologies=[pk], usage=usages)
+        return result
+
+    def natural_key(self):
+        return (self.name,)
 
     def __str__(self):
         return self.name
@@ -150,11 +503,233 @@ class Technology(models.Model):
 class TechnologyUsage(models.Model):
     technology = models.ForeignKey(Technology, on_delete=models.CASCADE, related_name='usages')
     month = models.DateField(help_text="Format: YYYY-MM-01")
+    yyyymm = models.PositiveIntegerField(default=0, editable=False, help_text="Normalized month key, e.g. 202403")
     consumption = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        self.month = self.month.replace(day=1)
+        self.yyyymm = to_period(self.month)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'month', 'yyyymm', 'updated_at'}
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            TechnologyCapacity.refresh_for(self.technology_id)
+            TechnologyEconomics.refresh_for(self.technology_id, self.yyyymm)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            DeletedRecord.record(usage=[pk])
+            TechnologyCapacity.refresh_for(self.technology_id)
+            TechnologyEconomics.refresh_for(self.technology_id, self.yyyymm)
+        return result
 
     class Meta:
         ordering = ['-month']
         unique_together = ('technology', 'month')
+        indexes = [
+            models.Index(fields=['technology', 'yyyymm', 'consumption'], name='usage_tech_period_cover'),
+            models.Index(fields=['updated_at', 'id'], name='usage_updated'),
+        ]
 
     def __str__(self):
         return f"{self.technology.name} - {self.month.strftime('%m/%Y')}"
+
+
+class TechnologyCapacity(models.Model):
+    """
+    Fiscal year-to-date consumption and latest month per technology, kept in
+    step with TechnologyUsage writes, plus the run-rate forecast written by the
+    batched `forecast_capacity` pass (see initiatives/capacity.py).
+    `max_consumption` is a monthly capacity, as on the usage entry page.
+    """
+    technology = models.OneToOneField(Technology, on_delete=models.CASCADE, related_name='capacity')
+    ytd_start = models.PositiveIntegerField(help_text="YYYYMM of the fiscal year the YTD figure covers")
+    ytd_consumption = models.FloatField(default=0)
+    latest_yyyymm = models.PositiveIntegerField(null=True, blank=True)
+    latest_consumption = models.FloatField(default=0)
+
+    # Forecast
+    run_rate = models.FloatField(null=True, blank=True, help_text="Projected consumption for next month")
+    trend = models.FloatField(null=True, blank=True, help_text="Fitted change in consumption per month")
+    breach_yyyymm = models.PositiveIntegerField(null=True, blank=True, help_text="First month projected over max_consumption")
+    forecast_at = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    YTD_FIELDS = ['ytd_start', 'ytd_consumption', 'latest_yyyymm', 'latest_consumption']
+
+    @staticmethod
+    def current_ytd_start(today=None):
+        return to_period(bucket_start(today or date.today(), 'year'))
+
+    @classmethod
+    def ytd_values(cls, usages, ytd_start):
+        """YTD and latest-month figures from (technology_id, yyyymm, consumption) rows."""
+        ytd_end = to_period(bucket_end(period_to_month(ytd_start), 'year'))
+        values = {}
+        for technology_id, yyyymm, consumption in usages:
+            entry = values.setdefault(technology_id, {'ytd_start': ytd_start, 'ytd_consumption': 0.0,
+                                                      'latest_yyyymm': None, 'latest_consumption': 0.0})
+            if ytd_start <= yyyymm <= ytd_end:
+                entry['ytd_consumption'] += consumption
+            if entry['latest_yyyymm'] is None or yyyymm > entry['latest_yyyymm']:
+                entry['latest_yyyymm'], entry['latest_consumption'] = yyyymm, consumption
+        return values
+
+    @classmethod
+    def refresh_for(cls, technology_id, today=None):
+        ytd_start = cls.current_ytd_start(today)
+        usages = TechnologyUsage.objects.filter(technology_id=technology_id).order_by().values_list('technology_id', 'yyyymm', 'consumption')
+        values = cls.ytd_values(usages, ytd_start).get(technology_id, {
+            'ytd_start': ytd_start, 'ytd_consumption': 0.0, 'latest_yyyymm': None, 'latest_consumption': 0.0,
+        })
+        cls.objects.update_or_create(technology_id=technology_id, defaults=values)
+
+    @classmethod
+    def rebuild(cls, today=None, technology_ids=None):
+        """Recompute YTD figures, e.g. after bulk writes or at a fiscal year rollover."""
+        ytd_start = cls.current_ytd_start(today)
+        usages = TechnologyUsage.objects.order_by()
+        technologies = Technology.objects.all()
+        if technology_ids is not None:
+            usages = usages.filter(technology_id__in=technology_ids)
+            technologies = technologies.filter(pk__in=technology_ids)
+        values = cls.ytd_values(usages.values_list('technology_id', 'yyyymm', 'consumption').iterator(), ytd_start)
+        empty = {'ytd_start': ytd_start, 'ytd_consumption': 0.0, 'latest_yyyymm': None, 'latest_consumption': 0.0}
+        rows = [cls(technology_id=pk, **values.get(pk, empty)) for pk in technologies.values_list('pk', flat=True)]
+        cls.objects.bulk_create(rows, batch_size=500, update_conflicts=True, unique_fields=['technology'],
+                                update_fields=cls.YTD_FIELDS + ['updated_at'])
+        return len(rows)
+
+    @property
+    def latest_month(self):
+        return period_to_month(self.latest_yyyymm) if self.latest_yyyymm else None
+
+    @property
+    def breach_month(self):
+        return period_to_month(self.breach_yyyymm) if self.breach_yyyymm else None
+
+    @property
+    def utilization(self):
+        """Latest month's consumption as a percentage of capacity."""
+        if not self.technology.max_consumption:
+            return None
+        return self.latest_consumption / self.technology.max_consumption * 100
+
+    def __str__(self):
+        return f"{self.technology.name} capacity"
+
+
+class TechnologyEconomics(models.Model):
+    """
+    Benefit and consumption per technology per month, with the dollars of
+    realized benefit per unit of consumption. Kept in step with RealizedBenefit
+    and TechnologyUsage writes so unit-economics reports read only this table.
+    Ratios are null for months without reported consumption.
+    """
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE, related_name='economics')
+    yyyymm = models.PositiveIntegerField(help_text="Month key, e.g. 202403")
+    initiatives = models.PositiveIntegerField(default=0, help_text="Initiatives reporting benefits this month")
+    benefit_dollars = models.FloatField(default=0)
+    revenue_impact = models.FloatField(default=0)
+    total_impact = models.FloatField(default=0)
+    consumption = models.FloatField(default=0)
+    benefit_per_unit = models.FloatField(null=True, blank=True)
+    revenue_per_unit = models.FloatField(null=True, blank=True)
+    impact_per_unit = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    VALUE_FIELDS = ['initiatives', 'benefit_dollars', 'revenue_impact', 'total_impact', 'consumption',
+                    'benefit_per_unit', 'revenue_per_unit', 'impact_per_unit']
+
+    class Meta:
+        ordering = ['-yyyymm']
+        unique_together = ('technology', 'yyyymm')
+        indexes = [
+            models.Index(fields=['yyyymm', 'technology'], name='economics_period'),
+        ]
+
+    @staticmethod
+    def values_for(initiatives, benefit_dollars, revenue_impact, consumption):
+        total = benefit_dollars + revenue_impact
+
+        def per_unit(amount):
+            return amount / consumption if consumption else None
+
+        return {
+            'initiatives': initiatives, 'benefit_dollars': benefit_dollars, 'revenue_impact': revenue_impact,
+            'total_impact': total, 'consumption': consumption,
+            'benefit_per_unit': per_unit(benefit_dollars), 'revenue_per_unit': per_unit(revenue_impact),
+            'impact_per_unit': per_unit(total),
+        }
+
+    @classmethod
+    def refresh_for(cls, technology_id, yyyymm):
+        """
+        Re-aggregate one month. Every initiative on the technology feeds the same row, so the
+        technology's row lock serializes refreshes until the caller's transaction commits.
+        """
+        with transaction.atomic(savepoint=False):
+            lock_rows(Technology, [technology_id])
+            benefits = RealizedBenefit.objects.filter(initiative__technology_id=technology_id, yyyymm=yyyymm).aggregate(
+                initiatives=models.Count('initiative_id', distinct=True),
+                benefit_dollars=models.Sum('calculated_dollars'), revenue_impact=models.Sum('revenue_impact'),
+            )
+            usage = TechnologyUsage.objects.filter(technology_id=technology_id, yyyymm=yyyymm).values_list('consumption', flat=True).first()
+            if not benefits['initiatives'] and usage is None:
+                cls.objects.filter(technology_id=technology_id, yyyymm=yyyymm).delete()
+                return
+            # One upsert statement instead of update_or_create's locked read, write and savepoints
+            cls.objects.bulk_create([cls(technology_id=technology_id, yyyymm=yyyymm, **cls.values_for(
+                benefits['initiatives'], benefits['benefit_dollars'] or 0.0, benefits['revenue_impact'] or 0.0, usage or 0.0,
+            ))], update_conflicts=True, unique_fields=['technology', 'yyyymm'], update_fields=cls.VALUE_FIELDS + ['updated_at'])
+
+    @classmethod
+    def rebuild(cls, technology_ids=None, periods=None):
+        """
+        Recompute months from the benefit and usage rows, e.g. after bulk writes
+        or a restore. Narrow it with `technology_ids` and/or `periods` (YYYYMM).
+        """
+        benefits = RealizedBenefit.objects.order_by()
+        usages = TechnologyUsage.objects.order_by()
+        rows = cls.objects.all()
+        if technology_ids is not None:
+            benefits = benefits.filter(initiative__technology_id__in=technology_ids)
+            usages = usages.filter(technology_id__in=technology_ids)
+            rows = rows.filter(technology_id__in=technology_ids)
+        if periods is not None:
+            benefits = benefits.filter(yyyymm__in=periods)
+            usages = usages.filter(yyyymm__in=periods)
+            rows = rows.filter(yyyymm__in=periods)
+
+        months = {}
+        # Read and replace under the same locks as refresh_for, so no write lands in between
+        with transaction.atomic():
+            lock_rows(Technology, technology_ids)
+            for row in benefits.values('initiative__technology_id', 'yyyymm').annotate(
+                initiatives=models.Count('initiative_id', distinct=True),
+                benefit_dollars=models.Sum('calculated_dollars'), revenue_impact=models.Sum('revenue_impact'),
+            ).iterator():
+                months[(row['initiative__technology_id'], row['yyyymm'])] = [
+                    row['initiatives'], row['benefit_dollars'] or 0.0, row['revenue_impact'] or 0.0, 0.0,
+                ]
+            for technology_id, yyyymm, consumption in usages.values_list('technology_id', 'yyyymm', 'consumption').iterator():
+                months.setdefault((technology_id, yyyymm), [0, 0.0, 0.0, 0.0])[3] = consumption
+
+            rows.delete()
+            cls.objects.bulk_create([
+                cls(technology_id=technology_id, yyyymm=yyyymm, **cls.values_for(*values))
+                for (technology_id, yyyymm), values in months.items()
+            ], batch_size=500)
+        return len(months)
+
+    @property
+    def month(self):
+        return period_to_month(self.yyyymm)
+
+    def __str__(self):
+        return f"{self.technology.name} - {self.yyyymm}"
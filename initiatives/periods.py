@@ -0,0 +1,72 @@
+from datetime import date
+
+from django.conf import settings
+
+GRANULARITIES = ['month', 'quarter', 'year']
+BUCKET_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+
+def to_period(month):
+    """Integer YYYYMM key for a date, e.g. 2024-03-01 -> 202403."""
+    return month.year * 100 + month.month
+
+def period_to_month(period):
+    return date(period // 100, period % 100, 1)
+
+def period_range(start, end):
+    """Inclusive (lo, hi) YYYYMM bounds for filtering `yyyymm` with a range scan."""
+    return to_period(start), to_period(end)
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def fiscal_start_month():
+    return getattr(settings, 'FISCAL_YEAR_START_MONTH', 1)
+
+def bucket_start(month, granularity):
+    """First month of the fiscal-aligned month/quarter/year bucket containing `month`."""
+    size = BUCKET_MONTHS[granularity]
+    offset = (month.month - fiscal_start_month()) % size
+    return add_months(month.replace(day=1), -offset)
+
+def bucket_end(start, granularity):
+    """Last month of the bucket beginning at `start`."""
+    return add_months(start, BUCKET_MONTHS[granularity] - 1)
+
+def fiscal_year(month):
+    """Fiscal years are named after the calendar year they end in."""
+    start = bucket_start(month, 'year')
+    return bucket_end(start, 'year').year
+
+def bucket_label(start, granularity):
+    prefix = '' if fiscal_start_month() == 1 else 'FY'
+    if granularity == 'month':
+        return start.strftime('%b %Y')
+    if granularity == 'quarter':
+        quarter = (start.month - fiscal_start_month()) % 12 // 3 + 1
+        return f"Q{quarter} {prefix}{fiscal_year(start)}"
+    return f"{prefix}{fiscal_year(start)}" if prefix else str(start.year)
+
+def split_range(start, end, coarsest='year'):
+    """
+    Cover the months [start, end] with the coarsest whole buckets available,
+    falling back to finer ones at the ragged edges. Returns
+    {granularity: [(lo, hi), ...]} with inclusive YYYYMM bounds per bucket run.
+    """
+    allowed = GRANULARITIES[:GRANULARITIES.index(coarsest) + 1]
+    runs = {}
+    month = start.replace(day=1)
+    while month <= end:
+        for granularity in reversed(allowed):
+            last = bucket_end(month, granularity)
+            if bucket_start(month, granularity) == month and last <= end:
+                break
+        lo, hi = to_period(month), to_period(last)
+        spans = runs.setdefault(granularity, [])
+        if spans and to_period(add_months(period_to_month(spans[-1][1]), 1)) == lo:
+            spans[-1] = (spans[-1][0], hi)
+        else:
+            spans.append((lo, hi))
+        month = add_months(last, 1)
+    return runs
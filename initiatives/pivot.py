@@ -0,0 +1,153 @@
+"""
+Generic pivot over realized benefits for ad-hoc finance questions.
+
+A request names row and column dimensions, measures and optional filters,
+e.g. `rows=department&columns=quarter&measures=revenue&status=Live`. One
+query groups RealizedBenefit by the requested initiative attributes and month
+in the database; pandas then folds months into fiscal quarters/years and
+pivots. Results are cached under the normalized request plus a data-version
+stamp, so any benefit or initiative write makes the next request recompute.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from .models import Initiative, RealizedBenefit, Technology
+from .periods import BUCKET_MONTHS, bucket_label, fiscal_start_month, period_to_month, to_period
+
+# name -> RealizedBenefit lookup; time dimensions are derived from `yyyymm`
+DIMENSIONS = {
+    'initiative': 'initiative__name',
+    'department': 'initiative__department',
+    'status': 'initiative__status',
+    'technology': 'initiative__technology__name',
+    'benefit_name': 'initiative__benefit_name',
+    'month': None,
+    'quarter': None,
+    'year': None,
+}
+TIME_DIMENSIONS = ['month', 'quarter', 'year']
+FILTERS = ['department', 'status', 'technology', 'benefit_name']
+
+MEASURES = {
+    'kpi': Sum('kpi_value'),
+    'minutes': Sum('calculated_minutes'),
+    'dollars': Sum('calculated_dollars'),
+    'revenue': Sum('revenue_impact'),
+    'count': Count('id'),
+}
+DEFAULT_MEASURES = ['dollars', 'revenue']
+
+
+class PivotError(ValueError):
+    pass
+
+
+def parse_pivot_request(params):
+    """Validate `rows`, `columns`, `measures` and filter values from a QueryDict."""
+    def names(key):
+        return [name.strip() for value in params.getlist(key) for name in value.split(',') if name.strip()]
+
+    rows, columns = names('rows'), names('columns')
+    measures = names('measures') or DEFAULT_MEASURES
+    unknown = [name for name in rows + columns if name not in DIMENSIONS]
+    if unknown:
+        raise PivotError(f"Unknown dimension(s): {', '.join(unknown)}. Choose from {', '.join(DIMENSIONS)}")
+    unknown = [name for name in measures if name not in MEASURES]
+    if unknown:
+        raise PivotError(f"Unknown measure(s): {', '.join(unknown)}. Choose from {', '.join(MEASURES)}")
+    if len(set(rows + columns)) != len(rows + columns):
+        raise PivotError("A dimension can only be used once")
+    if len([name for name in rows + columns if name in TIME_DIMENSIONS]) > 1:
+        raise PivotError("Use at most one of month, quarter and year")
+    if not rows and not columns:
+        raise PivotError("Give at least one dimension in rows or columns")
+
+    filters = {name: sorted(set(names(name))) for name in FILTERS if names(name)}
+    return {'rows': rows, 'columns': columns, 'measures': measures, 'filters': filters}
+
+
+def data_version():
+    """
+    Stamp that changes whenever benefits or initiatives are added, edited or
+    removed. Technology renames don't change it; PIVOT_CACHE_SECONDS bounds
+    how long a renamed technology can show its old name.
+    """
+    benefits = RealizedBenefit.objects.order_by().aggregate(n=Count('id'), top=Max('id'), at=Max('updated_at'))
+    initiatives = Initiative.objects.order_by().aggregate(n=Count('id'), at=Max('updated_at'))
+    technologies = Technology.objects.order_by().aggregate(n=Count('id'), top=Max('id'))
+    return '|'.join(str(value) for value in (
+        benefits['n'], benefits['top'], benefits['at'], initiatives['n'], initiatives['at'],
+        technologies['n'], technologies['top'], fiscal_start_month(),
+    ))
+
+
+def cached_pivot(spec, start, end):
+    """(result, cached) for a parsed request and report range."""
+    request_key = json.dumps([spec, str(start), str(end)], sort_keys=True)
+    key = 'pivot:' + hashlib.sha256(f"{request_key}|{data_version()}".encode()).hexdigest()
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+    result = run_pivot(spec, start, end)
+    cache.set(key, result, settings.PIVOT_CACHE_SECONDS)
+    return result, False
+
+
+def run_pivot(spec, start, end):
+    """
+    Returns {'header': [...], 'rows': [[...], ...]}. Without column dimensions
+    each measure is one column; with them there is one column per measure and
+    column value, headed "measure: value".
+    """
+    import pandas as pd  # Only the pivot endpoint needs pandas; keep it off startup and other requests
+
+    dimensions = spec['rows'] + spec['columns']
+    time_dimension = next((name for name in dimensions if name in TIME_DIMENSIONS), None)
+    lookups = [DIMENSIONS[name] for name in dimensions if DIMENSIONS[name]]
+    group_by = lookups + (['yyyymm'] if time_dimension else [])
+
+    benefits = RealizedBenefit.objects.order_by()
+    if start:
+        benefits = benefits.filter(yyyymm__gte=to_period(start))
+    if end:
+        benefits = benefits.filter(yyyymm__lte=to_period(end))
+    for name, values in spec['filters'].items():
+        benefits = benefits.filter(**{f"{DIMENSIONS[name]}__in": values})
+    measures = spec['measures']
+    query = benefits.values(*group_by).annotate(**{name: MEASURES[name] for name in measures})
+
+    frame = pd.DataFrame.from_records(list(query), columns=group_by + measures)
+    frame = frame.rename(columns={DIMENSIONS[name]: name for name in dimensions if DIMENSIONS[name]})
+    frame[measures] = frame[measures].fillna(0)
+    for name in dimensions:
+        if name != time_dimension:
+            frame[name] = frame[name].fillna('Unspecified')
+
+    if time_dimension:
+        # Fold months into fiscal buckets on whole columns, then label each distinct bucket once
+        size = BUCKET_MONTHS[time_dimension]
+        index = (frame['yyyymm'] // 100) * 12 + frame['yyyymm'] % 100 - 1
+        index = index - (index % 12 + 1 - fiscal_start_month()) % size
+        starts = sorted(index.unique())
+        labels = {i: bucket_label(period_to_month((i // 12) * 100 + i % 12 + 1), time_dimension) for i in starts}
+        frame[time_dimension] = pd.Categorical(index.map(labels), categories=[labels[i] for i in starts], ordered=True)
+
+    index_names = spec['rows'] or ['_all']
+    if not spec['rows']:
+        frame['_all'] = 'Total'
+    if spec['columns'] and not frame.empty:
+        table = frame.pivot_table(index=index_names, columns=spec['columns'], values=measures,
+                                  aggfunc='sum', fill_value=0, observed=True).reindex(columns=measures, level=0)
+        table.columns = [f"{column[0]}: {' / '.join(str(part) for part in column[1:])}" for column in table.columns]
+        table = table.reset_index()
+        header = spec['rows'] + list(table.columns[len(index_names):])
+    else:
+        table = frame.groupby(index_names, observed=True)[measures].sum().reset_index()
+        header = spec['rows'] + measures
+
+    rows = [[value.item() if hasattr(value, 'item') else value for value in row] for row in table[header].itertuples(index=False)]
+    return {'header': header, 'rows': rows}
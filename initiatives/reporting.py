@@ -0,0 +1,131 @@
+from datetime import date, datetime
+
+from django.db.models import Q, Sum, Min, Max
+
+from .models import RealizedBenefit, BenefitRollup
+from .periods import (
+    GRANULARITIES, add_months, bucket_start, bucket_label, period_to_month, split_range,
+)
+
+RANGE_PRESETS = [
+    ('all', 'All Time'),
+    ('quarter', 'This Quarter'),
+    ('fytd', 'Fiscal YTD'),
+    ('last12', 'Last 12 Months'),
+]
+
+# Custom bounds are clamped into these months; bucket arithmetic near date.max would overflow
+MIN_MONTH, MAX_MONTH = date(1900, 1, 1), date(2999, 12, 1)
+
+
+def parse_month(value):
+    try:
+        month = datetime.strptime(value, '%Y-%m').date()
+    except (TypeError, ValueError):
+        return None
+    return min(max(month, MIN_MONTH), MAX_MONTH)
+
+def parse_report_range(params, today=None):
+    """
+    Reads `range`, `start`, `end` (YYYY-MM) and `granularity` from a QueryDict.
+    Explicit start/end win over a preset; missing bounds mean open-ended.
+    """
+    today = (today or date.today()).replace(day=1)
+    preset = params.get('range', 'all')
+    start, end = None, None
+    if preset == 'quarter':
+        start, end = bucket_start(today, 'quarter'), today
+    elif preset == 'fytd':
+        start, end = bucket_start(today, 'year'), today
+    elif preset == 'last12':
+        start, end = add_months(today, -11), today
+    else:
+        preset = 'all'
+
+    custom_start, custom_end = parse_month(params.get('start')), parse_month(params.get('end'))
+    if custom_start or custom_end:
+        preset = 'custom'
+        start, end = custom_start, custom_end
+    if start and end and start > end:
+        start, end = end, start
+
+    granularity = params.get('granularity')
+    if granularity not in GRANULARITIES:
+        granularity = 'month'
+    return {'preset': preset, 'start': start, 'end': end, 'granularity': granularity}
+
+def range_label(report_range):
+    start, end = report_range['start'], report_range['end']
+    if report_range['preset'] not in ('all', 'custom'):
+        return dict(RANGE_PRESETS)[report_range['preset']]
+    if not start and not end:
+        return 'Since Inception'
+    if not end:
+        return f"Since {start.strftime('%b %Y')}"
+    if not start:
+        return f"Through {end.strftime('%b %Y')}"
+    return f"{start.strftime('%b %Y')} - {end.strftime('%b %Y')}"
+
+def resolve_bounds(start, end):
+    """Close open-ended ranges over the months that actually hold data."""
+    if start and end:
+        return start, end
+    # yyyymm 0 is a row whose key was never filled in; it belongs to no month
+    bounds = RealizedBenefit.objects.filter(yyyymm__gt=0).aggregate(lo=Min('yyyymm'), hi=Max('yyyymm'))
+    if bounds['lo'] is None:
+        return None, None
+    return start or period_to_month(bounds['lo']), end or period_to_month(bounds['hi'])
+
+def benefit_sources(start, end, coarsest='year'):
+    """
+    Querysets over RealizedBenefit and BenefitRollup that together cover
+    [start, end] exactly once, using the coarsest whole buckets available.
+    All of them expose `initiative`, `yyyymm` and the summed value columns.
+    """
+    sources = []
+    for granularity, spans in split_range(start, end, coarsest).items():
+        bounds = Q()
+        for lo, hi in spans:
+            bounds |= Q(yyyymm__gte=lo, yyyymm__lte=hi)
+        if granularity == 'month':
+            sources.append(RealizedBenefit.objects.filter(bounds))
+        else:
+            sources.append(BenefitRollup.objects.filter(bounds, granularity=granularity))
+    return sources
+
+def initiative_totals(start, end):
+    """{initiative_id: {'total_kpi', 'prod_gain', 'rev_impact'}} for benefits in [start, end]."""
+    start, end = resolve_bounds(start, end)
+    totals = {}
+    if start is None:
+        return totals
+    for queryset in benefit_sources(start, end):
+        rows = queryset.order_by().values('initiative_id').annotate(
+            total_kpi=Sum('kpi_value'),
+            prod_gain=Sum('calculated_dollars'),
+            rev_impact=Sum('revenue_impact'),
+        )
+        for row in rows:
+            entry = totals.setdefault(row['initiative_id'], {'total_kpi': 0.0, 'prod_gain': 0.0, 'rev_impact': 0.0})
+            entry['total_kpi'] += row['total_kpi'] or 0.0
+            entry['prod_gain'] += row['prod_gain'] or 0.0
+            entry['rev_impact'] += row['rev_impact'] or 0.0
+    return totals
+
+def time_series(start, end, granularity):
+    """Chronological [{'start', 'label', 'prod_gain', 'rev_impact'}] buckets that hold data."""
+    start, end = resolve_bounds(start, end)
+    buckets = {}
+    if start is None:
+        return []
+    for queryset in benefit_sources(start, end, coarsest=granularity):
+        rows = queryset.order_by().values('yyyymm').annotate(
+            prod_gain=Sum('calculated_dollars'),
+            rev_impact=Sum('revenue_impact'),
+        )
+        for row in rows:
+            key = bucket_start(period_to_month(row['yyyymm']), granularity)
+            entry = buckets.setdefault(key, {'start': key, 'label': bucket_label(key, granularity), 'prod_gain': 0.0, 'rev_impact': 0.0})
+            entry['prod_gain'] += row['prod_gain'] or 0.0
+            entry['rev_impact'] += row['rev_impact'] or 0.0
+    return [buckets[key] for key in sorted(buckets)]
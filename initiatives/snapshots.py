@@ -0,0 +1,92 @@
+"""
+Static snapshots of the dashboard and analysis pages for read-only viewers.
+
+`publish()` renders each page once per range preset (default tab and sort)
+into SNAPSHOT_ROOT as `<page>/<preset>/index.html` plus `data.json`, with the
+default range also at `<page>/index.html`. Each file is written under a
+temporary name and renamed into place, so a viewer never reads a half-written
+page, and a gzip copy is written alongside for WhiteNoise to serve.
+dote_central.snapshots.SnapshotWhiteNoiseMiddleware serves them under
+SNAPSHOT_URL without touching the database.
+"""
+import gzip
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, QueryDict
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .reporting import RANGE_PRESETS
+
+DEFAULT_PRESET = 'all'
+
+# page -> (view, live URL name, context keys exported to data.json)
+PAGES = {
+    'dashboard': ('initiatives.views.DashboardView', 'dashboard', [
+        'total_initiatives', 'total_productivity', 'total_revenue', 'total_overall', 'live_systems',
+        'chart_data', 'table_by_month', 'table_by_initiative', 'table_by_function', 'table_by_tech',
+    ]),
+    'analysis': ('initiatives.views.BenefitAnalysisView', 'benefit_analysis', [
+        'dept_stats', 'status_stats', 'tech_stats', 'dept_summary',
+        'overall_live', 'overall_in_progress', 'overall_planning',
+    ]),
+}
+
+
+def snapshot_url(page, preset=None):
+    return f"{settings.SNAPSHOT_URL}{page}/" + (f"{preset}/" if preset else '')
+
+
+def page_request(path, params):
+    """A bare GET request for rendering outside the request cycle (no session, user or messages)."""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(params)
+    request.META = {'QUERY_STRING': request.GET.urlencode()}
+    return request
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = content.encode()
+    for target, body in ((path + '.gz', gzip.compress(data)), (path, data)):
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, target)
+
+
+def publish(root=None, pages=None):
+    """Render and write every page and preset. Returns the list of URLs written."""
+    root = str(root or settings.SNAPSHOT_ROOT)
+    as_of = timezone.now()
+    published = []
+    for page in pages or PAGES:
+        view_path, url_name, data_keys = PAGES[page]
+        view = import_string(view_path)()
+        for preset, _ in RANGE_PRESETS:
+            request = page_request(reverse(url_name), {'range': preset})
+            context = view.get_context(request)
+            context.update(snapshot_as_of=as_of, snapshot_url=snapshot_url(page), live_config=None)
+            html = render_to_string(view.template_name, context, request=request)
+            data = json.dumps(dict(
+                {key: context[key] for key in data_keys}, as_of=as_of, range=preset, range_label=context['range_label'],
+            ), cls=DjangoJSONEncoder)
+
+            directories = [os.path.join(root, page, preset)]
+            if preset == DEFAULT_PRESET:
+                directories.append(os.path.join(root, page))
+            for directory in directories:
+                write_file(os.path.join(directory, 'index.html'), html)
+                write_file(os.path.join(directory, 'data.json'), data)
+            published.append(snapshot_url(page, preset))
+    return published
@@ -1,3 +1,1173 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connection, connections, transaction
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dote_central import replica
+from dote_central.budgets import QueryBudgetExceeded, query_budget
+from dote_central.metrics import MetricsMiddleware, registry
+from dote_central.ratelimit import webhook_limits
+from . import live
+from .management.commands import vendor_static
+from .models import (
+    Initiative, RealizedBenefit, BenefitRollup, Technology, TechnologyUsage, TechnologyCapacity, TechnologyEconomics,
+    AuditLog, WebhookAuditLog, KPIEvent,
+)
+from .capacity import run_forecast
+from .ledger import compact, downsample
+from .periods import add_months, period_to_month, split_range, to_period
+from .snapshots import publish
+from .reporting import parse_report_range, resolve_bounds, time_series
+
+INITIATIVES = 40
+MONTHS = 24
+TECHNOLOGIES = 6
+FIRST_MONTH = date(2023, 1, 1)
+
+
+def make_initiatives(count, offset=0):
+    technologies = list(Technology.objects.order_by('pk')[:TECHNOLOGIES])
+    initiatives = []
+    for i in range(offset, offset + count):
+        initiatives.append(Initiative(
+            name=f"Initiative {i:03d}", requester_name='Requester', lob_owner='LOB', description='Scaled fixture',
+            it_owner='IT', department=Initiative.DEPARTMENT_CHOICES[i % 12][0],
+            status=Initiative.STATUS_CHOICES[i % 4][0], technology=technologies[i % len(technologies)],
+            value='Value', benefit_name='Productivity Gain' if i % 3 else 'New Business',
+            kpi_name='Tasks automated', multiplier_minutes=2.5, multiplier_dollars=0.8,
+            webhook_key=f"key-{i:05d}",
+        ))
+    # bulk_create skips save(), so record the multiplier versions explicitly
+    initiatives = Initiative.objects.bulk_create(initiatives)
+    for initiative in initiatives:
+        initiative.record_multiplier_version(effective_from=FIRST_MONTH)
+
+    benefits = []
+    for initiative in initiatives:
+        for m in range(MONTHS):
+            month = add_months(FIRST_MONTH, m)
+            benefit = RealizedBenefit(
+                initiative=initiative, month=month, yyyymm=to_period(month),
+                kpi_value=10 + m, revenue_impact=0 if initiative.benefit_name == 'Productivity Gain' else 100 * m,
+            )
+            benefit.compute_values()
+            benefits.append(benefit)
+    RealizedBenefit.objects.bulk_create(benefits)
+    BenefitRollup.rebuild()
+    TechnologyEconomics.rebuild()
+    return initiatives
+
+
+class ScaledDataMixin:
+    """Enough rows that an N+1 pattern shows up as dozens of extra queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        technologies = Technology.objects.bulk_create([
+            Technology(name=f"Tech {i}", icon='fas fa-server', max_consumption=1000) for i in range(TECHNOLOGIES)
+        ])
+        TechnologyUsage.objects.bulk_create([
+            TechnologyUsage(technology=tech, month=add_months(FIRST_MONTH, m), yyyymm=to_period(add_months(FIRST_MONTH, m)), consumption=50 + m)
+            for tech in technologies for m in range(MONTHS)
+        ])
+        TechnologyCapacity.rebuild()
+        cls.technology = technologies[0]
+
+        cls.initiatives = make_initiatives(INITIATIVES)
+        cls.initiative = cls.initiatives[1]
+
+        AuditLog.objects.bulk_create([
+            AuditLog(action='Update', object_type='Benefit', object_name=f"Benefit {i}", source='API') for i in range(50)
+        ])
+        WebhookAuditLog.objects.bulk_create([
+            WebhookAuditLog(initiative=cls.initiative, status_code=200, payload={'kpi_value': i}) for i in range(50)
+        ])
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class QueryCountTests(ScaledDataMixin, TestCase):
+    """
+    Upper bounds on the queries each view in initiatives/urls.py issues against
+    the scaled fixture. A bound well below INITIATIVES means a per-row query
+    (N+1) fails the test instead of slipping through review.
+    """
+
+    def assertMaxQueries(self, limit, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 500, url)
+        self.assertLessEqual(
+            len(ctx), limit,
+            f"{method.upper()} {url} issued {len(ctx)} queries (limit {limit}):\n"
+            + '\n'.join(q['sql'] for q in ctx.captured_queries)
+        )
+        return response
+
+    def test_get_views(self):
+        pk = self.initiative.pk
+        cases = [
+            (5, 'dashboard', {}),
+            (5, 'dashboard', {'start': '2023-02', 'end': '2024-11', 'granularity': 'quarter'}),
+            (3, 'benefit_analysis', {}),
+            (2, 'initiative_list', {}),
+            (2, 'initiative_list', {'q': 'Initiative', 'sort': 'name'}),
+            (1, 'initiative_create', {}),
+            (2, 'initiative_edit', {}),
+            (2, 'initiative_toast', {}),
+            (3, 'benefit_entry', {}),
+            (5, 'csv_download', {}),
+            (2, 'benefit_csv_download', {}),
+            (1, 'csv_sample', {}),
+            (0, 'webhook_docs', {}),
+            (1, 'webhook_docs_personal', {}),
+            (0, 'bulk_config', {}),
+            (2, 'audit_list', {}),
+            (0, 'about', {}),
+            (0, 'sw', {}),
+            (0, 'healthz', {}),
+            (1, 'warmup', {}),
+            (1, 'technology_list', {}),
+            (0, 'technology_create', {}),
+            (1, 'technology_edit', {}),
+            (2, 'technology_usage_entry', {}),
+            (0, 'technology_usage_upload', {}),
+            (1, 'unit_economics', {}),
+            (1, 'unit_economics', {'start': '2023-06', 'end': '2024-05'}),
+            (2, 'unit_economics_csv', {}),
+            (2, 'initiative_daily_kpi', {'days': 90}),
+            (4, 'pivot', {'rows': 'department,status', 'columns': 'quarter', 'measures': 'revenue,count'}),
+        ]
+        cases += [(1, 'api_list', {'fields': 'id,kpi_value', 'limit': 100}), (1, 'api_list', {'updated_since': '2020-01-01'})]
+        needs_pk = {'initiative_edit', 'initiative_toast', 'benefit_entry', 'webhook_docs_personal', 'initiative_daily_kpi'}
+        needs_tech = {'technology_edit', 'technology_usage_entry'}
+        for limit, name, params in cases:
+            with self.subTest(view=name, params=params):
+                if name == 'api_list':
+                    url = reverse(name, args=['benefits'])
+                elif name in needs_pk:
+                    url = reverse(name, args=[pk])
+                elif name in needs_tech:
+                    url = reverse(name, args=[self.technology.pk])
+                else:
+                    url = reverse(name)
+                self.assertMaxQueries(limit, 'get', url, data=params)
+
+    def test_query_count_does_not_grow_with_data(self):
+        urls = [reverse(name) for name in ('dashboard', 'benefit_analysis', 'initiative_list', 'technology_list', 'audit_list', 'unit_economics')]
+        before = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(url)
+            before[url] = len(ctx)
+        make_initiatives(10, offset=INITIATIVES)
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as ctx:
+                    self.client.get(url)
+                self.assertEqual(len(ctx), before[url])
+
+    def test_write_views(self):
+        pk = self.initiative.pk
+        self.assertMaxQueries(21, 'post', reverse('benefit_entry', args=[pk]), data={'month': '2024-06', 'kpi_value': '42'})
+        benefit = RealizedBenefit.objects.filter(initiative=self.initiative).first()
+        # Deletes also write their sync API tombstones in one insert
+        self.assertMaxQueries(18, 'post', reverse('benefit_delete', args=[benefit.pk]))
+        self.assertMaxQueries(13, 'post', reverse('technology_usage_entry', args=[self.technology.pk]), data={'month': '2024-06', 'consumption': '12'})
+        usage = TechnologyUsage.objects.filter(technology=self.technology).first()
+        self.assertMaxQueries(12, 'post', reverse('technology_usage_delete', args=[usage.pk]))
+        unused = Technology.objects.create(name='Unused', icon='fas fa-server')
+        self.assertMaxQueries(10, 'post', reverse('technology_delete', args=[unused.pk]))
+        self.assertMaxQueries(7, 'post', reverse('technology_delete', args=[self.technology.pk]))
+        self.assertTrue(Technology.objects.filter(pk=self.technology.pk).exists())
+        self.assertMaxQueries(16, 'post', reverse('initiative_delete', args=[self.initiatives[-1].pk]))
+
+    def test_offline_benefit_batch(self):
+        # Initiatives and existing months are read once; each changed entry then costs what a
+        # single benefit_entry post does, and a replay of applied entries saves nothing
+        entries = [{'id': f"e{i}", 'initiative': initiative.pk, 'month': '2026-02', 'kpi_value': 5}
+                   for i, initiative in enumerate(self.initiatives[:10])]
+        self.assertMaxQueries(10 * 19 + 4, 'post', reverse('benefit_batch'), data=json.dumps({'entries': entries}), content_type='application/json')
+        self.assertMaxQueries(5, 'post', reverse('benefit_batch'), data=json.dumps({'entries': entries}), content_type='application/json')
+
+    @override_settings(USAGE_INGEST_KEY='test-key')
+    def test_usage_ingest(self):
+        # Names, existing months and the upsert are each one query however many rows arrive
+        rows = [{'technology': f"Tech {i % TECHNOLOGIES}", 'month': f"2025-{m:02d}", 'consumption': m}
+                for i in range(TECHNOLOGIES) for m in range(1, 13)]
+        payload = {'ingest_key': 'test-key', 'rows': rows}
+        self.assertMaxQueries(15, 'post', reverse('technology_usage_ingest'), data=json.dumps(payload), content_type='application/json')
+
+    def test_webhook(self):
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': 99, 'month': '2024-06'}
+        self.assertMaxQueries(22, 'post', reverse('webhook_report'), data=json.dumps(payload), content_type='application/json')
+        payload['webhook_key'] = 'unknown'
+        self.assertMaxQueries(2, 'post', reverse('webhook_report'), data=json.dumps(payload), content_type='application/json')
+        # Events are appended in one insert however many arrive
+        payload = {'webhook_key': self.initiative.webhook_key, 'events': [{'kpi_value': i} for i in range(100)]}
+        self.assertMaxQueries(3, 'post', reverse('webhook_events'), data=json.dumps(payload), content_type='application/json')
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class QueryPlanTests(ScaledDataMixin, TestCase):
+    """
+    EXPLAIN the queries the hot paths actually issue and fail if a table that
+    should be reached through an index is read with a full scan.
+    """
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables make a seq scan cheapest; ask whether an index *can* be used
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                return '\n'.join(row[-1] for row in cursor.fetchall())
+            cursor.execute('EXPLAIN ' + sql)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def full_scans(self, plan, table):
+        if connection.vendor == 'sqlite':
+            # "SCAN t" and "SCAN t USING COVERING INDEX i" both read every row
+            return re.findall(rf'^\s*SCAN {table}\b.*$', plan, re.M)
+        return re.findall(rf'Seq Scan on {table}\b.*$', plan, re.M)
+
+    def assertIndexedAccess(self, method, url, tables, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            getattr(self.client, method)(url, **kwargs)
+        checked = 0
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            plan = self.explain(sql)
+            for table in tables:
+                if f'"{table}"' not in sql:
+                    continue
+                checked += 1
+                self.assertEqual(self.full_scans(plan, table), [], f"Full scan of {table}:\n{sql}\n{plan}")
+        self.assertGreater(checked, 0, f"No queries against {tables} captured for {url}")
+
+    def test_dashboard_range(self):
+        self.assertIndexedAccess(
+            'get', reverse('dashboard'),
+            ['initiatives_realizedbenefit', 'initiatives_benefitrollup'],
+            data={'start': '2023-02', 'end': '2024-11', 'granularity': 'quarter'},
+        )
+
+    def test_benefit_analysis_range(self):
+        self.assertIndexedAccess(
+            'get', reverse('benefit_analysis'),
+            ['initiatives_realizedbenefit', 'initiatives_benefitrollup'],
+            data={'start': '2023-02', 'end': '2024-11'},
+        )
+
+    def test_initiative_list(self):
+        # The initiative table itself is paged in full; its benefit sums must come from the index
+        self.assertIndexedAccess('get', reverse('initiative_list'), ['initiatives_realizedbenefit'])
+
+    def test_benefit_entry_history(self):
+        self.assertIndexedAccess('get', reverse('benefit_entry', args=[self.initiative.pk]), ['initiatives_realizedbenefit'])
+
+    def test_webhook(self):
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': 99, 'month': '2024-06'}
+        self.assertIndexedAccess(
+            'post', reverse('webhook_report'),
+            ['initiatives_initiative', 'initiatives_realizedbenefit', 'initiatives_benefitrollup'],
+            data=json.dumps(payload), content_type='application/json',
+        )
+
+    def test_benefit_export_joins_by_key(self):
+        # Exports read every benefit by design; the initiative join must still be a key lookup
+        self.assertIndexedAccess('get', reverse('benefit_csv_download'), ['initiatives_initiative'])
+
+    def test_unit_economics_range(self):
+        self.assertIndexedAccess(
+            'get', reverse('unit_economics'), ['initiatives_technologyeconomics'], data={'start': '2023-06', 'end': '2024-05'},
+        )
+
+    def test_sync_api_cursor(self):
+        first = self.client.get(reverse('api_list', args=['benefits']), {'fields': 'id', 'limit': 50}).json()
+        self.assertIndexedAccess(
+            'get', reverse('api_list', args=['benefits']), ['initiatives_realizedbenefit'],
+            data={'fields': 'id,kpi_value', 'updated_since': '2020-01-01', 'cursor': first['next_cursor']},
+        )
+        self.assertIndexedAccess(
+            'get', reverse('api_list', args=['deletions']), ['initiatives_deletedrecord'],
+            data={'updated_since': '2020-01-01', 'cursor': first['next_cursor']},
+        )
+
+    def test_technology_capacity_refresh(self):
+        # Usage writes re-derive the technology's YTD figures from its own rows only
+        self.assertIndexedAccess(
+            'post', reverse('technology_usage_entry', args=[self.technology.pk]),
+            ['initiatives_technologyusage'], data={'month': '2024-06', 'consumption': '12'},
+        )
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    A `replica` alias on a second connection to the test database, so reads can be told apart
+    by connection. TransactionTestCase, because that connection only sees committed rows.
+    """
+
+    def setUp(self):
+        Technology.objects.create(name='Tech', icon='fas fa-server', max_consumption=100)
+        make_initiatives(2)
+        self.use_replica(connections['default'].settings_dict)
+
+    def use_replica(self, settings_dict):
+        if replica.REPLICA_ALIAS in connections.settings:
+            connections[replica.REPLICA_ALIAS].close()
+            del connections[replica.REPLICA_ALIAS]
+        # connections.settings is settings.DATABASES, which replica_configured() reads
+        connections.settings[replica.REPLICA_ALIAS] = dict(settings_dict)
+        self.addCleanup(self.drop_replica)
+
+    def drop_replica(self):
+        if replica.REPLICA_ALIAS in connections.settings:
+            connections[replica.REPLICA_ALIAS].close()
+            del connections[replica.REPLICA_ALIAS]
+            del connections.settings[replica.REPLICA_ALIAS]
+        replica._replica_down_until = 0.0
+
+    def get(self, name):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[replica.REPLICA_ALIAS]) as secondary:
+            response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(secondary)
+
+    def test_reporting_views_read_from_the_replica(self):
+        primary, secondary = self.get('dashboard')
+        self.assertEqual(primary, 0)
+        self.assertGreater(secondary, 0)
+        # Views that don't opt in, such as edit forms, stay on the primary
+        primary, secondary = self.get('technology_list')
+        self.assertGreater(primary, 0)
+        self.assertEqual(secondary, 0)
+
+    def test_writes_pin_reads_to_the_primary(self):
+        technology = Technology.objects.get()
+        response = self.client.post(reverse('technology_usage_entry', args=[technology.pk]), {'month': '2024-06', 'consumption': '12'})
+        self.assertGreater(int(response.cookies[replica.PIN_COOKIE].value), time.time())
+        primary, secondary = self.get('dashboard')
+        self.assertGreater(primary, 0)
+        self.assertEqual(secondary, 0)
+
+        self.client.cookies[replica.PIN_COOKIE] = str(int(time.time()) - 1)
+        self.assertEqual(self.get('dashboard')[0], 0)
+
+    def test_failing_replica_is_skipped_and_the_view_rerun_on_the_primary(self):
+        self.use_replica({**connections['default'].settings_dict, 'NAME': '/nonexistent/replica.sqlite3'})
+        with CaptureQueriesContext(connections['default']) as primary:
+            self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertGreater(len(primary), 0)
+        self.assertFalse(replica.replica_available())
+        # Later requests don't try the replica until REPLICA_RETRY_SECONDS have passed
+        with mock.patch.object(replica, 'mark_replica_down') as mark_down:
+            self.assertEqual(self.client.get(reverse('benefit_analysis')).status_code, 200)
+        mark_down.assert_not_called()
+
+
+class SQLiteWriteLaneTests(TransactionTestCase):
+    """Threads writing through dote_central.sqlite_backend to a scratch file database."""
+    alias = 'lane_test'
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        connections.settings[self.alias] = {
+            **connections['default'].settings_dict, 'ENGINE': 'dote_central.sqlite_backend',
+            'NAME': os.path.join(root.name, 'lane.sqlite3'), 'TEST': {},
+        }
+        self.addCleanup(self.drop_alias)
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER)")
+            cursor.execute("INSERT INTO counter VALUES (1, 0)")
+
+    def drop_alias(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+
+    def value(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT value FROM counter WHERE id = 1")
+            return cursor.fetchone()[0]
+
+    def test_concurrent_writers_are_not_locked_out(self):
+        errors = []
+
+        def writer():
+            try:
+                for _ in range(25):
+                    # Read then write: a deferred BEGIN fails the lock upgrade with `database is locked`
+                    with transaction.atomic(using=self.alias), connections[self.alias].cursor() as cursor:
+                        cursor.execute("SELECT value FROM counter WHERE id = 1")
+                        value = cursor.fetchone()[0]
+                        cursor.execute("UPDATE counter SET value = %s WHERE id = 1", [value + 1])
+                    with connections[self.alias].cursor() as cursor:
+                        cursor.execute("UPDATE counter SET value = value + 1 WHERE id = 1")
+            except OperationalError as e:
+                errors.append(e)
+            finally:
+                connections[self.alias].close()
+
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.value(), 8 * 25 * 2)
+
+    def test_lane_is_released_after_errors(self):
+        wrapper = connections[self.alias]
+        with self.assertRaises(ValueError):
+            with transaction.atomic(using=self.alias), wrapper.cursor() as cursor:
+                cursor.execute("UPDATE counter SET value = 5 WHERE id = 1")
+                self.assertTrue(wrapper.lane.locked())
+                raise ValueError
+        self.assertFalse(wrapper.lane.locked())
+        with self.assertRaises(IntegrityError), wrapper.cursor() as cursor:
+            cursor.execute("INSERT INTO counter VALUES (1, 0)")
+        self.assertFalse(wrapper.lane.locked())
+        self.assertEqual(self.value(), 0)
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 100})
+    def test_blocked_lane_times_out_to_sqlite(self):
+        # A lane held elsewhere delays writers by the busy timeout instead of blocking them forever
+        lane = connections[self.alias].lane
+        lane.acquire()
+        self.addCleanup(lane.release)
+        started = time.monotonic()
+        with transaction.atomic(using=self.alias), connections[self.alias].cursor() as cursor:
+            cursor.execute("UPDATE counter SET value = 1 WHERE id = 1")
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual(self.value(), 1)
+
+
+class UnitEconomicsTests(ScaledDataMixin, TestCase):
+    """Incremental refreshes must leave the same rows a full rebuild would."""
+
+    def snapshot(self):
+        return sorted(TechnologyEconomics.objects.values_list('technology_id', 'yyyymm', *TechnologyEconomics.VALUE_FIELDS))
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        TechnologyEconomics.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_benefit_writes(self):
+        benefit = RealizedBenefit.objects.filter(initiative=self.initiative).first()
+        benefit.kpi_value += 5
+        benefit.save()
+        benefit.month = date(2026, 3, 1)
+        benefit.save()
+        RealizedBenefit.objects.filter(initiative=self.initiative).last().delete()
+        self.assertMatchesRebuild()
+
+    def test_usage_writes(self):
+        TechnologyUsage.objects.create(technology=self.technology, month=date(2026, 1, 1), consumption=0)
+        usages = TechnologyUsage.objects.filter(technology=self.technology).order_by('month')
+        usage = usages[0]
+        usage.consumption = 400
+        usage.save()
+        usages[1].delete()
+        self.assertMatchesRebuild()
+        row = TechnologyEconomics.objects.get(technology=self.technology, yyyymm=to_period(usage.month))
+        self.assertAlmostEqual(row.impact_per_unit, row.total_impact / 400)
+        self.assertIsNone(TechnologyEconomics.objects.get(technology=self.technology, yyyymm=202601).impact_per_unit)
+
+    def test_interleaved_writes_to_one_month(self):
+        # Two initiatives on the same technology feed one economics row; every refresh re-reads it whole
+        first, second = Initiative.objects.filter(technology=self.technology)[:2]
+        month = date(2026, 2, 1)
+        a = RealizedBenefit.objects.create(initiative=first, month=month, kpi_value=3)
+        TechnologyUsage.objects.create(technology=self.technology, month=month, consumption=50)
+        b = RealizedBenefit.objects.create(initiative=second, month=month, kpi_value=4)
+        a.kpi_value = 9
+        a.save()
+        b.delete()
+        moved = RealizedBenefit.objects.filter(initiative=second).first()
+        moved.month = month
+        moved.save()
+        TechnologyUsage.objects.filter(technology=self.technology, month=month).get().delete()
+        self.assertMatchesRebuild()
+        row = TechnologyEconomics.objects.get(technology=self.technology, yyyymm=202602)
+        self.assertEqual(row.initiatives, 2)
+
+    def test_initiative_moves_and_deletes(self):
+        initiative = Initiative.objects.get(pk=self.initiative.pk)
+        initiative.technology = Technology.objects.exclude(pk=initiative.technology_id).first()
+        initiative.save()
+        self.initiatives[-1].delete()
+        self.assertMatchesRebuild()
+
+
+class PivotTests(ScaledDataMixin, TestCase):
+
+    @override_settings(FISCAL_YEAR_START_MONTH=7)
+    def test_quarters_match_reporting(self):
+        BenefitRollup.rebuild()
+        response = self.client.get(reverse('pivot'), {'columns': 'quarter', 'measures': 'dollars,revenue'})
+        result = response.json()
+        expected = time_series(None, None, 'quarter')
+        self.assertEqual(result['header'], [f"dollars: {b['label']}" for b in expected] + [f"revenue: {b['label']}" for b in expected])
+        for actual, value in zip(result['rows'][0], [b['prod_gain'] for b in expected] + [b['rev_impact'] for b in expected]):
+            self.assertAlmostEqual(actual, value, places=4)
+
+    def test_writes_invalidate_cache(self):
+        params = {'rows': 'technology', 'measures': 'kpi', 'status': 'Live'}
+        self.assertEqual(self.client.get(reverse('pivot'), params)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('pivot'), params)['X-Cache'], 'HIT')
+        RealizedBenefit.objects.create(initiative=self.initiatives[0], month=date(2026, 1, 1), kpi_value=1)
+        self.assertEqual(self.client.get(reverse('pivot'), params)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('pivot'), {'rows': 'nope'}).status_code, 400)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReportRangeTests(ScaledDataMixin, TestCase):
+
+    def test_parse_report_range(self):
+        today = date(2025, 5, 17)
+        cases = [
+            ('', 'all', None, None, 'month'),
+            ('range=quarter&granularity=year', 'quarter', date(2025, 4, 1), date(2025, 5, 1), 'year'),
+            ('range=fytd', 'fytd', date(2025, 1, 1), date(2025, 5, 1), 'month'),
+            ('range=last12', 'last12', date(2024, 6, 1), date(2025, 5, 1), 'month'),
+            # Explicit bounds win over the preset and are put in order
+            ('range=fytd&start=2024-09&end=2024-02', 'custom', date(2024, 2, 1), date(2024, 9, 1), 'month'),
+            ('end=2024-02', 'custom', None, date(2024, 2, 1), 'month'),
+            ('range=bogus&start=2024-13&end=soon&granularity=week', 'all', None, None, 'month'),
+        ]
+        for query, preset, start, end, granularity in cases:
+            with self.subTest(query=query):
+                self.assertEqual(parse_report_range(QueryDict(query), today=today),
+                                 {'preset': preset, 'start': start, 'end': end, 'granularity': granularity})
+        with override_settings(FISCAL_YEAR_START_MONTH=7):
+            self.assertEqual(parse_report_range(QueryDict('range=fytd'), today=today)['start'], date(2024, 7, 1))
+
+    @override_settings(FISCAL_YEAR_START_MONTH=7)
+    def test_split_range_across_fiscal_years(self):
+        runs = split_range(date(2023, 5, 1), date(2025, 2, 1))
+        self.assertEqual(runs, {
+            'month': [(202305, 202306), (202501, 202502)],
+            'year': [(202307, 202406)],
+            'quarter': [(202407, 202412)],
+        })
+        self.assertEqual(split_range(date(2023, 5, 1), date(2025, 2, 1), coarsest='quarter')['quarter'], [(202307, 202412)])
+        # Every month in the range is covered exactly once
+        covered = [to_period(add_months(period_to_month(lo), i))
+                   for spans in runs.values() for lo, hi in spans
+                   for i in range((hi // 100 - lo // 100) * 12 + hi % 100 - lo % 100 + 1)]
+        self.assertEqual(sorted(covered), [to_period(add_months(date(2023, 5, 1), i)) for i in range(22)])
+
+    @override_settings(FISCAL_YEAR_START_MONTH=4)
+    def test_incremental_rollups_match_rebuild(self):
+        BenefitRollup.rebuild()
+
+        def snapshot():
+            return sorted(BenefitRollup.objects.values_list('granularity', 'initiative_id', 'yyyymm', 'months', *BenefitRollup.SUM_FIELDS))
+
+        def check(step):
+            incremental = snapshot()
+            BenefitRollup.rebuild()
+            with self.subTest(step=step):
+                self.assertEqual(incremental, snapshot())
+
+        created = RealizedBenefit.objects.create(initiative=self.initiative, month=date(2025, 3, 1), kpi_value=7)
+        check('create in a new fiscal year')
+        created.kpi_value = 70
+        created.save()
+        check('update')
+        created.month = date(2025, 4, 1)
+        created.save()
+        check('move across the fiscal year boundary')
+        moved = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2023, 1, 1))
+        moved.month = date(2025, 6, 1)
+        moved.save()
+        check('move into a partly filled quarter')
+        created.delete()
+        check('delete the only month in its buckets')
+        RealizedBenefit.objects.filter(initiative=self.initiative).order_by('month')[5].delete()
+        check('delete')
+
+    @override_settings(FISCAL_YEAR_START_MONTH=7)
+    def test_out_of_range_months_are_clamped(self):
+        self.assertEqual(parse_report_range(QueryDict('start=0001-01&end=9999-12'))['end'], date(2999, 12, 1))
+        for name in ('dashboard', 'benefit_analysis'):
+            for params in ({'end': '9999-12'}, {'start': '0001-01'}, {'start': '9999-01', 'end': '9999-12'}):
+                with self.subTest(name=name, **params):
+                    self.assertEqual(self.client.get(reverse(name), params).status_code, 200)
+
+
+class LiveUpdateTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        self.addCleanup(live._subscribers.clear)
+
+    def events(self, subscriber):
+        messages = []
+        while not subscriber.queue.empty():
+            message = subscriber.queue.get_nowait()
+            messages.append(json.loads(re.search(r'^data: (.*)$', message, re.M).group(1)))
+        return messages
+
+    @override_settings(LIVE_UPDATES_MAX_CONNECTIONS=1, LIVE_UPDATES_MAX_AGE=120)
+    def test_connection_cap(self):
+        response = self.client.get(reverse('live_updates'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(next(iter(response.streaming_content)).startswith(b'retry:'))
+        refused = self.client.get(reverse('live_updates'))
+        self.assertEqual(refused.status_code, 503)
+        self.assertEqual(refused['Retry-After'], '120')
+        # Closing the stream frees its slot
+        response.close()
+        self.assertEqual(self.client.get(reverse('live_updates')).status_code, 200)
+
+    def test_overflowing_stream_is_told_to_reload(self):
+        subscriber = live.subscribe()
+        for i in range(live.QUEUE_SIZE + 1):
+            live.publish('benefit', {'n': i})
+        self.assertTrue(subscriber.overflowed)
+        messages = list(live.stream(subscriber))
+        self.assertEqual(messages[-1], 'event: reload\ndata: {}\n\n')
+        self.assertEqual(len(messages), 2)
+        self.assertFalse(live.has_subscribers())
+
+    def test_deltas_are_published_on_commit(self):
+        subscriber = live.subscribe()
+        benefit = RealizedBenefit.objects.get(initiative=self.initiative, month=FIRST_MONTH)
+        old_dollars = benefit.calculated_dollars
+        with self.captureOnCommitCallbacks(execute=True):
+            benefit.month = date(2025, 3, 1)
+            benefit.kpi_value = 12
+            benefit.save()
+            self.assertEqual(self.events(subscriber), [])
+        events = {event['yyyymm']: event for event in self.events(subscriber)}
+        self.assertEqual(set(events), {202301, 202503})
+        self.assertEqual(events[202301]['kpi_value'], -10)
+        self.assertAlmostEqual(events[202301]['prod_gain'], -old_dollars)
+        self.assertEqual(events[202503]['kpi_value'], 12)
+        self.assertAlmostEqual(events[202503]['prod_gain'], benefit.calculated_dollars)
+        self.assertEqual(events[202503]['buckets']['quarter'], 'Q1 2025')
+
+        # A write that rolls back publishes nothing
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError), transaction.atomic():
+                benefit.delete()
+                raise ValueError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.events(subscriber), [])
+
+
+class SyncAPITests(ScaledDataMixin, TestCase):
+
+    def fetch_all(self, resource, **params):
+        ids, cursor = [], None
+        while True:
+            page = self.client.get(reverse('api_list', args=[resource]), dict(params, cursor=cursor or '')).json()
+            ids += [row['id'] for row in page['results']]
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                return ids, cursor
+
+    def test_pages_cover_every_row_once(self):
+        ids, _ = self.fetch_all('benefits', fields='id', limit=97)
+        self.assertEqual(sorted(ids), sorted(RealizedBenefit.objects.values_list('id', flat=True)))
+
+    def test_resume_from_cursor_returns_only_changes(self):
+        _, cursor = self.fetch_all('usage', limit=1000)
+        usage = TechnologyUsage.objects.filter(technology=self.technology).first()
+        usage.consumption += 1
+        usage.save()
+        page = self.client.get(reverse('api_list', args=['usage']), {'cursor': cursor, 'fields': 'id,consumption'}).json()
+        self.assertEqual(page['results'], [{'id': usage.pk, 'consumption': usage.consumption}])
+
+    def test_deletions_are_reported(self):
+        _, cursor = self.fetch_all('deletions')
+        benefit = RealizedBenefit.objects.filter(initiative=self.initiative).first()
+        usage = TechnologyUsage.objects.filter(technology=self.technology).first()
+        initiative = self.initiatives[-1]
+        cascaded = list(initiative.realized_benefits.values_list('id', flat=True))
+        self.client.post(reverse('benefit_delete', args=[benefit.pk]))
+        self.client.post(reverse('technology_usage_delete', args=[usage.pk]))
+        self.client.post(reverse('initiative_delete', args=[initiative.pk]))
+
+        page = self.client.get(reverse('api_list', args=['deletions']), {'cursor': cursor or '', 'fields': 'resource,object_id', 'limit': 1000}).json()
+        self.assertCountEqual([(row['resource'], row['object_id']) for row in page['results']], [
+            ('benefits', benefit.pk), ('usage', usage.pk), ('initiatives', initiative.pk),
+        ] + [('benefits', pk) for pk in cascaded])
+        # Every tombstone names an id the resource no longer returns
+        benefit_ids = set(self.fetch_all('benefits', fields='id', limit=5000)[0])
+        self.assertFalse(benefit_ids & {row['object_id'] for row in page['results'] if row['resource'] == 'benefits'})
+
+    def test_projection_and_errors(self):
+        page = self.client.get(reverse('api_list', args=['initiatives']), {'fields': 'name,technology', 'limit': 2}).json()
+        self.assertEqual(list(page['results'][0]), ['name', 'technology'])
+        self.assertEqual(self.client.get(reverse('api_list', args=['initiatives']), {'fields': 'webhook_key'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('api_list', args=['benefits']), {'cursor': 'bogus'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('api_list', args=['nope'])).status_code, 404)
+
+
+class KPIEventLedgerTests(ScaledDataMixin, TestCase):
+
+    def post_events(self, events):
+        payload = {'webhook_key': self.initiative.webhook_key, 'events': events}
+        return self.client.post(reverse('webhook_events'), data=json.dumps(payload), content_type='application/json')
+
+    def test_compaction_counts_each_event_once(self):
+        benefit = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1))
+        events = [{'kpi_value': 1, 'revenue_impact': 2, 'timestamp': f"2024-06-{day:02d}T12:00:00"} for day in range(1, 29)]
+        events.append({'kpi_value': 5, 'timestamp': '2026-01-15'})
+        self.assertEqual(self.post_events(events).status_code, 202)
+        # Tagged so load-test replays of the report webhook leave event batches out
+        self.assertEqual(WebhookAuditLog.objects.latest('id').endpoint, 'events')
+        later = datetime.now(dt_timezone.utc) + timedelta(hours=1)
+
+        self.assertEqual(compact(batch_size=10, now=later), len(events))
+        self.assertEqual(compact(now=later), 0)
+        refreshed = RealizedBenefit.objects.get(pk=benefit.pk)
+        self.assertEqual(refreshed.kpi_value, benefit.kpi_value + 28)
+        self.assertEqual(refreshed.revenue_impact, benefit.revenue_impact + 56)
+        self.assertEqual(RealizedBenefit.objects.get(initiative=self.initiative, month=date(2026, 1, 1)).kpi_value, 5)
+
+        # Events only just recorded wait for the next run
+        self.post_events([{'kpi_value': 1, 'timestamp': '2024-06-30'}])
+        self.assertEqual(compact(), 0)
+        self.assertEqual(compact(now=later), 1)
+
+    def test_unsettled_event_holds_back_later_ids(self):
+        self.post_events([{'kpi_value': 1, 'timestamp': '2024-06-10'}, {'kpi_value': 2, 'timestamp': '2024-06-11'}])
+        first, second = KPIEvent.objects.filter(initiative=self.initiative).order_by('id')
+        now = datetime.now(dt_timezone.utc)
+        # The lower id was recorded last, e.g. by a transaction that committed late
+        KPIEvent.objects.filter(pk=second.pk).update(recorded_at=now - timedelta(hours=1))
+        KPIEvent.objects.filter(pk=first.pk).update(recorded_at=now)
+
+        self.assertEqual(compact(now=now), 0)
+        self.assertEqual(compact(now=now + timedelta(hours=1)), 2)
+        self.assertEqual(RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1)).kpi_value, 10 + 17 + 3)
+
+    def test_downsample_keeps_daily_totals(self):
+        events = [{'kpi_value': 1, 'timestamp': f"2024-06-{day:02d}T{hour:02d}:00:00"} for day in range(1, 11) for hour in range(24)]
+        self.post_events(events)
+        self.post_events([{'kpi_value': 3, 'timestamp': '2024-06-11T09:00:00'}])
+        later = datetime.now(dt_timezone.utc) + timedelta(hours=1)
+        # Nothing is folded before it has been compacted
+        self.assertEqual(downsample(retention_days=30, now=later), 0)
+        compact(now=later)
+        self.assertEqual(downsample(retention_days=30, now=later), 10 * 23)
+        self.assertEqual(downsample(retention_days=30, now=later), 0)
+        self.assertEqual(KPIEvent.objects.filter(initiative=self.initiative).count(), 11)
+        self.assertEqual(compact(now=later), 0)
+
+        totals = {str(row['occurred_at'].date()): (row['kpi_value'], row['events'])
+                  for row in KPIEvent.objects.filter(initiative=self.initiative).values('occurred_at', 'kpi_value', 'events')}
+        self.assertEqual(totals['2024-06-01'], (24, 24))
+        self.assertEqual(totals['2024-06-11'], (3, 1))
+
+    def test_daily_view(self):
+        self.post_events([{'kpi_value': 2}, {'kpi_value': 3}])
+        days = self.client.get(reverse('initiative_daily_kpi', args=[self.initiative.pk]), {'days': 7}).json()['days']
+        self.assertEqual([(day['kpi_value'], day['events']) for day in days], [(5, 2)])
+
+    def test_rejects_bad_events(self):
+        self.assertEqual(self.post_events([{'kpi_value': 'lots'}]).status_code, 400)
+        self.assertEqual(self.post_events([{'kpi_value': 1, 'timestamp': 'yesterday'}]).status_code, 400)
+        self.assertEqual(self.post_events([]).status_code, 400)
+        self.assertFalse(KPIEvent.objects.exists())
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class SnapshotTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings_override = override_settings(SNAPSHOT_ROOT=self.root.name, SNAPSHOT_PUBLISH_KEY='test-key')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_snapshots_are_served_without_queries(self):
+        self.assertEqual(len(publish()), 8)
+        with self.assertNumQueries(0):
+            response = self.client.get('/snapshots/dashboard/')
+            data = json.loads(b''.join(self.client.get('/snapshots/dashboard/last12/data.json').streaming_content))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('stale-while-revalidate', response['Cache-Control'])
+        html = b''.join(response.streaming_content).decode()
+        self.assertIn('Snapshot as of', html)
+        self.assertIn('href="/snapshots/dashboard/last12/"', html)
+        self.assertNotIn('id="live-config"', html)
+
+        live = self.client.get(reverse('dashboard'), {'range': 'last12'}).context
+        self.assertEqual(data['total_overall'], live['total_overall'])
+        self.assertEqual(data['range_label'], 'Last 12 Months')
+        self.assertEqual(self.client.get('/snapshots/dashboard/nope/').status_code, 404)
+
+    def test_publish_endpoint_requires_key(self):
+        url = reverse('snapshot_publish')
+        self.assertEqual(self.client.post(url, {'publish_key': 'wrong'}, content_type='application/json').status_code, 403)
+        response = self.client.post(url, {'publish_key': 'test-key'}, content_type='application/json')
+        self.assertEqual(response.json()['published'][0], '/snapshots/dashboard/all/')
+        self.assertEqual(self.client.get('/snapshots/analysis/').status_code, 200)
+
+
+class OfflineBenefitSyncTests(ScaledDataMixin, TestCase):
+
+    def sync(self, entries):
+        response = self.client.post(reverse('benefit_batch'), data=json.dumps({'entries': entries}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return {result['id']: result['status'] for result in response.json()['results']}
+
+    def test_replay_is_idempotent(self):
+        benefit = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1))
+        queued_at = benefit.updated_at.isoformat()
+        entries = [
+            {'id': 'a', 'initiative': self.initiative.pk, 'month': '2024-06', 'kpi_value': 1, 'queued_at': queued_at},
+            {'id': 'b', 'initiative': self.initiative.pk, 'month': '2024-06', 'kpi_value': 77, 'queued_at': queued_at},
+            {'id': 'c', 'initiative': self.initiative.pk, 'month': '2026-03', 'kpi_value': 3, 'revenue_impact': '4.5'},
+            {'id': 'd', 'initiative': 999999, 'month': '2026-03', 'kpi_value': 3},
+            {'id': 'e', 'initiative': self.initiative.pk, 'month': 'March', 'kpi_value': 3},
+        ]
+        self.assertEqual(self.sync(entries), {'a': 'duplicate', 'b': 'updated', 'c': 'created', 'd': 'error', 'e': 'error'})
+        count = RealizedBenefit.objects.count()
+        self.assertEqual(self.sync(entries), {'a': 'duplicate', 'b': 'unchanged', 'c': 'unchanged', 'd': 'error', 'e': 'error'})
+        self.assertEqual(RealizedBenefit.objects.count(), count)
+        benefit.refresh_from_db()
+        self.assertEqual(benefit.kpi_value, 77)
+        self.assertEqual(benefit.calculated_minutes, 77 * self.initiative.multiplier_minutes)
+
+    def test_entries_queued_before_an_online_edit_are_stale(self):
+        benefit = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1))
+        queued_at = (benefit.updated_at - timedelta(minutes=5)).isoformat()
+        entry = {'id': 'late', 'initiative': self.initiative.pk, 'month': '2024-06', 'kpi_value': 1, 'queued_at': queued_at}
+        self.assertEqual(self.sync([entry]), {'late': 'stale'})
+        self.assertEqual(RealizedBenefit.objects.get(pk=benefit.pk).kpi_value, benefit.kpi_value)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class QueryBudgetTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+
+    def test_sqlite_statement_is_interrupted(self):
+        slow = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) SELECT count(*) FROM n"
+        started = time.monotonic()
+        with self.assertRaises(QueryBudgetExceeded), query_budget(0.05):
+            with connection.cursor() as cursor:
+                cursor.execute(slow)
+        self.assertLess(time.monotonic() - started, 2)
+        # The handler is gone once the block ends
+        self.assertEqual(Initiative.objects.count(), INITIATIVES)
+
+    def test_over_budget_view_serves_last_good_result(self):
+        fresh = self.client.get(reverse('dashboard'), {'range': 'last12'})
+        self.assertNotIn('stale_as_of', fresh.context)
+
+        with override_settings(REPORT_QUERY_BUDGET_MS=1e-6), self.assertLogs('dote.performance', 'WARNING') as logs:
+            stale = self.client.get(reverse('dashboard'), {'range': 'last12'})
+            self.assertEqual(stale.status_code, 200)
+            self.assertIsNotNone(stale.context['stale_as_of'])
+            self.assertIsNone(stale.context['live_config'])
+            self.assertEqual(stale.context['total_overall'], fresh.context['total_overall'])
+            self.assertContains(stale, 'Stale figures')
+
+            # Nothing computed yet for these filters
+            missing = self.client.get(reverse('benefit_analysis'), {'range': 'last12'})
+            self.assertEqual(missing.status_code, 503)
+            self.assertIn('Retry-After', missing)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(registry.budgets, {('dashboard', 'stale'): 1, ('benefit_analysis', 'unavailable'): 1})
+
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class MetricsTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_middleware_removes_itself(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            MetricsMiddleware(lambda request: None)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('dashboard')))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        self.assertEqual(registry.requests, {})
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN='secret', SLOW_QUERY_MS=0)
+    def test_requests_are_timed_and_counted(self):
+        with CaptureQueriesContext(connection) as queries, self.assertLogs('dote.performance') as logs:
+            response = self.client.get(reverse('dashboard'))
+        timing = re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=-?[\d.]+, total;dur=[\d.]+', response['Server-Timing'])
+        self.assertEqual(int(timing.group(1)), len(queries))
+        self.assertEqual(len(logs.records), len(queries))
+        self.assertIn('"event": "slow_query"', logs.output[0])
+
+        histogram = registry.query_counts['dashboard']
+        self.assertEqual((histogram.total, histogram.sum), (1, len(queries)))
+        self.assertEqual(histogram.counts, [int(len(queries) <= bound) for bound in histogram.buckets])
+        self.assertEqual(registry.requests, {('dashboard', 'GET', '200'): 1})
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'dote_db_queries_per_request_count{{view="dashboard"}} 1', response.content.decode())
+
+
+class WebhookIdempotencyTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        webhook_limits.reset()
+
+    def report(self, payload, **headers):
+        return self.client.post(reverse('webhook_report'), data=json.dumps(payload), content_type='application/json', headers=headers)
+
+    def test_retried_key_is_replayed_without_writes(self):
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': 99, 'month': '2024-06'}
+        first = self.report(payload, **{'Idempotency-Key': 'retry-1'})
+        self.assertEqual(first.json()['result'], 'updated')
+        logs, audits = WebhookAuditLog.objects.count(), AuditLog.objects.count()
+
+        with self.assertNumQueries(0):
+            retry = self.report(payload, **{'Idempotency-Key': 'retry-1'})
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual((retry.json()['result'], retry.json()['original_result']), ('duplicate', 'updated'))
+        self.assertEqual((WebhookAuditLog.objects.count(), AuditLog.objects.count()), (logs, audits))
+
+        # The key may also travel in the body, but not with a different payload
+        self.assertEqual(self.report(dict(payload, idempotency_key='retry-1'))['Idempotent-Replayed'], 'true')
+        self.assertEqual(self.report(dict(payload, kpi_value=5), **{'Idempotency-Key': 'retry-1'}).status_code, 422)
+        self.assertEqual(self.report(payload, **{'Idempotency-Key': 'x' * 256}).status_code, 400)
+
+    def test_unchanged_values_skip_the_upsert(self):
+        benefit = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1))
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': benefit.kpi_value,
+                   'revenue_impact': benefit.revenue_impact, 'month': '2024-06'}
+        audits = AuditLog.objects.count()
+        # Initiative and benefit reads plus the webhook log insert
+        with self.assertNumQueries(3):
+            response = self.report(payload)
+        self.assertEqual(response.json()['result'], 'unchanged')
+        self.assertEqual(RealizedBenefit.objects.get(pk=benefit.pk).updated_at, benefit.updated_at)
+        self.assertEqual(AuditLog.objects.count(), audits)
+
+        self.assertEqual(self.report(dict(payload, kpi_value=benefit.kpi_value + 1)).json()['result'], 'updated')
+        self.assertEqual(self.report(dict(payload, month='2030-01')).json()['result'], 'created')
+
+
+@override_settings(WEBHOOK_RATE_BURST=2, WEBHOOK_IP_RATE_BURST=5)
+class WebhookRateLimitTests(ScaledDataMixin, TestCase):
+
+    def setUp(self):
+        webhook_limits.reset()
+        registry.reset()
+
+    def report(self, payload, ip='10.0.0.1'):
+        return self.client.post(reverse('webhook_report'), data=json.dumps(payload), content_type='application/json', REMOTE_ADDR=ip)
+
+    def test_key_bucket_uses_the_initiative_limit(self):
+        self.initiative.webhook_rate_limit = 1
+        self.initiative.save()
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': 5, 'month': '2024-06'}
+        self.assertEqual([self.report(payload, ip=f"10.0.1.{i}").status_code for i in range(2)], [200, 200])
+        logs = WebhookAuditLog.objects.count()
+
+        # The emptied bucket refuses the key before any lookup, from any address
+        with self.assertNumQueries(0):
+            refused = self.report(payload, ip='10.0.1.9')
+        self.assertEqual(refused.status_code, 429)
+        self.assertEqual(refused['Retry-After'], '60')
+        self.assertEqual(WebhookAuditLog.objects.count(), logs)
+        self.assertEqual(registry.rate_limited, {'key': 1})
+
+        # Other initiatives keep their own buckets
+        other = Initiative.objects.exclude(pk=self.initiative.pk).first()
+        self.assertEqual(self.report(dict(payload, webhook_key=other.webhook_key), ip='10.0.1.9').status_code, 200)
+
+    def test_ip_bucket_stops_key_spraying_without_audit_rows(self):
+        statuses = [self.report({'webhook_key': f"guess-{i}"}).status_code for i in range(8)]
+        self.assertEqual(statuses, [403] * 5 + [429] * 3)
+        self.assertEqual(WebhookAuditLog.objects.filter(status_code=403).count(), 5)
+        self.assertEqual(registry.rate_limited, {'ip': 3})
+        self.assertIn('dote_webhook_rate_limited_total{scope="ip"} 3', registry.render())
+        self.assertEqual(self.report({'webhook_key': 'guess'}, ip='10.0.0.2').status_code, 403)
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_spoofed_forwarded_for_shares_the_proxy_reported_bucket(self):
+        statuses = [
+            self.client.post(reverse('webhook_report'), data=json.dumps({'webhook_key': f"guess-{i}"}), content_type='application/json',
+                             REMOTE_ADDR='169.254.1.1', HTTP_X_FORWARDED_FOR=f"203.0.113.{i}, 198.51.100.7").status_code
+            for i in range(8)
+        ]
+        self.assertEqual(statuses, [403] * 5 + [429] * 3)
+        self.assertEqual(list(webhook_limits.buckets), ['ip:198.51.100.7'])
+
+    @override_settings(WEBHOOK_IP_RATE_PER_MINUTE=0)
+    def test_zero_disables_a_limit(self):
+        self.initiative.webhook_rate_limit = 0
+        self.initiative.save()
+        payload = {'webhook_key': self.initiative.webhook_key, 'kpi_value': 5, 'month': '2024-06'}
+        self.assertEqual({self.report(payload).status_code for _ in range(6)}, {200})
+
+
+class MultiplierVersionTests(ScaledDataMixin, TestCase):
+
+    def test_recompute_effective_from_records_a_version(self):
+        self.initiative.multiplier_minutes = 5
+        self.initiative.save()
+        out = io.StringIO()
+        call_command('recompute_benefits', initiatives=[self.initiative.pk], effective_from='2024-01', stdout=out)
+
+        version = self.initiative.multiplier_versions.get(effective_from=date(2024, 1, 1))
+        self.assertEqual(version.multiplier_minutes, 5)
+        self.assertIn(f"{MONTHS - 12} benefit(s) restated.", out.getvalue())
+        restated = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2024, 6, 1))
+        self.assertEqual(restated.calculated_minutes, restated.kpi_value * 5)
+        # Months before the new version keep the multipliers they were written with
+        kept = RealizedBenefit.objects.get(initiative=self.initiative, month=date(2023, 6, 1))
+        self.assertEqual(kept.calculated_minutes, kept.kpi_value * 2.5)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class BackupRestoreTests(TestCase):
+
+    def test_pre_series_backup_restores_frozen_values(self):
+        Technology.objects.create(name='Gemini', icon='fas fa-server', max_consumption=1000)
+        initiative = {
+            'name': 'Legacy bot', 'requester_name': 'R', 'lob_owner': 'L', 'description': 'D', 'it_owner': 'I',
+            'it_owner_email': 'it@example.com', 'department': 'IT', 'status': 'Live', 'technology': 'gemini',
+            'value': 'V', 'benefit_name': 'Productivity Gain', 'webhook_key': 'legacy-key', 'kpi_name': 'Tasks',
+            'multiplier_minutes': 3.0, 'multiplier_dollars': 0.5,
+            'created_at': '2023-01-01T00:00:00Z', 'updated_at': '2023-01-01T00:00:00Z',
+        }
+        backup = [{'model': 'initiatives.initiative', 'pk': 7, 'fields': initiative}] + [
+            {'model': 'initiatives.realizedbenefit', 'pk': 100 + m, 'fields': {
+                'initiative': 7, 'month': f"2023-{m:02d}-01", 'kpi_value': 10.0, 'revenue_impact': 0.0,
+                'created_at': '2023-01-01T00:00:00Z', 'updated_at': '2023-01-01T00:00:00Z',
+            }} for m in range(1, 7)
+        ]
+        upload = SimpleUploadedFile('backup.json', json.dumps(backup).encode(), content_type='application/json')
+        self.client.post(reverse('csv_upload'), {'csv_file': upload})
+
+        restored = Initiative.objects.get(pk=7)
+        version = restored.multiplier_versions.get()
+        self.assertEqual((version.effective_from, version.multiplier_minutes), (date(2023, 1, 1), 3.0))
+        benefit = RealizedBenefit.objects.get(pk=103)
+        self.assertEqual((benefit.yyyymm, benefit.calculated_minutes, benefit.calculated_dollars), (202303, 30.0, 15.0))
+        self.assertEqual(BenefitRollup.objects.get(initiative=restored, granularity='year').calculated_dollars, 90.0)
+        # The wipe can't be told row by row, so syncs are told to re-pull both resources
+        page = self.client.get(reverse('api_list', args=['deletions'])).json()
+        self.assertCountEqual([(row['resource'], row['object_id']) for row in page['results']], [('initiatives', None), ('benefits', None)])
+        restated = self.client.get(reverse('api_list', args=['benefits']), {'updated_since': date.today().isoformat()}).json()['results']
+        self.assertEqual(sorted(row['calculated_dollars'] for row in restated), [15.0] * 6)
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_overall'], 90.0)
+
+    def test_unfilled_period_keys_are_ignored_by_open_ranges(self):
+        Technology.objects.create(name='Gemini', icon='fas fa-server', max_consumption=1000)
+        make_initiatives(1)
+        RealizedBenefit.objects.filter(month=FIRST_MONTH).update(yyyymm=0)
+        self.assertEqual(resolve_bounds(None, None), (FIRST_MONTH.replace(month=2), add_months(FIRST_MONTH, MONTHS - 1)))
+
+
+class CapacityForecastTests(TestCase):
+
+    def add_usage(self, technology, values):
+        """Monthly usage for 2024, January first; None leaves a month unreported."""
+        TechnologyUsage.objects.bulk_create([
+            TechnologyUsage(technology=technology, month=date(2024, m + 1, 1), yyyymm=202401 + m, consumption=value)
+            for m, value in enumerate(values) if value is not None
+        ])
+
+    def test_linear_growth_predicts_breach_month(self):
+        growing, sparse, flat, over = [
+            Technology.objects.create(name=name, icon='fas fa-server', max_consumption=cap)
+            for name, cap in (('Growing', 1020), ('Sparse', 1020), ('Flat', 1000), ('Over', 1000))
+        ]
+        series = [100 + 50 * m for m in range(12)]
+        self.add_usage(growing, series)
+        # Gaps don't bend the fit: every other month of the same line
+        self.add_usage(sparse, [value if m % 2 == 0 else None for m, value in enumerate(series)])
+        self.add_usage(flat, [100] * 12)
+        self.add_usage(over, [900] * 11 + [1500])
+
+        self.assertEqual(run_forecast(today=date(2024, 12, 15)), 4)
+        capacities = {c.technology_id: c for c in TechnologyCapacity.objects.all()}
+        # 700 next month, rising 50 a month: 1000 in 2025-07 stays under 1020, 1050 in 2025-08 doesn't
+        for technology in (growing, sparse):
+            self.assertAlmostEqual(capacities[technology.pk].run_rate, 700)
+            self.assertAlmostEqual(capacities[technology.pk].trend, 50)
+            self.assertEqual(capacities[technology.pk].breach_yyyymm, 202508)
+        self.assertIsNone(capacities[flat.pk].breach_yyyymm)
+        self.assertEqual(capacities[over.pk].breach_yyyymm, 202412)
+
+
+class VendorStaticTests(SimpleTestCase):
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.source = os.path.join(root.name, 'lib.js')
+        with open(self.source, 'w') as f:
+            f.write('console.log(1);')
+        self.static = os.path.join(root.name, 'static')
+        for patch in (
+            mock.patch.dict(vendor_static.VENDOR_ASSETS, {'vendor/lib.js': f'file://{self.source}'}, clear=True),
+            mock.patch.object(vendor_static, 'LOCK_FILE', os.path.join(root.name, 'vendor.sha256')),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        settings_override = override_settings(STATICFILES_DIRS=[self.static])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_assets_must_match_their_pinned_digest(self):
+        target = os.path.join(self.static, 'vendor', 'lib.js')
+        with self.assertRaisesMessage(CommandError, 'no sha256'):
+            call_command('vendor_static', stdout=io.StringIO())
+        call_command('vendor_static', update_lock=True, stdout=io.StringIO())
+        self.assertEqual(vendor_static.read_lock(), {'vendor/lib.js': hashlib.sha256(b'console.log(1);').hexdigest()})
+
+        # A changed upstream file is refused before it replaces the installed one
+        with open(self.source, 'w') as f:
+            f.write('steal(document.cookie);')
+        with self.assertRaisesMessage(CommandError, 'nothing was written'):
+            call_command('vendor_static', force=True, stdout=io.StringIO())
+        with open(target) as f:
+            self.assertEqual(f.read(), 'console.log(1);')
+        with open(target, 'w') as f:
+            f.write('tampered')
+        with self.assertRaisesMessage(CommandError, 'does not match'):
+            call_command('vendor_static', stdout=io.StringIO())
@@ -2,25 +2,55 @@ import io
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, CreateView, UpdateView, DetailView, View
 from django.urls import reverse_lazy, reverse
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.contrib import messages
-from django.db.models import Sum, Count, F, ExpressionWrapper, FloatField, Q
-from django.db.models.functions import TruncMonth, Coalesce
+from django.db.models import Sum, Count, F, ExpressionWrapper, FloatField, Q, Min, ProtectedError
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core import serializers
 from itertools import chain
 import json
-from .models import Initiative, RealizedBenefit, WebhookAuditLog, AuditLog, Technology, TechnologyUsage
+from .models import Initiative, MultiplierVersion, RealizedBenefit, BenefitRollup, WebhookAuditLog, AuditLog, DeletedRecord, Technology, TechnologyUsage, TechnologyCapacity, TechnologyEconomics
+from .periods import GRANULARITIES, to_period
+from . import idempotency, live
+from .api import RESOURCES as API_RESOURCES, APIError, list_page
+from .ingest import ingest_benefits, ingest_usage, rows_from_csv
+from .ledger import daily_totals, record_events
+from .pivot import PivotError, cached_pivot, parse_pivot_request
+from .reporting import RANGE_PRESETS, parse_report_range, range_label, initiative_totals, time_series
+from .snapshots import publish as publish_snapshots
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from datetime import datetime
-import pandas as pd
+from django.views.decorators.gzip import gzip_page
+from datetime import datetime, timedelta
 import csv
+import secrets
+import time
+from functools import lru_cache
+from django.conf import settings
+from django.contrib.staticfiles.finders import FileSystemFinder
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import DatabaseError, connections
+from django.template.loader import get_template
+from django.core.cache import cache
+import hashlib
+import math
+from dote_central.budgets import QueryBudgetExceeded, query_budget
+from dote_central.metrics import log_slow, registry as metrics_registry
+from dote_central.ratelimit import webhook_limits
 
 def get_client_ip(request):
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        return x_forwarded_for.split(',')[0]
+    """
+    The client address as seen by the outermost trusted proxy. Each of the TRUSTED_PROXY_COUNT proxies
+    appends the peer it received from to X-Forwarded-For, so the client is that many entries from the
+    end; anything before it was sent by the client and can be forged.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies:
+        hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+        if len(hops) >= proxies:
+            return hops[-proxies]
     return request.META.get('REMOTE_ADDR')
 
 def log_audit(request, action, obj_type, obj_name, source='Portal', details=None):
@@ -35,92 +65,135 @@ def log_audit(request, action, obj_type, obj_name, source='Portal', details=None
         details=details or {}
     )
 
-class DashboardView(View):
+class QueryBudgetMixin:
+    """
+    Builds get_context() within REPORT_QUERY_BUDGET_MS (or `query_budget_ms`).
+    Each result is kept as the last good one for its filters. When the budget
+    runs out, that result is served with a stale banner; with none kept yet the
+    response is a 503. Either way the overrun is counted and logged.
+    """
+    query_budget_ms = None
+
     def get(self, request):
-        initiatives = Initiative.objects.all()
-        
+        budget_ms = settings.REPORT_QUERY_BUDGET_MS if self.query_budget_ms is None else self.query_budget_ms
+        filters = json.dumps(sorted(request.GET.lists()))
+        key = f"last-good:{type(self).__name__}:" + hashlib.sha256(filters.encode()).hexdigest()
+        try:
+            with query_budget(budget_ms / 1000):
+                context = self.get_context(request)
+        except QueryBudgetExceeded:
+            last_good = cache.get(key)
+            view = request.resolver_match.url_name
+            outcome = 'stale' if last_good else 'unavailable'
+            metrics_registry.record_budget_exceeded(view, outcome)
+            log_slow('query_budget_exceeded', view=view, path=request.get_full_path(), budget_ms=budget_ms, served=outcome)
+            if last_good is None:
+                response = HttpResponse('This report is taking too long to compute. Try again shortly.', status=503, content_type='text/plain')
+                response['Retry-After'] = '30'
+                return response
+            context, computed_at = last_good
+            # Live deltas would be added on top of old totals, so a stale page doesn't subscribe
+            context.update(stale_as_of=computed_at, live_config=None)
+        else:
+            cache.set(key, (context, timezone.now()), settings.REPORT_LAST_GOOD_SECONDS)
+        return render(request, self.template_name, context)
+
+
+class DashboardView(QueryBudgetMixin, View):
+    read_from_replica = True
+    template_name = 'initiatives/dashboard.html'
+
+    def get_context(self, request):
+        report_range = parse_report_range(request.GET)
+        start, end = report_range['start'], report_range['end']
+
+        # Technology name, icon and capacity come from the same query through the indexed FK
+        initiatives = list(Initiative.objects.values(
+            'id', 'name', 'department', 'status', 'kpi_name', 'benefit_name',
+            'technology_id', 'technology__name', 'technology__icon', 'technology__max_consumption',
+            'technology__capacity__ytd_consumption',
+        ))
+        initiatives_by_id = {i['id']: i for i in initiatives}
+
+        # Per-initiative sums come from quarter/year rollups plus monthly rows at the range edges
+        totals = initiative_totals(start, end)
+
+        initiative_stats = []
+        for initiative_id, row in totals.items():
+            initiative = initiatives_by_id[initiative_id]
+            initiative_stats.append({
+                'initiative__id': initiative_id,
+                'initiative__name': initiative['name'],
+                'initiative__department': initiative['department'],
+                'initiative__kpi_name': initiative['kpi_name'],
+                'initiative__technology_id': initiative['technology_id'],
+                'initiative__benefit_name': initiative['benefit_name'],
+                'total_kpi': row['total_kpi'],
+                'prod_gain': row['prod_gain'],
+                'rev_impact': row['rev_impact'],
+                'total_impact': row['prod_gain'] + row['rev_impact'],
+            })
+
         # High-level Totals for Dashboard Stat Cards
-        total_productivity = RealizedBenefit.objects.filter(
-            initiative__benefit_name='Productivity Gain'
-        ).aggregate(
-            total=Sum(F('kpi_value') * F('initiative__multiplier_minutes') * F('initiative__multiplier_dollars'))
-        )['total'] or 0
-        
-        total_revenue = RealizedBenefit.objects.filter(
-            initiative__benefit_name='New Business'
-        ).aggregate(Sum('revenue_impact'))['revenue_impact__sum'] or 0
+        total_productivity = sum(row['prod_gain'] for row in initiative_stats)
+        total_revenue = sum(
+            row['rev_impact'] for row in initiative_stats
+            if row['initiative__benefit_name'] == 'New Business'
+        )
 
         # Bar Chart & Detailed Breakdown logic (Moved to Dashboard)
-        monthly_stats = RealizedBenefit.objects.annotate(
-            month_trunc=TruncMonth('month')
-        ).values('month_trunc').annotate(
-            prod_gain=Coalesce(Sum(F('kpi_value') * F('initiative__multiplier_minutes') * F('initiative__multiplier_dollars')), 0.0),
-            rev_impact=Coalesce(Sum('revenue_impact'), 0.0)
-        ).order_by('month_trunc')
-
-        labels = [stat['month_trunc'].strftime('%b %Y') for stat in monthly_stats]
-        prod_data = [float(stat['prod_gain']) for stat in monthly_stats]
-        rev_data = [float(stat['rev_impact']) for stat in monthly_stats]
-
-        initiative_stats = RealizedBenefit.objects.values(
-            'initiative__id',
-            'initiative__name', 
-            'initiative__department',
-            'initiative__kpi_name'
-        ).annotate(
-            total_kpi=Coalesce(Sum('kpi_value'), 0.0),
-            prod_gain=Coalesce(Sum(F('kpi_value') * F('initiative__multiplier_minutes') * F('initiative__multiplier_dollars')), 0.0),
-            rev_impact=Coalesce(Sum('revenue_impact'), 0.0)
-        ).annotate(
-            total_impact=F('prod_gain') + F('rev_impact')
-        )
+        period_stats = time_series(start, end, report_range['granularity'])
+
+        labels = [stat['label'] for stat in period_stats]
+        prod_data = [float(stat['prod_gain']) for stat in period_stats]
+        rev_data = [float(stat['rev_impact']) for stat in period_stats]
 
         sort_by = request.GET.get('sort', 'total')
         if sort_by == 'prod':
-            initiative_stats = initiative_stats.order_by('-prod_gain')
+            initiative_stats.sort(key=lambda x: x['prod_gain'], reverse=True)
         elif sort_by == 'rev':
-            initiative_stats = initiative_stats.order_by('-rev_impact')
+            initiative_stats.sort(key=lambda x: x['rev_impact'], reverse=True)
         else:
-            initiative_stats = initiative_stats.order_by('-total_impact')
-
-        function_stats = RealizedBenefit.objects.values(
-            'initiative__department'
-        ).annotate(
-            prod_gain=Coalesce(Sum(F('kpi_value') * F('initiative__multiplier_minutes') * F('initiative__multiplier_dollars')), 0.0),
-            rev_impact=Coalesce(Sum('revenue_impact'), 0.0)
-        ).annotate(
-            total_impact=F('prod_gain') + F('rev_impact')
-        ).order_by('-total_impact')
-
-        tech_stats_raw = RealizedBenefit.objects.values(
-            'initiative__technology', 'initiative__id', 'initiative__name', 'initiative__kpi_name'
-        ).annotate(
-            total_kpi=Coalesce(Sum('kpi_value'), 0.0),
-            prod_gain=Coalesce(Sum(F('kpi_value') * F('initiative__multiplier_minutes') * F('initiative__multiplier_dollars')), 0.0),
-            rev_impact=Coalesce(Sum('revenue_impact'), 0.0)
-        )
-        
+            initiative_stats.sort(key=lambda x: x['total_impact'], reverse=True)
+
+        function_dict = {}
+        for row in initiative_stats:
+            dept = row['initiative__department']
+            stat = function_dict.setdefault(dept, {
+                'initiative__department': dept,
+                'prod_gain': 0.0,
+                'rev_impact': 0.0,
+                'total_impact': 0.0,
+            })
+            stat['prod_gain'] += row['prod_gain']
+            stat['rev_impact'] += row['rev_impact']
+            stat['total_impact'] += row['total_impact']
+        function_stats = sorted(function_dict.values(), key=lambda x: x['total_impact'], reverse=True)
+
         tech_dict = {}
-        for row in tech_stats_raw:
-            tech = row['initiative__technology'] or 'Unspecified'
+        for row in initiative_stats:
+            tech = row['initiative__technology_id']
             if tech not in tech_dict:
+                initiative = initiatives_by_id[row['initiative__id']]
                 tech_dict[tech] = {
-                    'technology': tech,
+                    'technology': initiative['technology__name'],
+                    'icon': initiative['technology__icon'],
+                    'ytd_consumption': initiative['technology__capacity__ytd_consumption'],
+                    'max_consumption': initiative['technology__max_consumption'],
                     'initiatives': [],
                     'total_kpi': 0.0,
                     'total_impact': 0.0
                 }
             if row['initiative__name']:
-                row_total_impact = row['prod_gain'] + row['rev_impact']
                 tech_dict[tech]['initiatives'].append({
                     'id': row['initiative__id'],
                     'name': row['initiative__name'],
                     'kpi_name': row['initiative__kpi_name'] or 'KPI',
                     'total_kpi': row['total_kpi'],
-                    'total_impact': row_total_impact
+                    'total_impact': row['total_impact']
                 })
             tech_dict[tech]['total_kpi'] += row['total_kpi']
-            tech_dict[tech]['total_impact'] += row['prod_gain'] + row['rev_impact']
+            tech_dict[tech]['total_impact'] += row['total_impact']
             
         tech_stats = list(tech_dict.values())
         for stat in tech_stats:
@@ -130,54 +203,79 @@ class DashboardView(View):
 
 
         context = {
-            'total_initiatives': initiatives.count(),
+            'total_initiatives': len(initiatives),
             'total_productivity': total_productivity,
             'total_revenue': total_revenue,
             'total_overall': float(total_productivity) + float(total_revenue),
-            'live_systems': initiatives.filter(status='Live').count(),
+            'live_systems': sum(1 for i in initiatives if i['status'] == 'Live'),
             'chart_data': {
                 'labels': labels,
                 'prod_data': prod_data,
                 'rev_data': rev_data,
             },
-            'table_by_month': monthly_stats.order_by('-month_trunc'),
-            'table_by_initiative': list(initiative_stats),
-            'table_by_function': list(function_stats),
+            'table_by_month': [dict(stat, total_impact=stat['prod_gain'] + stat['rev_impact']) for stat in reversed(period_stats)],
+            'table_by_initiative': initiative_stats,
+            'table_by_function': function_stats,
             'table_by_tech': tech_stats,
             'active_tab': request.GET.get('tab', 'initiative'),
+            'report_range': report_range,
+            'range_label': range_label(report_range),
+            'range_presets': RANGE_PRESETS,
+            'granularities': GRANULARITIES,
+            'live_config': {
+                'url': reverse('live_updates'),
+                'start': to_period(start) if start else None,
+                'end': to_period(end) if end else None,
+                'granularity': report_range['granularity'],
+            },
         }
-        return render(request, 'initiatives/dashboard.html', context)
+        return context
 
-class BenefitAnalysisView(View):
+class LiveUpdatesView(View):
+    """Server-Sent Events stream of benefit write deltas for open dashboards."""
     def get(self, request):
-        initiatives = Initiative.objects.all()
-        
-        prod_gain_expr = Coalesce(Sum(
-            F('realized_benefits__kpi_value') * 
-            F('multiplier_minutes') * 
-            F('multiplier_dollars'),
-            output_field=FloatField()
-        ), 0.0)
-        
-        rev_impact_expr = Coalesce(Sum('realized_benefits__revenue_impact'), 0.0)
-
-        dept_stats = list(initiatives.values('department').annotate(
-            count=Count('id', distinct=True),
-            prod_gain=prod_gain_expr,
-            rev_impact=rev_impact_expr
-        ).order_by('department'))
-
-        status_stats = list(initiatives.values('status').annotate(
-            count=Count('id', distinct=True),
-            prod_gain=prod_gain_expr,
-            rev_impact=rev_impact_expr
-        ).order_by('status'))
-
-        tech_stats = list(initiatives.values('technology').annotate(
-            count=Count('id', distinct=True),
-            prod_gain=prod_gain_expr,
-            rev_impact=rev_impact_expr
-        ).order_by('technology'))
+        subscriber = live.subscribe()
+        if subscriber is None:
+            response = HttpResponse('Live update capacity reached', status=503, content_type='text/plain')
+            response['Retry-After'] = str(live.max_age())
+            return response
+
+        if isinstance(request, ASGIRequest):
+            response = StreamingHttpResponse(live.astream(subscriber), content_type='text/event-stream')
+        else:
+            response = StreamingHttpResponse(live.stream(subscriber), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+class BenefitAnalysisView(QueryBudgetMixin, View):
+    read_from_replica = True
+    template_name = 'initiatives/benefit_analysis.html'
+
+    def get_context(self, request):
+        report_range = parse_report_range(request.GET)
+        initiatives = list(Initiative.objects.select_related('technology'))
+        totals = initiative_totals(report_range['start'], report_range['end'])
+
+        for initiative in initiatives:
+            row = totals.get(initiative.pk, {})
+            initiative.prod_gain = row.get('prod_gain', 0.0)
+            initiative.rev_impact = row.get('rev_impact', 0.0)
+            initiative.total_impact = initiative.prod_gain + initiative.rev_impact
+
+        def group_stats(field, value=None):
+            groups = {}
+            for initiative in initiatives:
+                key = value(initiative) if value else getattr(initiative, field)
+                stat = groups.setdefault(key, {field: key, 'count': 0, 'prod_gain': 0.0, 'rev_impact': 0.0})
+                stat['count'] += 1
+                stat['prod_gain'] += initiative.prod_gain
+                stat['rev_impact'] += initiative.rev_impact
+            return [groups[key] for key in sorted(groups)]
+
+        dept_stats = group_stats('department')
+        status_stats = group_stats('status')
+        tech_stats = group_stats('technology', lambda i: i.technology.name)
         
         COLORS = [
             '#4285F4', '#34A853', '#FBBC05', '#EA4335', '#8F00FF', 
@@ -191,19 +289,22 @@ class BenefitAnalysisView(View):
         for i, item in enumerate(tech_stats):
             item['color'] = COLORS[i % len(COLORS)]
 
-        initiatives_with_impact = initiatives.annotate(
-            prod_gain=prod_gain_expr,
-            rev_impact=rev_impact_expr
-        ).annotate(
-            total_impact=F('prod_gain') + F('rev_impact')
-        ).order_by('status', 'department', '-total_impact')
+        initiatives_with_impact = sorted(
+            initiatives, key=lambda i: (i.status, i.department, -i.total_impact)
+        )
 
-        dept_summary = list(initiatives.values('department').annotate(
-            total=Count('id', distinct=True),
-            live=Count('id', filter=Q(status__iexact='Live'), distinct=True),
-            in_progress=Count('id', filter=Q(status__iexact='In-progress'), distinct=True),
-            planning=Count('id', filter=~Q(status__iexact='Live') & ~Q(status__iexact='In-progress'), distinct=True)
-        ).order_by('department'))
+        dept_summary = []
+        for stat in dept_stats:
+            members = [i for i in initiatives if i.department == stat['department']]
+            live = sum(1 for i in members if i.status.lower() == 'live')
+            in_progress = sum(1 for i in members if i.status.lower() == 'in-progress')
+            dept_summary.append({
+                'department': stat['department'],
+                'total': len(members),
+                'live': live,
+                'in_progress': in_progress,
+                'planning': len(members) - live - in_progress,
+            })
 
         for i, item in enumerate(dept_summary):
             item['color'] = COLORS[i % len(COLORS)]
@@ -228,8 +329,11 @@ class BenefitAnalysisView(View):
             'overall_in_progress': overall_in_progress,
             'overall_planning': overall_planning,
             'overall_total': overall_total_safe,
+            'report_range': report_range,
+            'range_label': range_label(report_range),
+            'range_presets': RANGE_PRESETS,
         }
-        return render(request, 'initiatives/benefit_analysis.html', context)
+        return context
 
 
 
@@ -240,14 +344,12 @@ class InitiativeListView(ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('technology')
         
         # Annotate with calculated benefits
         queryset = queryset.annotate(
             total_productivity=Coalesce(Sum(
-                F('realized_benefits__kpi_value') * 
-                F('multiplier_minutes') * 
-                F('multiplier_dollars'),
+                'realized_benefits__calculated_dollars',
                 output_field=FloatField()
             ), 0.0),
             total_revenue=Coalesce(Sum(
@@ -263,7 +365,7 @@ class InitiativeListView(ListView):
                 Q(name__icontains=query) |
                 Q(department__icontains=query) |
                 Q(status__icontains=query) |
-                Q(technology__icontains=query) |
+                Q(technology__name__icontains=query) |
                 Q(benefit_name__icontains=query)
             )
             
@@ -280,7 +382,7 @@ class InitiativeListView(ListView):
         # Technology filter
         tech = self.request.GET.get('technology')
         if tech:
-            queryset = queryset.filter(technology=tech)
+            queryset = queryset.filter(technology_id=tech) if tech.isdigit() else queryset.filter(technology__name=tech)
             
         # Sorting
         sort = self.request.GET.get('sort')
@@ -311,7 +413,7 @@ class InitiativeCreateView(CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['left_fields'] = ['name', 'requester_name', 'lob_owner', 'description', 'it_owner', 'it_owner_email', 'department', 'status', 'technology']
-        context['right_fields'] = ['value', 'benefit_name', 'webhook_key', 'kpi_name', 'multiplier_minutes', 'multiplier_dollars']
+        context['right_fields'] = ['value', 'benefit_name', 'webhook_key', 'webhook_rate_limit', 'kpi_name', 'multiplier_minutes', 'multiplier_dollars']
         return context
 
 class InitiativeUpdateView(UpdateView):
@@ -328,7 +430,7 @@ class InitiativeUpdateView(UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['left_fields'] = ['name', 'requester_name', 'lob_owner', 'description', 'it_owner', 'it_owner_email', 'department', 'status', 'technology']
-        context['right_fields'] = ['value', 'benefit_name', 'webhook_key', 'kpi_name', 'multiplier_minutes', 'multiplier_dollars']
+        context['right_fields'] = ['value', 'benefit_name', 'webhook_key', 'webhook_rate_limit', 'kpi_name', 'multiplier_minutes', 'multiplier_dollars']
         return context
 
 class InitiativeDeleteView(View):
@@ -342,7 +444,7 @@ class InitiativeDeleteView(View):
 
 class RealizedBenefitEntryView(View):
     def get(self, request, pk):
-        initiative = get_object_or_404(Initiative, pk=pk)
+        initiative = get_object_or_404(Initiative.objects.select_related('technology'), pk=pk)
         log_audit(request, 'View', 'Initiative', f"{initiative.name} (Benefit Entry)")
         history = RealizedBenefit.objects.filter(initiative=initiative).order_by('-month')[:12]
         return render(request, 'initiatives/benefit_entry.html', {
@@ -373,6 +475,27 @@ class RealizedBenefitEntryView(View):
         messages.success(request, "Monthly tracking updated.")
         return redirect('benefit_entry', pk=pk)
 
+class RealizedBenefitBatchView(View):
+    """
+    Replays benefit entries the service worker queued while offline:
+    {"entries": [{id, initiative, month, kpi_value, revenue_impact, queued_at}, ...]}.
+    Safe to resend; see ingest_benefits for per-entry results.
+    """
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        entries = payload.get('entries') if isinstance(payload, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return JsonResponse({'error': 'entries must be a non-empty list'}, status=400)
+        if len(entries) > settings.OFFLINE_BENEFIT_BATCH_MAX:
+            return JsonResponse({'error': f'At most {settings.OFFLINE_BENEFIT_BATCH_MAX} entries per request'}, status=413)
+
+        report = ingest_benefits(entries)
+        log_audit(request, 'Import', 'Benefit', f"Offline benefit sync ({len(entries)} entries)", details=report['summary'])
+        return JsonResponse(report)
+
 class RealizedBenefitDeleteView(View):
     def post(self, request, pk):
         benefit = get_object_or_404(RealizedBenefit, pk=pk)
@@ -384,21 +507,31 @@ class RealizedBenefitDeleteView(View):
         return redirect('benefit_entry', pk=initiative_pk)
 
 class CSVDownloadView(View):
+    read_from_replica = True
+
     def get(self, request):
         timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
         response = HttpResponse(content_type='application/json')
         response['Content-Disposition'] = f'attachment; filename="dote_full_backup_{timestamp}.json"'
         
-        initiatives = Initiative.objects.all()
+        technologies = Technology.objects.all()
+        initiatives = Initiative.objects.select_related('technology')
+        versions = MultiplierVersion.objects.all()
         benefits = RealizedBenefit.objects.all()
         
-        data = serializers.serialize('json', list(chain(initiatives, benefits)))
+        # Technologies go first and are keyed by name so a restore can match them in another database
+        data = serializers.serialize(
+            'json', list(chain(technologies, initiatives, versions, benefits)),
+            use_natural_foreign_keys=True, use_natural_primary_keys=True,
+        )
         response.write(data)
             
-        log_audit(request, 'Export', 'System', 'Full System Backup Export', details={'items': len(initiatives) + len(benefits)})
+        log_audit(request, 'Export', 'System', 'Full System Backup Export', details={'items': len(technologies) + len(initiatives) + len(versions) + len(benefits)})
         return response
 
 class BenefitCSVDownloadView(View):
+    read_from_replica = True
+
     def get(self, request):
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="benefits_export.csv"'
@@ -426,6 +559,42 @@ class BenefitCSVDownloadView(View):
         log_audit(request, 'Export', 'Benefit', 'Full Benefit Export', details={'count': benefits.count()})
         return response
 
+def upgrade_backup(objects):
+    """Point initiatives in backups taken before technologies were a foreign key at Technology rows by name."""
+    technologies = None
+    for obj in objects:
+        if obj.get('model') != 'initiatives.initiative' or not isinstance(obj['fields'].get('technology'), str):
+            continue
+        if technologies is None:
+            technologies = {name.lower(): name for name in Technology.objects.values_list('name', flat=True)}
+        name = obj['fields']['technology'].strip().lower()
+        obj['fields']['technology'] = [technologies.get(name) or Technology.unspecified().name]
+    return objects
+
+def upgrade_restored_benefits(benefits):
+    """
+    Fill in what backups taken before benefits froze their values lack: a multiplier version per
+    initiative, effective from its first benefit, and each benefit's yyyymm and minutes/dollars.
+    """
+    first_months = dict(RealizedBenefit.objects.order_by().values_list('initiative').annotate(first=Min('month')))
+    for initiative in Initiative.objects.filter(multiplier_versions__isnull=True):
+        first = first_months.get(initiative.pk)
+        initiative.record_multiplier_version(effective_from=first.replace(day=1) if first else None)
+    if not benefits:
+        return
+    initiatives = Initiative.objects.prefetch_related('multiplier_versions').in_bulk({b.initiative_id for b in benefits})
+    now = timezone.now()
+    for benefit in benefits:
+        benefit.initiative = initiatives[benefit.initiative_id]
+        benefit.month = benefit.month.replace(day=1)
+        benefit.yyyymm = to_period(benefit.month)
+        versions = list(benefit.initiative.multiplier_versions.all())
+        version = next((v for v in versions if v.effective_from <= benefit.month), versions[-1])
+        benefit.compute_values((version.multiplier_minutes, version.multiplier_dollars))
+        # bulk_update skips auto_now; sync clients find restated rows by updated_at
+        benefit.updated_at = now
+    RealizedBenefit.objects.bulk_update(benefits, ['month', 'yyyymm', 'calculated_minutes', 'calculated_dollars', 'updated_at'], batch_size=500)
+
 class CSVUploadView(View):
     def post(self, request):
         backup_file = request.FILES.get('csv_file')
@@ -437,13 +606,22 @@ class CSVUploadView(View):
             # Clear all data prior to restore as requested
             Initiative.objects.all().delete()
             RealizedBenefit.objects.all().delete()
+            # Too many rows to tombstone one by one; tell syncs to re-pull both resources
+            DeletedRecord.record_resync('initiatives', 'benefits')
             
-            data = backup_file.read().decode('utf-8')
-            objects = serializers.deserialize('json', data)
+            data = upgrade_backup(json.loads(backup_file.read().decode('utf-8')))
+            objects = serializers.deserialize('python', data)
             count = 0
+            legacy_benefits = []
             for obj in objects:
                 obj.save()
                 count += 1
+                if isinstance(obj.object, RealizedBenefit) and not obj.object.yyyymm:
+                    legacy_benefits.append(obj.object)
+            upgrade_restored_benefits(legacy_benefits)
+            # Raw deserialized saves skip RealizedBenefit.save(), so rebuild the rollups in one pass
+            BenefitRollup.rebuild()
+            TechnologyEconomics.rebuild()
                 
             messages.success(request, f"System successfully restored from backup ({count} records).")
             log_audit(request, 'Import', 'System', 'Full System Backup Restored', details={'imported_rows': count})
@@ -461,11 +639,27 @@ class SampleCSVDownloadView(View):
         return response
 @method_decorator(csrf_exempt, name='dispatch')
 class RealtimeReportingWebhookView(View):
+    """
+    Upserts one month's benefit. The response's `result` is created, updated, unchanged (values
+    already stored, nothing written) or duplicate (an Idempotency-Key replay, answered from cache).
+    Clients and keys over their token bucket get a 429 that is counted in memory, not logged.
+    """
+    def rate_limited(self, scope, retry_after):
+        metrics_registry.record_rate_limited(scope)
+        response = JsonResponse({'error': 'Rate limit exceeded'}, status=429)
+        response['Retry-After'] = str(math.ceil(retry_after))
+        return response
+
     def post(self, request):
         ip = request.META.get('REMOTE_ADDR')
         payload = {}
         initiative = None
-        
+
+        # Checked before anything touches the database, so a flood costs no queries
+        retry_after = webhook_limits.take(f"ip:{get_client_ip(request)}", settings.WEBHOOK_IP_RATE_PER_MINUTE, settings.WEBHOOK_IP_RATE_BURST)
+        if retry_after:
+            return self.rate_limited('ip', retry_after)
+
         try:
             payload = json.loads(request.body)
         except json.JSONDecodeError:
@@ -492,6 +686,24 @@ class RealtimeReportingWebhookView(View):
             )
             return JsonResponse({'error': 'Missing webhook_key'}, status=401)
 
+        # A key whose bucket is already empty is refused at its last known rate without a lookup
+        retry_after = webhook_limits.wait(f"key:{webhook_key}")
+        if retry_after:
+            return self.rate_limited('key', retry_after)
+
+        # Retries carrying a key we have already answered cost one cache lookup and no writes
+        try:
+            idempotency_key = idempotency.request_key(request, payload)
+            replay = idempotency.lookup(webhook_key, idempotency_key, payload) if idempotency_key else None
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except idempotency.IdempotencyConflict as e:
+            return JsonResponse({'error': str(e)}, status=422)
+        if replay is not None:
+            response = JsonResponse(dict(replay, result='duplicate', original_result=replay['result']))
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
         initiative = Initiative.objects.filter(webhook_key=webhook_key).first()
         if not initiative:
             WebhookAuditLog.objects.create(
@@ -502,6 +714,11 @@ class RealtimeReportingWebhookView(View):
             )
             return JsonResponse({'error': 'Invalid webhook_key'}, status=403)
 
+        per_minute = initiative.webhook_rate_limit if initiative.webhook_rate_limit is not None else settings.WEBHOOK_RATE_PER_MINUTE
+        retry_after = webhook_limits.take(f"key:{webhook_key}", per_minute, settings.WEBHOOK_RATE_BURST)
+        if retry_after:
+            return self.rate_limited('key', retry_after)
+
         # Date handling
         try:
             if month_str:
@@ -520,27 +737,44 @@ class RealtimeReportingWebhookView(View):
 
         # Valid payload processing
         try:
-            benefit, created = RealizedBenefit.objects.update_or_create(
-                initiative=initiative,
-                month=month,
-                defaults={
-                    'kpi_value': float(kpi_value or 0),
-                    'revenue_impact': float(revenue_impact or 0)
-                }
-            )
-            
+            values = {
+                'kpi_value': float(kpi_value or 0),
+                'revenue_impact': float(revenue_impact or 0)
+            }
+            benefit = RealizedBenefit.objects.filter(initiative=initiative, month=month).first()
+            if benefit is None:
+                # update_or_create still settles a concurrent first report for the month
+                benefit, created = RealizedBenefit.objects.update_or_create(
+                    initiative=initiative,
+                    month=month,
+                    defaults=values
+                )
+                result = 'created' if created else 'updated'
+            elif (benefit.kpi_value, benefit.revenue_impact) == (values['kpi_value'], values['revenue_impact']):
+                # Re-sent figures: skip the save, its rollup refresh and the change audit
+                result = 'unchanged'
+            else:
+                benefit.kpi_value = values['kpi_value']
+                benefit.revenue_impact = values['revenue_impact']
+                benefit.save(update_fields=['kpi_value', 'revenue_impact'])
+                result = 'updated'
+
             WebhookAuditLog.objects.create(
                 initiative=initiative,
                 status_code=200,
                 payload=payload,
-                response_body={'success': True, 'initiative': initiative.name, 'month': str(month)},
+                response_body={'success': True, 'initiative': initiative.name, 'month': str(month), 'result': result},
                 ip_address=ip
             )
-            
-            action = 'Create' if created else 'Update'
-            log_audit(request, action, 'Benefit', f"Benefit for {initiative.name} ({month_str})", source='API')
 
-            return JsonResponse({'success': True, 'message': 'Benefit reported successfully'})
+            if result != 'unchanged':
+                action = 'Create' if result == 'created' else 'Update'
+                log_audit(request, action, 'Benefit', f"Benefit for {initiative.name} ({month_str})", source='API')
+
+            body = {'success': True, 'message': 'Benefit reported successfully', 'result': result}
+            if idempotency_key:
+                idempotency.remember(webhook_key, idempotency_key, payload, body)
+            return JsonResponse(body)
         
         except Exception as e:
             WebhookAuditLog.objects.create(
@@ -552,6 +786,78 @@ class RealtimeReportingWebhookView(View):
             )
             return JsonResponse({'error': 'Internal server error'}, status=500)
 
+@method_decorator(csrf_exempt, name='dispatch')
+class KPIEventWebhookView(View):
+    """
+    Appends raw KPI events to the ledger: {"webhook_key": ..., "events": [{kpi_value, revenue_impact?, timestamp?}, ...]}
+    or a single event's fields at the top level. `compact_kpi_events` rolls them into monthly benefits.
+    """
+    def post(self, request):
+        ip = request.META.get('REMOTE_ADDR')
+        try:
+            payload = json.loads(request.body)
+        except json.JSONDecodeError:
+            WebhookAuditLog.objects.create(
+                endpoint='events',
+                status_code=400,
+                payload={'raw_body': request.body.decode('utf-8', errors='replace')},
+                error_message="Invalid JSON payload",
+                ip_address=ip
+            )
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+        webhook_key = payload.get('webhook_key')
+        if not webhook_key:
+            WebhookAuditLog.objects.create(endpoint='events', status_code=401, payload=payload, error_message="Missing webhook_key", ip_address=ip)
+            return JsonResponse({'error': 'Missing webhook_key'}, status=401)
+
+        initiative = Initiative.objects.filter(webhook_key=webhook_key).first()
+        if not initiative:
+            WebhookAuditLog.objects.create(endpoint='events', status_code=403, payload=payload, error_message=f"Invalid webhook_key: {webhook_key}", ip_address=ip)
+            return JsonResponse({'error': 'Invalid webhook_key'}, status=403)
+
+        events = payload['events'] if 'events' in payload else [{k: v for k, v in payload.items() if k != 'webhook_key'}]
+        error, status = None, 400
+        if not isinstance(events, list) or not events:
+            error = "events must be a non-empty list"
+        elif len(events) > settings.KPI_EVENTS_MAX_BATCH:
+            error, status = f"At most {settings.KPI_EVENTS_MAX_BATCH} events per request", 413
+        else:
+            try:
+                created = record_events(initiative, events)
+            except ValueError as e:
+                error = str(e)
+        if error:
+            # Large batches aren't echoed into the audit log
+            WebhookAuditLog.objects.create(endpoint='events', initiative=initiative, status_code=status,
+                                           payload=payload if status == 400 else {}, error_message=error, ip_address=ip)
+            return JsonResponse({'error': error}, status=status)
+
+        response = {'success': True, 'initiative': initiative.name, 'accepted': len(created)}
+        WebhookAuditLog.objects.create(endpoint='events', initiative=initiative, status_code=200,
+                                       payload={'events': len(created)}, response_body=response, ip_address=ip)
+        return JsonResponse(response, status=202)
+
+class InitiativeDailyKPIView(View):
+    """Per-day KPI totals from the event ledger: /initiatives/<pk>/daily/?days=30 (up to a year)."""
+    read_from_replica = True
+
+    def get(self, request, pk):
+        initiative = get_object_or_404(Initiative, pk=pk)
+        try:
+            days = max(1, min(int(request.GET.get('days', 30)), 366))
+        except ValueError:
+            return JsonResponse({'error': 'days must be an integer'}, status=400)
+        end = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        start = end - timedelta(days=days)
+        return JsonResponse({
+            'initiative': initiative.name,
+            'kpi_name': initiative.kpi_name,
+            'days': [dict(row, date=row['date'].isoformat()) for row in daily_totals(initiative.pk, start, end)],
+        })
+
 class WebhookDocsView(View):
     def get(self, request, pk=None):
         initiative = None
@@ -593,6 +899,75 @@ class AuditLogListView(ListView):
             
         return queryset
 
+class HealthzView(View):
+    """Liveness probe; `?db=1` also checks the default database."""
+    def get(self, request):
+        if request.GET.get('db'):
+            try:
+                connections['default'].ensure_connection()
+            except DatabaseError as e:
+                return JsonResponse({'status': 'error', 'error': str(e)}, status=503)
+        return JsonResponse({'status': 'ok'})
+
+class WarmupView(View):
+    """
+    Startup probe target: opens database connections and loads the templates,
+    static manifest and reporting modules the first real request would need,
+    so that cost is paid before traffic arrives.
+    """
+    WARM_TEMPLATES = [
+        'initiatives/dashboard.html',
+        'initiatives/benefit_analysis.html',
+        'initiatives/initiative_list.html',
+        'initiatives/benefit_entry.html',
+    ]
+
+    def get(self, request):
+        timings = {}
+        errors = {}
+
+        def step(name, func):
+            started = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                errors[name] = str(e)
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+        for alias in connections:
+            step(f'db:{alias}', connections[alias].ensure_connection)
+        for name in self.WARM_TEMPLATES:
+            step(f'template:{name}', lambda name=name: get_template(name))
+        step('static_manifest', lambda: staticfiles_storage.url('css/styles.css'))
+        step('url_resolver', lambda: reverse('dashboard'))
+        step('orm', lambda: Initiative.objects.exists())
+
+        status = 200 if not errors else 503
+        return JsonResponse({'status': 'warm' if not errors else 'degraded', 'timings_ms': timings, 'errors': errors}, status=status)
+
+@lru_cache(maxsize=1)
+def service_worker_assets():
+    """(cache version, precache URLs): our own static files (not the admin's) by their served names."""
+    names = sorted(path for path, _ in FileSystemFinder().list(None))
+    version = getattr(staticfiles_storage, 'manifest_hash', '') or 'dev'
+    return version, [staticfiles_storage.url(name) for name in names]
+
+class ServiceWorkerView(View):
+    """/sw.js, rendered with the hashed static URLs to precache and a cache version per deploy."""
+    def get(self, request):
+        version, precache_urls = service_worker_assets()
+        response = render(request, 'sw.js', {
+            'cache_version': version,
+            'hashed_static': version != 'dev',
+            'static_prefix': settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL,
+            'precache_urls': json.dumps(precache_urls),
+            'snapshot_prefix': settings.SNAPSHOT_URL,
+            'stylesheet_url': staticfiles_storage.url('css/styles.css'),
+        }, content_type='application/javascript')
+        # Browsers check for a new worker on navigation; don't let a cache hide a deploy
+        response['Cache-Control'] = 'no-cache'
+        return response
+
 class AboutView(View):
     def get(self, request):
         return render(request, 'initiatives/about.html')
@@ -607,7 +982,7 @@ from datetime import date
 
 class InitiativeToastView(View):
     def get(self, request, pk):
-        initiative = get_object_or_404(Initiative, pk=pk)
+        initiative = get_object_or_404(Initiative.objects.select_related('technology'), pk=pk)
         
         # Last 12 months logic
         today = date.today()
@@ -655,14 +1030,14 @@ class TechnologyListView(ListView):
     context_object_name = 'technologies'
     
     def get_queryset(self):
-        current_year = timezone.now().year
-        return Technology.objects.annotate(
-            ytd_consumption=Coalesce(
-                Sum('usages__consumption', filter=Q(usages__month__year=current_year)),
-                0.0,
-                output_field=FloatField()
-            )
-        ).order_by('name')
+        # YTD and forecast figures are maintained on TechnologyCapacity; nothing is summed here
+        technologies = list(Technology.objects.select_related('capacity').order_by('name'))
+        ytd_start = TechnologyCapacity.current_ytd_start()
+        if any(not hasattr(t, 'capacity') or t.capacity.ytd_start != ytd_start for t in technologies):
+            # New technology or a fiscal year rollover since the last refresh
+            TechnologyCapacity.rebuild()
+            technologies = list(Technology.objects.select_related('capacity').order_by('name'))
+        return technologies
 
 class TechnologyCreateView(CreateView):
     model = Technology
@@ -688,7 +1063,12 @@ class TechnologyDeleteView(View):
     def post(self, request, pk):
         tech = get_object_or_404(Technology, pk=pk)
         name = tech.name
-        tech.delete()
+        try:
+            tech.delete()
+        except ProtectedError:
+            count = tech.initiatives.count()
+            messages.error(request, f'Technology "{name}" is used by {count} initiative(s). Reassign them before deleting it.')
+            return redirect('technology_list')
         messages.success(request, f'Technology "{name}" deleted.')
         return redirect('technology_list')
 
@@ -736,3 +1116,182 @@ class TechnologyUsageDeleteView(View):
         usage.delete()
         messages.success(request, 'Usage entry deleted.')
         return redirect('technology_usage_entry', pk=tech_pk)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TechnologyUsageIngestView(View):
+    """Keyed bulk usage endpoint for billing exports: {"ingest_key": ..., "rows": [{technology, month, consumption}, ...]}."""
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+        ingest_key = settings.USAGE_INGEST_KEY
+        if not ingest_key or not secrets.compare_digest(str(payload.get('ingest_key') or ''), ingest_key):
+            return JsonResponse({'error': 'Invalid ingest_key'}, status=403)
+
+        rows = payload.get('rows')
+        if not isinstance(rows, list) or not rows:
+            return JsonResponse({'error': 'rows must be a non-empty list'}, status=400)
+        if len(rows) > settings.USAGE_INGEST_MAX_ROWS:
+            return JsonResponse({'error': f'At most {settings.USAGE_INGEST_MAX_ROWS} rows per request'}, status=413)
+
+        report = ingest_usage(rows)
+        log_audit(request, 'Import', 'Usage', f"Bulk usage ingest ({len(rows)} rows)", source='API', details=report['summary'])
+        return JsonResponse(report)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SnapshotPublishView(View):
+    """Scheduler hook: {"publish_key": ...} re-renders the static dashboard snapshots on this instance."""
+    def post(self, request):
+        try:
+            payload = json.loads(request.body or b'{}')
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+        publish_key = settings.SNAPSHOT_PUBLISH_KEY
+        if not publish_key or not secrets.compare_digest(str(payload.get('publish_key') or ''), publish_key):
+            return JsonResponse({'error': 'Invalid publish_key'}, status=403)
+
+        started = time.perf_counter()
+        published = publish_snapshots()
+        return JsonResponse({'published': published, 'seconds': round(time.perf_counter() - started, 2)})
+
+class TechnologyUsageUploadView(View):
+    template_name = 'initiatives/technology_usage_upload.html'
+
+    def get(self, request):
+        return render(request, self.template_name)
+
+    def post(self, request):
+        upload = request.FILES.get('csv_file')
+        if not upload:
+            messages.error(request, "No file uploaded.")
+            return redirect('technology_usage_upload')
+        try:
+            rows = rows_from_csv(upload.read().decode('utf-8-sig'))
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            messages.error(request, f"Could not read CSV: {e}")
+            return redirect('technology_usage_upload')
+        if len(rows) > settings.USAGE_INGEST_MAX_ROWS:
+            messages.error(request, f"At most {settings.USAGE_INGEST_MAX_ROWS} rows per upload.")
+            return redirect('technology_usage_upload')
+
+        report = ingest_usage(rows)
+        log_audit(request, 'Import', 'Usage', f"Usage CSV upload ({upload.name})", details=report['summary'])
+        return render(request, self.template_name, {'report': report, 'filename': upload.name})
+
+def economics_in_range(report_range):
+    """TechnologyEconomics rows for a parsed report range; open bounds are left unfiltered."""
+    rows = TechnologyEconomics.objects.all()
+    if report_range['start']:
+        rows = rows.filter(yyyymm__gte=to_period(report_range['start']))
+    if report_range['end']:
+        rows = rows.filter(yyyymm__lte=to_period(report_range['end']))
+    return rows
+
+class UnitEconomicsView(View):
+    read_from_replica = True
+    template_name = 'initiatives/unit_economics.html'
+
+    def get(self, request):
+        report_range = parse_report_range(request.GET)
+        months = list(economics_in_range(report_range).select_related('technology').order_by('technology__name', '-yyyymm'))
+
+        # Range totals are re-derived from the monthly sums; averaging the monthly ratios would weight small months up
+        by_tech = {}
+        for row in months:
+            stat = by_tech.setdefault(row.technology_id, {
+                'technology': row.technology, 'months': [],
+                'benefit_dollars': 0.0, 'revenue_impact': 0.0, 'total_impact': 0.0, 'consumption': 0.0,
+            })
+            stat['months'].append(row)
+            for field in ('benefit_dollars', 'revenue_impact', 'total_impact', 'consumption'):
+                stat[field] += getattr(row, field)
+        tech_stats = sorted(by_tech.values(), key=lambda s: s['total_impact'], reverse=True)
+        for stat in tech_stats:
+            stat['impact_per_unit'] = stat['total_impact'] / stat['consumption'] if stat['consumption'] else None
+
+        return render(request, self.template_name, {
+            'tech_stats': tech_stats,
+            'report_range': report_range,
+            'range_label': range_label(report_range),
+            'range_presets': RANGE_PRESETS,
+        })
+
+class UnitEconomicsCSVView(View):
+    read_from_replica = True
+
+    def get(self, request):
+        report_range = parse_report_range(request.GET)
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="unit_economics_export.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow([
+            'Technology', 'Month', 'Initiatives', 'Efficiency Gain ($)', 'Revenue Impact ($)', 'Total Impact ($)',
+            'Consumption', 'Efficiency Gain per Unit ($)', 'Revenue per Unit ($)', 'Impact per Unit ($)'
+        ])
+
+        rows = economics_in_range(report_range).order_by('technology__name', '-yyyymm').values_list(
+            'technology__name', 'yyyymm', 'initiatives', 'benefit_dollars', 'revenue_impact', 'total_impact',
+            'consumption', 'benefit_per_unit', 'revenue_per_unit', 'impact_per_unit',
+        )
+        count = 0
+        for name, yyyymm, *values in rows.iterator():
+            writer.writerow([name, f"{yyyymm // 100}-{yyyymm % 100:02d}", *('' if v is None else v for v in values)])
+            count += 1
+
+        log_audit(request, 'Export', 'Technology', 'Unit Economics Export', details={'count': count, 'range': range_label(report_range)})
+        return response
+
+class PivotView(View):
+    """
+    Ad-hoc pivots over realized benefits, e.g.
+    /api/pivot/?rows=department&columns=quarter&measures=revenue&status=Live&range=last12&format=csv
+    """
+    read_from_replica = True
+
+    def get(self, request):
+        try:
+            spec = parse_pivot_request(request.GET)
+        except PivotError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        report_range = parse_report_range(request.GET)
+        result, cached = cached_pivot(spec, report_range['start'], report_range['end'])
+
+        if request.GET.get('format') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="pivot.csv"'
+            writer = csv.writer(response)
+            writer.writerow(result['header'])
+            writer.writerows(result['rows'])
+        else:
+            response = JsonResponse(dict(result, range=range_label(report_range), measures=spec['measures'], filters=spec['filters']))
+        response['X-Cache'] = 'HIT' if cached else 'MISS'
+        return response
+
+@method_decorator(gzip_page, name='dispatch')
+class APIListView(View):
+    """Read-only, paginated sync API; see initiatives/api.py for parameters."""
+    read_from_replica = True
+
+    def get(self, request, resource):
+        try:
+            page = list_page(resource, request.GET)
+        except LookupError:
+            return JsonResponse({'error': f"Unknown resource. Use one of: {', '.join(API_RESOURCES)}"}, status=404)
+        except APIError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        next_url = None
+        if page['has_more']:
+            params = request.GET.copy()
+            params['cursor'] = page['next_cursor']
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+        return JsonResponse(dict(page, next=next_url))
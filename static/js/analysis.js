@@ -0,0 +1,118 @@
+// Distribution page: department doughnut, status filter and the initiative toast.
+// Chart Color Palette
+const COLORS = [
+    '#4285F4', // Google Blue
+    '#34A853', // Google Green
+    '#FBBC05', // Google Yellow
+    '#EA4335', // Google Red
+    '#8F00FF', // Purple
+    '#00C7BE', // Teal
+    '#FF9500', // Orange
+    '#5856D6', // Indigo
+    '#AF52DE', // Pink
+    '#5AC8FA'  // Sky
+];
+
+function createPieChart(id, labels, data) {
+    const ctx = document.getElementById(id);
+    if (!ctx) return;
+
+    new Chart(ctx, {
+        type: 'doughnut',
+        data: {
+            labels: labels,
+            datasets: [{
+                data: data,
+                backgroundColor: COLORS,
+                borderWidth: 0,
+                hoverOffset: 15
+            }]
+        },
+        options: {
+            cutout: '75%',
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            layout: {
+                padding: 10
+            }
+        }
+    });
+}
+
+// Initialize charts if data exists
+(function () {
+    function getJsonData(id) {
+        var el = document.getElementById(id);
+        if (!el) return null;
+        try { return JSON.parse(el.textContent); }
+        catch (e) { return null; }
+    }
+
+    var deptData = getJsonData('dept-data');
+
+    if (deptData) {
+        createPieChart('summaryPieChart', deptData.labels, deptData.counts);
+    }
+})();
+
+function filterInitiatives(status, btnElem) {
+    const buttons = document.querySelectorAll('.initiatives-header .btn-toggle');
+    buttons.forEach(btn => btn.classList.remove('active'));
+    btnElem.classList.add('active');
+
+    const cards = document.querySelectorAll('.initiative-card-filter');
+    cards.forEach(card => {
+        card.style.display = card.getAttribute('data-status') === status ? 'flex' : 'none';
+    });
+}
+
+function showToastInfo(element) {
+    const impactVal = parseFloat(element.getAttribute('data-impact')) || 0;
+    const formatter = new Intl.NumberFormat('en-US', { minimumFractionDigits: 0, maximumFractionDigits: 0 });
+
+    document.getElementById('toastName').textContent = element.querySelector('.init-name').textContent;
+    document.getElementById('toastDept').textContent = element.querySelector('.tiny-tag').textContent;
+    document.getElementById('toastTech').textContent = element.getAttribute('data-technology');
+    document.getElementById('toastImpact').textContent = formatter.format(impactVal);
+    document.getElementById('toastImpactContainer').style.display = impactVal === 0 ? 'none' : 'inline';
+    document.getElementById('toastDesc').textContent = element.querySelector('.desc-text').textContent;
+
+    document.getElementById('toastEditBtn').href = element.getAttribute('data-edit-url');
+    document.getElementById('toastBenefitBtn').href = element.getAttribute('data-benefit-url');
+
+    document.getElementById('initiativeToast').classList.add('show');
+}
+
+function closeToast(event) {
+    if (event) {
+        event.stopPropagation();
+    }
+    document.getElementById('initiativeToast').classList.remove('show');
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('.initiatives-header .btn-toggle').forEach(btn => {
+        btn.addEventListener('click', () => filterInitiatives(btn.getAttribute('data-filter'), btn));
+    });
+    const defaultBtn = document.querySelector('.initiatives-header .btn-toggle[data-filter="Live"]');
+    if (defaultBtn) {
+        filterInitiatives('Live', defaultBtn);
+    }
+
+    // One delegated listener instead of one handler per card
+    const grid = document.querySelector('.initiatives-grid');
+    if (grid) {
+        grid.addEventListener('click', (event) => {
+            const card = event.target.closest('.initiative-card-filter');
+            // Prevent triggering if clicked on inner actions directly
+            if (card && !event.target.closest('.hover-actions')) {
+                showToastInfo(card);
+            }
+        });
+    }
+});
@@ -0,0 +1,78 @@
+// Shared by every page: nav dropdowns, service worker registration and offline benefit replay.
+const SERVICE_WORKER_URL = document.currentScript.dataset.swUrl;
+
+document.addEventListener('DOMContentLoaded', () => {
+    const dropdowns = document.querySelectorAll('.dropdown');
+
+    dropdowns.forEach(dropdown => {
+        const toggle = dropdown.querySelector('.dropdown-toggle');
+        const menu = dropdown.querySelector('.dropdown-menu');
+
+        if (toggle && menu) {
+            toggle.addEventListener('click', (e) => {
+                e.preventDefault();
+                e.stopPropagation();
+
+                // Close all other dropdowns
+                document.querySelectorAll('.dropdown-menu.show').forEach(openMenu => {
+                    if (openMenu !== menu) {
+                        openMenu.classList.remove('show');
+                        const openToggle = openMenu.parentElement.querySelector('.dropdown-toggle');
+                        if (openToggle) openToggle.setAttribute('aria-expanded', 'false');
+                    }
+                });
+
+                menu.classList.toggle('show');
+                const isExpanded = menu.classList.contains('show');
+                toggle.setAttribute('aria-expanded', isExpanded);
+            });
+        }
+    });
+
+    document.addEventListener('click', (e) => {
+        document.querySelectorAll('.dropdown').forEach(dropdown => {
+            if (!dropdown.contains(e.target)) {
+                const menu = dropdown.querySelector('.dropdown-menu');
+                const toggle = dropdown.querySelector('.dropdown-toggle');
+                if (menu && menu.classList.contains('show')) {
+                    menu.classList.remove('show');
+                    if (toggle) toggle.setAttribute('aria-expanded', 'false');
+                }
+            }
+        });
+    });
+});
+
+// Progressive Web App Service Worker Registration
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(SERVICE_WORKER_URL)
+            .then(registration => console.log('PWA ServiceWorker registered', registration.scope))
+            .catch(err => console.log('PWA ServiceWorker registration failed: ', err));
+        replayOfflineBenefits();
+    });
+    window.addEventListener('online', replayOfflineBenefits);
+
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        if (!event.data) return;
+        const notice = document.createElement('div');
+        notice.className = 'alert glass';
+        if (event.data.type === 'benefits-synced') {
+            notice.textContent = `Sent ${event.data.count} benefit ${event.data.count === 1 ? 'entry' : 'entries'} saved while offline.`;
+        } else if (event.data.type === 'data-refreshed' && event.data.url === location.href) {
+            // This page came from the service worker cache and newer figures have arrived
+            notice.innerHTML = 'Newer figures are available. <a href="">Refresh</a>';
+        } else {
+            return;
+        }
+        document.querySelector('main.container').prepend(notice);
+    });
+}
+
+// Ask the service worker to send benefit entries queued offline, with a fresh CSRF token
+function replayOfflineBenefits() {
+    const controller = navigator.serviceWorker.controller;
+    if (!controller || !navigator.onLine) return;
+    const csrf = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    controller.postMessage({ type: 'replay-benefits', csrfToken: csrf ? csrf[1] : null });
+}
@@ -0,0 +1,175 @@
+// Dashboard chart, breakdown tabs and live updates. Page data comes from the json_script blocks.
+function initChart() {
+    var el = document.getElementById('chart-data');
+    if (!el) return;
+    var data = JSON.parse(el.textContent);
+    var ctx = document.getElementById('trendChart');
+    if (!ctx) return;
+
+    window.trendChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: data.labels,
+            datasets: [
+                {
+                    label: 'Efficiency Gain ($)',
+                    data: data.prod_data,
+                    backgroundColor: '#4285F4', // Google Blue
+                    borderRadius: 6
+                },
+                {
+                    label: 'Revenue Impact ($)',
+                    data: data.rev_data,
+                    backgroundColor: '#34A853', // Google Green
+                    borderRadius: 6
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                x: {
+                    stacked: true,
+                    grid: { display: false }
+                },
+                y: {
+                    stacked: true,
+                    beginAtZero: true,
+                    ticks: {
+                        callback: function (value) {
+                            return '$' + value.toLocaleString();
+                        }
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                    labels: {
+                        usePointStyle: true,
+                        padding: 20,
+                        font: { family: 'Inter', size: 12 }
+                    }
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function (context) {
+                            var label = context.dataset.label || '';
+                            if (label) {
+                                label += ': ';
+                            }
+                            if (context.parsed.y !== null) {
+                                label += new Intl.NumberFormat('en-US', { style: 'currency', currency: 'USD' }).format(context.parsed.y);
+                            }
+                            return label;
+                        }
+                    }
+                }
+            }
+        }
+    });
+}
+
+function switchTable(type) {
+    document.querySelectorAll('#detailed-breakdown [data-tab]').forEach(function (btn) {
+        btn.classList.toggle('active', btn.dataset.tab === type);
+    });
+    document.querySelectorAll('.breakdown-pane').forEach(function (pane) {
+        pane.classList.toggle('active', pane.dataset.pane === type);
+    });
+}
+
+var currencyFormat = new Intl.NumberFormat('en-US', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+var numberFormat = new Intl.NumberFormat('en-US', { maximumFractionDigits: 0 });
+
+function bumpValue(el, delta) {
+    var value = (parseFloat(el.dataset.value) || 0) + delta;
+    el.dataset.value = value;
+    el.textContent = el.dataset.format === 'number' ? numberFormat.format(value) : '$' + currencyFormat.format(value);
+}
+
+function bumpRow(row, delta) {
+    row.querySelectorAll('[data-field]').forEach(function (el) {
+        var field = el.dataset.field;
+        var amount = field === 'total_impact' ? delta.prod_gain + delta.rev_impact
+            : field === 'total_kpi' ? delta.kpi_value : delta[field];
+        if (amount) bumpValue(el, amount);
+    });
+}
+
+function applyLiveDelta(delta, config) {
+    if ((config.start && delta.yyyymm < config.start) || (config.end && delta.yyyymm > config.end)) return;
+
+    var revenue = delta.benefit_name === 'New Business' ? delta.rev_impact : 0;
+    document.querySelectorAll('[data-live="total_productivity"]').forEach(function (el) { bumpValue(el, delta.prod_gain); });
+    document.querySelectorAll('[data-live="total_revenue"]').forEach(function (el) { bumpValue(el, revenue); });
+    document.querySelectorAll('[data-live="total_overall"]').forEach(function (el) { bumpValue(el, delta.prod_gain + revenue); });
+
+    var label = delta.buckets[config.granularity];
+    document.querySelectorAll('[data-bucket="' + label + '"]').forEach(function (row) { bumpRow(row, delta); });
+    document.querySelectorAll('[data-initiative="' + delta.initiative_id + '"]').forEach(function (row) { bumpRow(row, delta); });
+
+    var chart = window.trendChart;
+    if (chart) {
+        var index = chart.data.labels.indexOf(label);
+        if (index === -1) {
+            chart.data.labels.push(label);
+            chart.data.datasets.forEach(function (dataset) { dataset.data.push(0); });
+            index = chart.data.labels.length - 1;
+        }
+        chart.data.datasets[0].data[index] += delta.prod_gain;
+        chart.data.datasets[1].data[index] += delta.rev_impact;
+        chart.update();
+    }
+}
+
+function connectLiveUpdates() {
+    var el = document.getElementById('live-config');
+    if (!el || !window.EventSource) return;
+    var config = JSON.parse(el.textContent);
+    var source = new EventSource(config.url);
+    source.addEventListener('benefit', function (event) {
+        applyLiveDelta(JSON.parse(event.data), config);
+    });
+    source.addEventListener('reload', function () {
+        location.reload();
+    });
+    source.onerror = function () {
+        // Capacity refusals close the stream for good; try again later instead
+        if (source.readyState === EventSource.CLOSED) {
+            setTimeout(connectLiveUpdates, 60000);
+        }
+    };
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    initChart();
+    connectLiveUpdates();
+
+    // Breakdown toggles and the figure cards switch tabs; the cards also scroll to the breakdown
+    document.querySelectorAll('[data-tab]').forEach(function (el) {
+        el.addEventListener('click', function () {
+            switchTable(el.dataset.tab);
+            if (el.dataset.scroll) {
+                document.getElementById(el.dataset.scroll).scrollIntoView({ behavior: 'smooth' });
+            }
+        });
+    });
+    document.querySelectorAll('[data-href]').forEach(function (el) {
+        el.addEventListener('click', function () { location.href = el.dataset.href; });
+    });
+});
+
+function closeToast(event) {
+    if (event) {
+        event.stopPropagation();
+    }
+    var toast = document.getElementById('initiativeToast');
+    if (toast) {
+        toast.classList.remove('show');
+        setTimeout(function () {
+            toast.outerHTML = '<div id="toast-container"></div>';
+        }, 400); // clear after animation
+    }
+}
@@ -1,20 +1,222 @@
-const CACHE_NAME = 'ai-value-board-v1';
-const STATIC_URLS = [
-    '/',
-    '/static/css/styles.css',
-    '/static/img/logo_spark.svg',
-    '/manifest.json'
-];
+// Rendered by ServiceWorkerView. The version is the staticfiles manifest hash, so a deploy
+// that changes any static file installs a new cache and drops the old ones.
+const CACHE_VERSION = '{{ cache_version }}';
+const CACHE_NAME = 'ai-value-board-' + CACHE_VERSION;
+// Static URLs carry a content hash (CompressedManifestStaticFilesStorage) unless running in DEBUG
+const HASHED_STATIC = {{ hashed_static|yesno:"true,false" }};
+const STATIC_PREFIX = '{{ static_prefix }}';
+const PRECACHE_URLS = {{ precache_urls|safe }}.concat(['/manifest.json']);
+// Served stale-while-revalidate: fast repeat visits, refreshed in the background
+const DATA_PAGES = ['{% url "dashboard" %}', '{% url "benefit_analysis" %}'];
+const SNAPSHOT_PREFIX = '{{ snapshot_prefix }}';
+const NO_CACHE = ['{% url "live_updates" %}'];
+
+// Benefit entry posts that fail offline are queued here and replayed in one batch
+const QUEUE_DB = 'ai-value-board-offline';
+const QUEUE_STORE = 'benefits';
+const SYNC_TAG = 'benefit-sync';
+const BATCH_URL = "{% url 'benefit_batch' %}";
+const BATCH_SIZE = 500;  // OFFLINE_BENEFIT_BATCH_MAX
+const BENEFIT_FORM = /^\/initiatives\/(\d+)\/benefit\/$/;
 
 self.addEventListener('install', (event) => {
     event.waitUntil(
-        caches.open(CACHE_NAME).then((cache) => cache.addAll(STATIC_URLS))
+        caches.open(CACHE_NAME)
+            .then((cache) => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
     );
 });
 
-self.addEventListener('fetch', (event) => {
-    // Try to use the network first, fall back to cache for offline capabilities
-    event.respondWith(
-        fetch(event.request).catch(() => caches.match(event.request))
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((names) => Promise.all(
+                names.filter((name) => name.startsWith('ai-value-board-') && name !== CACHE_NAME)
+                    .map((name) => caches.delete(name))
+            ))
+            .then(() => self.clients.claim())
     );
 });
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin || NO_CACHE.includes(url.pathname)) {
+        return;
+    }
+
+    const benefitForm = request.method === 'POST' && url.pathname.match(BENEFIT_FORM);
+    if (benefitForm) {
+        // The network attempt consumes the body, so keep a copy to queue
+        const copy = request.clone();
+        event.respondWith(
+            fetch(request)
+                .then((response) => {
+                    event.waitUntil(replayQueue().catch(() => {}));
+                    return response;
+                })
+                .catch(() => queueBenefit(copy, benefitForm[1]))
+        );
+        return;
+    }
+    if (request.method !== 'GET') {
+        return;
+    }
+
+    if (HASHED_STATIC && url.pathname.startsWith(STATIC_PREFIX)) {
+        event.respondWith(cacheFirst(request));
+    } else if (DATA_PAGES.includes(url.pathname) || url.pathname.startsWith(SNAPSHOT_PREFIX)) {
+        event.respondWith(staleWhileRevalidate(event, request));
+    } else {
+        // Try to use the network first, fall back to cache for offline capabilities
+        event.respondWith(
+            fetch(request).catch(() => caches.match(request))
+        );
+    }
+});
+
+async function cacheFirst(request) {
+    // A hashed name never changes content, so a cached copy is always current
+    const cached = await caches.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(CACHE_NAME);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    const refresh = fetch(request).then(async (response) => {
+        if (!response.ok) {
+            return response;
+        }
+        const fresh = response.clone();
+        if (cached) {
+            const [before, after] = await Promise.all([cached.clone().text(), fresh.clone().text()]);
+            if (before !== after) {
+                notifyClients({ type: 'data-refreshed', url: request.url });
+            }
+        }
+        await cache.put(request, fresh);
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(refresh.catch(() => {}));
+        return cached;
+    }
+    return refresh;
+}
+
+async function notifyClients(message) {
+    const clients = await self.clients.matchAll({ type: 'window' });
+    clients.forEach((client) => client.postMessage(message));
+}
+
+self.addEventListener('sync', (event) => {
+    if (event.tag === SYNC_TAG) {
+        event.waitUntil(replayQueue());
+    }
+});
+
+// Pages ask for a replay when they load or come back online (for browsers without Background Sync)
+self.addEventListener('message', (event) => {
+    if (event.data && event.data.type === 'replay-benefits') {
+        event.waitUntil(replayQueue(event.data.csrfToken).catch(() => {}));
+    }
+});
+
+function withQueue(mode, action) {
+    return new Promise((resolve, reject) => {
+        const open = indexedDB.open(QUEUE_DB, 1);
+        open.onupgradeneeded = () => open.result.createObjectStore(QUEUE_STORE, { keyPath: 'id' });
+        open.onerror = () => reject(open.error);
+        open.onsuccess = () => {
+            const db = open.result;
+            const tx = db.transaction(QUEUE_STORE, mode);
+            const request = action(tx.objectStore(QUEUE_STORE));
+            tx.oncomplete = () => {
+                db.close();
+                resolve(request ? request.result : undefined);
+            };
+            tx.onerror = () => {
+                db.close();
+                reject(tx.error);
+            };
+        };
+    });
+}
+
+async function queueBenefit(request, initiative) {
+    const form = await request.formData();
+    await withQueue('readwrite', (store) => store.put({
+        id: self.crypto.randomUUID(),
+        initiative: Number(initiative),
+        month: form.get('month'),
+        kpi_value: form.get('kpi_value'),
+        revenue_impact: form.get('revenue_impact'),
+        queued_at: new Date().toISOString(),
+        csrf_token: form.get('csrfmiddlewaretoken'),
+    }));
+    if (self.registration.sync) {
+        await self.registration.sync.register(SYNC_TAG).catch(() => {});
+    }
+    const waiting = await withQueue('readonly', (store) => store.count());
+    return new Response(
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">'
+        + '<title>Saved offline</title><link rel="stylesheet" href="{{ stylesheet_url }}"></head>'
+        + '<body><main class="container" style="padding: 2rem;"><div class="card glass" style="padding: 2rem;">'
+        + '<h2>Saved offline</h2><p>You are offline, so this entry was saved on this device. '
+        + waiting + ' entr' + (waiting === 1 ? 'y is' : 'ies are') + ' waiting and will be sent automatically '
+        + 'when the connection returns.</p><p><a href="' + request.url + '" class="btn-primary">Back to benefit entry</a></p>'
+        + '</div></main></body></html>',
+        { headers: { 'Content-Type': 'text/html; charset=utf-8' } }
+    );
+}
+
+let replaying = null;
+
+function replayQueue(csrfToken) {
+    // Sync events, page messages and successful posts can all ask at once; run one replay at a time
+    if (!replaying) {
+        replaying = sendQueued(csrfToken).finally(() => { replaying = null; });
+    }
+    return replaying;
+}
+
+async function sendQueued(csrfToken) {
+    const queued = await withQueue('readonly', (store) => store.getAll());
+    // Oldest first, so a later entry for the same month wins on the server
+    queued.sort((a, b) => a.queued_at.localeCompare(b.queued_at));
+    const summary = { created: 0, updated: 0, unchanged: 0, stale: 0, duplicate: 0, error: 0 };
+
+    for (let start = 0; start < queued.length; start += BATCH_SIZE) {
+        const batch = queued.slice(start, start + BATCH_SIZE);
+        const response = await fetch(BATCH_URL, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken || batch[batch.length - 1].csrf_token,
+            },
+            body: JSON.stringify({ entries: batch.map(({ csrf_token, ...entry }) => entry) }),
+        });
+        // Keep the queue on failure; the sync event or the next page load retries
+        if (!response.ok) {
+            throw new Error('Benefit sync failed with status ' + response.status);
+        }
+        const report = await response.json();
+        // The server answered for every entry (even rejected ones), so none of them is resent
+        await withQueue('readwrite', (store) => { report.results.forEach((result) => { if (result.id) store.delete(result.id); }); });
+        Object.keys(summary).forEach((status) => { summary[status] += report.summary[status] || 0; });
+    }
+
+    if (queued.length) {
+        await notifyClients({ type: 'benefits-synced', count: queued.length, summary: summary });
+    }
+}